@@ -0,0 +1,87 @@
+'''
+Compares the serial and the tiled (worker processes) rendering of
+map_grid on a synthetic polygon set.
+Run it from the repository root with:
+PYTHONPATH=src/ETS_CookBook python benchmarks/benchmark_map_grid.py
+'''
+
+import os
+import tempfile
+import time
+
+import box
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+
+import ETS_CookBook as cook
+from synthetic_data import make_polygon_map, make_quantities_data
+
+NUMBER_OF_AREAS: int = 400
+NUMBER_OF_QUANTITIES: int = 12
+DPI_TO_USE: int = 150
+WORKER_COUNTS: list[int] = [1, 2, 4, os.cpu_count() or 1]
+
+
+def time_map_grid(
+    map_grid_plot_parameters: box.Box,
+    output_folder: str,
+    rendering_workers: int,
+) -> float:
+    '''
+    Times one map grid (with png output).
+    '''
+    quantity_colors: list[str] = ['blue', 'red', 'green'] * (
+        NUMBER_OF_QUANTITIES // 3
+    )
+    timer_start: float = time.perf_counter()
+    cook.map_grid(
+        make_quantities_data(NUMBER_OF_QUANTITIES, NUMBER_OF_AREAS),
+        [f'Quantity {index}' for index in range(NUMBER_OF_QUANTITIES)],
+        quantity_colors,
+        output_folder,
+        map_grid_plot_parameters,
+        box.Box(),
+        box.Box(),
+        DPI_TO_USE,
+        box.Box({'png': True}),
+        rendering_workers=rendering_workers,
+    )
+    plt.close('all')
+    return time.perf_counter() - timer_start
+
+
+if __name__ == '__main__':
+    matplotlib.use('Agg')
+    with tempfile.TemporaryDirectory() as benchmark_folder:
+        map_grid_plot_parameters: box.Box = make_polygon_map(
+            benchmark_folder, NUMBER_OF_AREAS
+        )
+        serial_time: float = time_map_grid(
+            map_grid_plot_parameters, benchmark_folder, 1
+        )
+        print(f'Processors: {os.cpu_count()}')
+        print(f'Serial: {serial_time:.2f} s')
+        serial_image: np.ndarray = plt.imread(
+            f'{benchmark_folder}/Synthetic map grid.png'
+        )
+        for rendering_workers in sorted(set(WORKER_COUNTS) - {1}):
+            # The first call starts the worker pool, which is then reused
+            time_map_grid(
+                map_grid_plot_parameters, benchmark_folder, rendering_workers
+            )
+            tiled_time: float = time_map_grid(
+                map_grid_plot_parameters, benchmark_folder, rendering_workers
+            )
+            tiled_image: np.ndarray = plt.imread(
+                f'{benchmark_folder}/Synthetic map grid.png'
+            )
+            # The tiles should give the same pixels as the serial version
+            differing_pixels: float = np.mean(
+                np.abs(tiled_image - serial_image).max(axis=2) > 0.1
+            )
+            print(
+                f'{rendering_workers} workers: {tiled_time:.2f} s '
+                f'(speedup {serial_time / tiled_time:.2f}), '
+                f'{differing_pixels:.2%} of pixels differ from serial'
+            )
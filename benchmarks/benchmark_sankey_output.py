@@ -0,0 +1,85 @@
+'''
+Measures the files per second and bytes per figure of the Sankey output
+modes (standalone html, shared plotly.js, JSON, and one page for all
+Sankeys).
+Run it from the repository root with:
+PYTHONPATH=src/ETS_CookBook python benchmarks/benchmark_sankey_output.py
+'''
+
+import os
+import tempfile
+import time
+
+import plotly.graph_objects as go
+
+import ETS_CookBook as cook
+from synthetic_data import make_sankey_graph
+
+NUMBER_OF_SANKEYS: int = 50
+NUMBER_OF_NODES: int = 40
+NUMBER_OF_LINKS: int = 200
+
+
+def folder_size(folder: str) -> int:
+    '''
+    Total size (in bytes) of the files in a folder.
+    '''
+    return sum(
+        os.path.getsize(f'{folder}/{file_name}')
+        for file_name in os.listdir(folder)
+    )
+
+
+def report(mode: str, run_time: float, output_folder: str) -> None:
+    '''
+    Prints the throughput and size per figure of an output mode.
+    '''
+    print(
+        f'{mode:<22} {NUMBER_OF_SANKEYS / run_time:8.1f} figures/s '
+        f'{folder_size(output_folder) / NUMBER_OF_SANKEYS:12.0f} bytes/figure'
+    )
+
+
+if __name__ == '__main__':
+    nodes, links, Sankey_parameters, color_definitions = make_sankey_graph(
+        NUMBER_OF_NODES, NUMBER_OF_LINKS
+    )
+    output_modes: dict[str, dict] = {
+        'html (inline js)': dict(include_plotlyjs=True),
+        'html (cdn)': dict(include_plotlyjs='cdn'),
+        'html (directory)': dict(include_plotlyjs='directory'),
+        'json': dict(output_format='json'),
+    }
+    for mode, mode_options in output_modes.items():
+        with tempfile.TemporaryDirectory() as output_folder:
+            timer_start: float = time.perf_counter()
+            for sankey_index in range(NUMBER_OF_SANKEYS):
+                cook.make_sankey(
+                    nodes,
+                    links,
+                    f'Sankey {sankey_index}',
+                    output_folder,
+                    Sankey_parameters,
+                    color_definitions,
+                    **mode_options,
+                )
+            report(mode, time.perf_counter() - timer_start, output_folder)
+
+    with tempfile.TemporaryDirectory() as output_folder:
+        timer_start = time.perf_counter()
+        sankey_figures: list[go.Figure] = [
+            cook.make_sankey_figure(
+                nodes,
+                links,
+                f'Sankey {sankey_index}',
+                Sankey_parameters,
+                color_definitions,
+            )
+            for sankey_index in range(NUMBER_OF_SANKEYS)
+        ]
+        cook.make_sankeys_page(sankey_figures, 'All Sankeys', output_folder)
+        report(
+            'one page (directory)',
+            time.perf_counter() - timer_start,
+            output_folder,
+        )
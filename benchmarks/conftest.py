@@ -0,0 +1,80 @@
+'''
+Options and shared synthetic data for the benchmark suite.
+Run it from the repository root with:
+pytest benchmarks
+(pytest-benchmark needs to be installed).
+'''
+
+import box
+import matplotlib
+import pandas as pd
+import pytest
+
+from synthetic_data import (
+    make_dataframe,
+    make_Excel_table,
+    make_polygon_map,
+    make_sqlite_database,
+)
+
+# We never show figures while benchmarking
+matplotlib.use('Agg')
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        '--synthetic-rows',
+        type=int,
+        default=10_000,
+        help='Number of rows of the synthetic DataFrames and tables',
+    )
+    parser.addoption(
+        '--synthetic-areas',
+        type=int,
+        default=100,
+        help='Number of areas of the synthetic maps',
+    )
+
+
+@pytest.fixture(scope='session')
+def synthetic_rows(request: pytest.FixtureRequest) -> int:
+    return request.config.getoption('--synthetic-rows')
+
+
+@pytest.fixture(scope='session')
+def synthetic_areas(request: pytest.FixtureRequest) -> int:
+    return request.config.getoption('--synthetic-areas')
+
+
+@pytest.fixture(scope='session')
+def synthetic_dataframe(synthetic_rows: int) -> pd.DataFrame:
+    return make_dataframe(synthetic_rows)
+
+
+@pytest.fixture(scope='session')
+def sqlite_database(
+    tmp_path_factory: pytest.TempPathFactory, synthetic_rows: int
+) -> str:
+    database_file: str = str(
+        tmp_path_factory.mktemp('database') / 'synthetic.sqlite3'
+    )
+    make_sqlite_database(database_file, 'Synthetic', synthetic_rows)
+    return database_file
+
+
+@pytest.fixture(scope='session')
+def Excel_table_file(
+    tmp_path_factory: pytest.TempPathFactory, synthetic_rows: int
+) -> str:
+    Excel_file: str = str(tmp_path_factory.mktemp('Excel') / 'synthetic.xlsx')
+    make_Excel_table(Excel_file, 'Synthetic', synthetic_rows)
+    return Excel_file
+
+
+@pytest.fixture(scope='session')
+def polygon_map(
+    tmp_path_factory: pytest.TempPathFactory, synthetic_areas: int
+) -> box.Box:
+    return make_polygon_map(
+        str(tmp_path_factory.mktemp('map')), synthetic_areas
+    )
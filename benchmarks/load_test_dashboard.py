@@ -0,0 +1,171 @@
+'''
+Fires concurrent slider updates at a local slider dashboard
+(make_plot_sliders_dashboard) and checks that every response matches
+the slider values of its request (which fails if requests running at the
+same time interfere with each other's parameters).
+Run it from the repository root with:
+PYTHONPATH=src/ETS_CookBook python benchmarks/load_test_dashboard.py
+'''
+
+import concurrent.futures
+import multiprocessing
+import socket
+import time
+
+import box
+import numpy as np
+import plotly.graph_objects as go
+import requests
+
+import ETS_CookBook as cook
+
+HOST: str = '127.0.0.1'
+PORT: int = 8050
+NUMBER_OF_REQUESTS: int = 400
+CONCURRENT_REQUESTS: int = 16
+POINTS_PER_TRACE: int = 100
+
+dashboard_parameters: box.Box = box.Box(
+    {
+        'variables': {'slope': 1.0, 'level': 2},
+        'display': {'title': 'Load test', 'plot_height': 50},
+        'sliders': {
+            'slope_slider': {
+                'display_name': 'Slope',
+                'id': 'slope',
+                'minimum': 0,
+                'maximum': 10,
+                'step': 0.5,
+                'start_value': 1,
+                'ticks': [0, 5, 10],
+                'key': 'slope',
+            },
+            'level_slider': {
+                'display_name': 'Level',
+                'id': 'level',
+                'minimum': 0,
+                'maximum': 100,
+                'step': 1,
+                'start_value': 2,
+                'ticks': [0, 50, 100],
+                'key': 'level',
+            },
+        },
+    }
+)
+
+
+def compute_values(parameters: box.Box) -> list[list[float]]:
+    '''
+    Reads the variables with a pause in between, so that a request that
+    changes them in the middle would be noticed.
+    '''
+    slope: float = parameters.variables.slope
+    time.sleep(0.005)
+    level: float = parameters.variables.level
+    return [
+        [slope * point for point in range(POINTS_PER_TRACE)],
+        [level] * POINTS_PER_TRACE,
+    ]
+
+
+def make_plot(plotting_values: list[list[float]], parameters: box.Box):
+    '''
+    Plots the two traces.
+    '''
+    return go.Figure(
+        [go.Scatter(y=trace_values) for trace_values in plotting_values]
+    )
+
+
+def serve_dashboard() -> None:
+    '''
+    Runs the dashboard (in its own process).
+    '''
+    cook.make_plot_sliders_dashboard(
+        dashboard_parameters, compute_values, make_plot, cache_size=0
+    )
+
+
+def update_request(slope: float, level: int) -> tuple[float, bool]:
+    '''
+    Sends one slider update and returns its latency and whether the
+    returned plot matches the slider values.
+    '''
+    request_body: dict = {
+        'output': '..Display plot.figure...Plot slider values.data..',
+        'outputs': [
+            {'id': 'Display plot', 'property': 'figure'},
+            {'id': 'Plot slider values', 'property': 'data'},
+        ],
+        'inputs': [
+            {'id': 'slope', 'property': 'value', 'value': slope},
+            {'id': 'level', 'property': 'value', 'value': level},
+        ],
+        'changedPropIds': ['slope.value'],
+        'state': [
+            {'id': 'Plot slider values', 'property': 'data', 'value': None}
+        ],
+    }
+    request_start: float = time.perf_counter()
+    response: requests.Response = requests.post(
+        f'http://{HOST}:{PORT}/_dash-update-component', json=request_body
+    )
+    latency: float = time.perf_counter() - request_start
+    plot_data: list[dict] = response.json()['response']['Display plot'][
+        'figure'
+    ]['data']
+    is_consistent: bool = (
+        plot_data[0]['y'][1] == slope and plot_data[1]['y'][0] == level
+    )
+    return latency, is_consistent
+
+
+def wait_for_server(timeout: float = 30) -> None:
+    '''
+    Waits until the dashboard accepts connections.
+    '''
+    deadline: float = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with socket.create_connection((HOST, PORT), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError('The dashboard did not start')
+
+
+if __name__ == '__main__':
+    server_process = multiprocessing.Process(
+        target=serve_dashboard, daemon=True
+    )
+    server_process.start()
+    try:
+        wait_for_server()
+        random_generator = np.random.default_rng(34)
+        slopes: list[float] = (
+            random_generator.integers(0, 21, NUMBER_OF_REQUESTS) / 2
+        ).tolist()
+        levels: list[int] = random_generator.integers(
+            0, 101, NUMBER_OF_REQUESTS
+        ).tolist()
+
+        test_start: float = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(
+            CONCURRENT_REQUESTS
+        ) as request_executor:
+            results: list[tuple[float, bool]] = list(
+                request_executor.map(update_request, slopes, levels)
+            )
+        test_time: float = time.perf_counter() - test_start
+
+        latencies: np.ndarray = np.array([result[0] for result in results])
+        inconsistent_responses: int = sum(not result[1] for result in results)
+        print(
+            f'{NUMBER_OF_REQUESTS / test_time:.1f} requests/s, '
+            f'latency p50 {1000 * np.percentile(latencies, 50):.1f} ms, '
+            f'p95 {1000 * np.percentile(latencies, 95):.1f} ms, '
+            f'{inconsistent_responses} inconsistent responses'
+        )
+    finally:
+        server_process.terminate()
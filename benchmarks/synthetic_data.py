@@ -0,0 +1,277 @@
+'''
+Synthetic data generators for the CookBook benchmarks.
+'''
+
+import os
+import sqlite3
+
+import box
+import geopandas as gpd
+import numpy as np
+import openpyxl
+import openpyxl.utils
+import openpyxl.worksheet.table
+import pandas as pd
+import shapely
+
+
+def make_polygon_map(
+    output_folder: str, number_of_areas: int, vertices_per_area: int = 64
+) -> box.Box:
+    '''
+    Creates a map file with a grid of (irregular) polygons that stand in
+    for countries, a matching ISO A3 csv file, and returns map grid plot
+    parameters that use them.
+    '''
+    random_generator = np.random.default_rng(26)
+    grid_size: int = int(np.ceil(np.sqrt(number_of_areas)))
+    angles: np.ndarray = np.linspace(
+        0, 2 * np.pi, vertices_per_area, endpoint=False
+    )
+
+    polygons: list[shapely.Polygon] = []
+    for area_index in range(number_of_areas):
+        center_x: float = area_index % grid_size
+        center_y: float = area_index // grid_size
+        radii: np.ndarray = 0.45 * (
+            0.8 + 0.2 * random_generator.random(vertices_per_area)
+        )
+        polygons.append(
+            shapely.Polygon(
+                np.column_stack(
+                    (
+                        center_x + radii * np.cos(angles),
+                        center_y + radii * np.sin(angles),
+                    )
+                )
+            )
+        )
+
+    iso_codes: list[str] = [f'C{area_index:03d}' for area_index in range(
+        number_of_areas
+    )]
+    map_areas: gpd.GeoDataFrame = gpd.GeoDataFrame(
+        {'ISO_A3': iso_codes}, geometry=polygons, crs='EPSG:4326'
+    )
+    map_data_file: str = 'synthetic_map.geojson'
+    map_areas.to_file(f'{output_folder}/{map_data_file}', driver='GeoJSON')
+
+    isoA3_file: str = os.path.join(output_folder, 'isoA3.csv')
+    pd.DataFrame(
+        {
+            'Country': [f'Country {iso_code}' for iso_code in iso_codes],
+            'IsoA3': iso_codes,
+        }
+    ).to_csv(isoA3_file, index=False)
+
+    return box.Box(
+        {
+            'isoA3_file': isoA3_file,
+            'iso_A3_header': 'IsoA3',
+            'iso_A3_header_in_map_data': 'ISO_A3',
+            'figure_title': 'Synthetic map grid',
+            'rows': 3,
+            'columns': 4,
+            'map_data_folder': output_folder,
+            'map_data_file': map_data_file,
+            'zero_color': 'white',
+            'no_data_color': 'lightgray',
+            'values_column': 'Value',
+            'plot_title_font_size': 8,
+            'map_x_range': [-1, grid_size],
+            'map_y_range': [-1, grid_size],
+        }
+    )
+
+
+def make_quantities_data(
+    number_of_quantities: int, number_of_areas: int
+) -> list[pd.DataFrame]:
+    '''
+    Makes random values per (synthetic) country for a number of quantities.
+    Some countries are left out, so that the maps have no-data areas.
+    '''
+    random_generator = np.random.default_rng(27)
+    quantities_data: list[pd.DataFrame] = []
+    for quantity_index in range(number_of_quantities):
+        countries_with_data: np.ndarray = np.flatnonzero(
+            random_generator.random(number_of_areas) > 0.1
+        )
+        quantities_data.append(
+            pd.DataFrame(
+                {
+                    'Country': [
+                        f'Country C{area_index:03d}'
+                        for area_index in countries_with_data
+                    ],
+                    'Value': 100
+                    * random_generator.random(len(countries_with_data)),
+                }
+            )
+        )
+
+    return quantities_data
+
+
+def make_sankey_graph(
+    number_of_nodes: int, number_of_links: int
+) -> tuple[pd.DataFrame, pd.DataFrame, box.Box, box.Box]:
+    '''
+    Makes random Sankey nodes and links, with the Sankey parameters
+    and color definitions make_sankey needs.
+    '''
+    random_generator = np.random.default_rng(31)
+    color_names: list[str] = ['SFC_grenat', 'GSHC_gold', 'TNO_blue']
+    nodes: pd.DataFrame = pd.DataFrame(
+        {
+            'Label': [f'Node {index}' for index in range(number_of_nodes)],
+            'Value': np.round(100 * random_generator.random(number_of_nodes)),
+            'X position': random_generator.random(number_of_nodes),
+            'Y position': random_generator.random(number_of_nodes),
+            'Color': random_generator.choice(color_names, number_of_nodes),
+        }
+    )
+    links: pd.DataFrame = pd.DataFrame(
+        {
+            'Source': random_generator.choice(nodes.Label, number_of_links),
+            'Target': random_generator.choice(nodes.Label, number_of_links),
+            'Value': random_generator.random(number_of_links),
+            'Color': random_generator.choice(
+                ['source', 'target', *color_names], number_of_links
+            ),
+            'Opacity': np.round(random_generator.random(number_of_links), 2),
+            'Label': 'Flow',
+        }
+    )
+    Sankey_parameters: box.Box = box.Box(
+        {
+            'nodes': {
+                'label_padding': 15,
+                'label_alignement': 'center',
+                'display_values': True,
+                'unit': 'PJ',
+            },
+            'links': {'value_scaling_factor': 1},
+            'title_size': 20,
+        }
+    )
+    color_definitions: box.Box = box.Box(
+        {
+            'SFC_grenat': [133, 20, 43],
+            'GSHC_gold': [255, 211, 0],
+            'TNO_blue': [18, 62, 183],
+        }
+    )
+
+    return nodes, links, Sankey_parameters, color_definitions
+
+
+def make_dataframe(
+    number_of_rows: int, number_of_columns: int = 6
+) -> pd.DataFrame:
+    '''
+    Makes a DataFrame with random float columns, an integer column,
+    a text column, and a named index.
+    '''
+    random_generator = np.random.default_rng(38)
+    synthetic_dataframe: pd.DataFrame = pd.DataFrame(
+        random_generator.random((number_of_rows, number_of_columns)),
+        columns=[f'Value_{index}' for index in range(number_of_columns)],
+        index=pd.RangeIndex(number_of_rows, name='Row'),
+    )
+    synthetic_dataframe['Count'] = random_generator.integers(
+        0, 1000, number_of_rows
+    )
+    synthetic_dataframe['Area'] = random_generator.choice(
+        ['NL', 'BE', 'DE', 'FR', 'LU'], number_of_rows
+    )
+
+    return synthetic_dataframe
+
+
+def make_sqlite_database(
+    database_file: str, table_name: str, number_of_rows: int
+) -> None:
+    '''
+    Writes a synthetic DataFrame to a table of an SQLite database.
+    '''
+    with sqlite3.connect(database_file) as sql_connection:
+        make_dataframe(number_of_rows).to_sql(
+            table_name, sql_connection, if_exists='replace'
+        )
+    sql_connection.close()
+
+
+def make_Excel_table(
+    Excel_file: str, table_name: str, number_of_rows: int
+) -> None:
+    '''
+    Writes a synthetic DataFrame into a (named) table of an Excel workbook.
+    '''
+    table_dataframe: pd.DataFrame = make_dataframe(number_of_rows)
+    workbook: openpyxl.Workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.append(list(table_dataframe.columns))
+    for table_row in table_dataframe.itertuples(index=False):
+        worksheet.append(list(table_row))
+    table_range: str = (
+        f'A1:{openpyxl.utils.get_column_letter(len(table_dataframe.columns))}'
+        f'{number_of_rows + 1}'
+    )
+    worksheet.add_table(
+        openpyxl.worksheet.table.Table(displayName=table_name, ref=table_range)
+    )
+    workbook.save(Excel_file)
+
+
+def make_word_table_dataframe(
+    number_of_rows: int, number_of_columns: int
+) -> pd.DataFrame:
+    '''
+    Makes a DataFrame with two levels of column headers (with repeated
+    top-level headers, which get merged), to put in a Word document.
+    '''
+    random_generator = np.random.default_rng(39)
+    column_headers: pd.MultiIndex = pd.MultiIndex.from_tuples(
+        [
+            (f'Group {column_index // 3}', f'Column {column_index}')
+            for column_index in range(number_of_columns)
+        ]
+    )
+
+    return pd.DataFrame(
+        100 * random_generator.random((number_of_rows, number_of_columns)),
+        columns=column_headers,
+        index=pd.Index(
+            [f'Row {row_index}' for row_index in range(number_of_rows)],
+            name='Rows',
+        ),
+    )
+
+
+def make_color_bars(
+    number_of_color_bars: int, name_prefix: str = 'Synthetic'
+) -> tuple[box.Box, box.Box]:
+    '''
+    Makes color bar definitions (each with five colors) and the color
+    definitions they use.
+    '''
+    random_generator = np.random.default_rng(40)
+    color_definitions: box.Box = box.Box(
+        {
+            f'Color_{color_index}': random_generator.integers(
+                0, 256, 3
+            ).tolist()
+            for color_index in range(10)
+        }
+    )
+    color_bar_definitions: box.Box = box.Box(
+        {
+            f'{name_prefix}_{color_bar_index}': random_generator.choice(
+                list(color_definitions), 5
+            ).tolist()
+            for color_bar_index in range(number_of_color_bars)
+        }
+    )
+
+    return color_bar_definitions, color_definitions
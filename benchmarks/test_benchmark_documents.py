@@ -0,0 +1,22 @@
+import pytest
+
+import ETS_CookBook as cook
+from synthetic_data import make_word_table_dataframe
+
+
+@pytest.mark.parametrize('number_of_rows', [10, 25])
+def test_put_dataframe_in_word_document(benchmark, tmp_path, number_of_rows):
+    benchmark.group = 'put_dataframe_in_word_document'
+    word_table_dataframe = make_word_table_dataframe(number_of_rows, 9)
+    word_document_name: str = str(tmp_path / 'synthetic.docx')
+
+    def put_table_in_new_document() -> None:
+        # We start from a new document each time
+        tmp_path.joinpath('synthetic.docx').unlink(missing_ok=True)
+        cook.put_dataframe_in_word_document(
+            word_table_dataframe,
+            word_document_name,
+            number_formats=['.2f'] * len(word_table_dataframe.columns),
+        )
+
+    benchmark.pedantic(put_table_in_new_document, rounds=3)
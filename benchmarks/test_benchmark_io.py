@@ -0,0 +1,105 @@
+import box
+import pandas as pd
+import pytest
+
+import ETS_CookBook as cook
+
+SAVE_DATAFRAME_FORMATS: list[str] = [
+    'csv',
+    'json',
+    'excel',
+    'feather',
+    'parquet',
+    'pickle',
+    'sql',
+    'hdf',
+]
+# The libraries some formats need
+FORMAT_LIBRARIES: dict[str, str] = {
+    'feather': 'pyarrow',
+    'parquet': 'pyarrow',
+    'hdf': 'tables',
+}
+
+
+@pytest.mark.parametrize('file_format', SAVE_DATAFRAME_FORMATS)
+def test_save_dataframe(
+    benchmark, tmp_path, synthetic_dataframe, file_format
+):
+    if file_format in FORMAT_LIBRARIES:
+        pytest.importorskip(FORMAT_LIBRARIES[file_format])
+    benchmark.group = 'save_dataframe'
+    dataframe_formats: box.Box = box.Box(
+        {
+            format_name: format_name == file_format
+            for format_name in cook._DATAFRAME_FILE_TYPES
+        }
+    )
+    benchmark(
+        cook.save_dataframe,
+        synthetic_dataframe,
+        'Synthetic',
+        'Synthetic_group',
+        str(tmp_path),
+        dataframe_formats,
+    )
+
+
+@pytest.mark.parametrize('chunk_size', [1_000, 100_000])
+def test_put_dataframe_in_sql_in_chunks(
+    benchmark, tmp_path, synthetic_dataframe, chunk_size
+):
+    benchmark.group = 'put_dataframe_in_sql_in_chunks'
+    benchmark(
+        cook.put_dataframe_in_sql_in_chunks,
+        synthetic_dataframe,
+        str(tmp_path / 'chunks.sqlite3'),
+        'Synthetic',
+        chunk_size,
+    )
+
+
+def test_read_table_from_database(benchmark, sqlite_database, synthetic_rows):
+    table_dataframe: pd.DataFrame = benchmark(
+        cook.read_table_from_database, 'Synthetic', sqlite_database
+    )
+    assert len(table_dataframe) == synthetic_rows
+
+
+def test_dataframe_from_Excel_table_name(
+    benchmark, Excel_table_file, synthetic_rows
+):
+    table_dataframe: pd.DataFrame = benchmark(
+        cook.dataframe_from_Excel_table_name, 'Synthetic', Excel_table_file
+    )
+    assert len(table_dataframe) == synthetic_rows
+
+
+@pytest.mark.parametrize('codec', ['', 'gzip', 'bz2', 'xz', 'zstd'])
+@pytest.mark.parametrize('file_format', ['csv', 'json'])
+def test_compressed_text_outputs(
+    benchmark, tmp_path, synthetic_dataframe, file_format, codec
+):
+    if codec == 'zstd':
+        pytest.importorskip('zstandard')
+    benchmark.group = f'save_dataframe {file_format} compression'
+    dataframe_formats: box.Box = box.Box(
+        {
+            format_name: format_name == file_format
+            for format_name in cook._DATAFRAME_FILE_TYPES
+        }
+    )
+    dataframe_formats[f'{file_format}_settings'] = {'compression': codec}
+    benchmark(
+        cook.save_dataframe,
+        synthetic_dataframe,
+        'Synthetic',
+        'Synthetic_group',
+        str(tmp_path),
+        dataframe_formats,
+    )
+    # We record the sizes to compare them with the write times
+    (saved_file,) = tmp_path.glob(f'Synthetic.{file_format}*')
+    benchmark.extra_info['File size (MB)'] = (
+        saved_file.stat().st_size / 1_000_000
+    )
@@ -0,0 +1,62 @@
+import itertools
+
+import box
+import matplotlib.pyplot as plt
+
+import ETS_CookBook as cook
+from synthetic_data import make_color_bars, make_quantities_data
+from synthetic_data import make_sankey_graph
+
+# Registered color bars are not registered again, so each round
+# gets new names
+color_bar_rounds: itertools.count = itertools.count()
+
+
+def test_register_color_bars(benchmark):
+    def new_color_bars() -> tuple[tuple[box.Box, box.Box], dict]:
+        return (
+            make_color_bars(10, f'Benchmark_{next(color_bar_rounds)}'),
+            {},
+        )
+
+    benchmark.pedantic(
+        cook.register_color_bars, setup=new_color_bars, rounds=10
+    )
+
+
+def test_map_grid(benchmark, tmp_path, polygon_map, synthetic_areas):
+    map_grid_plot_parameters: box.Box = box.Box(polygon_map)
+    map_grid_plot_parameters.rows = 2
+    map_grid_plot_parameters.columns = 2
+    quantities_data = make_quantities_data(4, synthetic_areas)
+
+    def make_map_grid() -> None:
+        cook.map_grid(
+            quantities_data,
+            [f'Quantity {index}' for index in range(4)],
+            ['blue', 'red', 'green', 'blue'],
+            str(tmp_path),
+            map_grid_plot_parameters,
+            box.Box(),
+            box.Box(),
+            100,
+            box.Box({'png': True}),
+        )
+        plt.close('all')
+
+    benchmark.pedantic(make_map_grid, rounds=3)
+
+
+def test_make_sankey(benchmark, tmp_path):
+    nodes, links, Sankey_parameters, color_definitions = make_sankey_graph(
+        40, 200
+    )
+    benchmark(
+        cook.make_sankey,
+        nodes,
+        links,
+        'Synthetic Sankey',
+        str(tmp_path),
+        Sankey_parameters,
+        color_definitions,
+    )
@@ -5,15 +5,33 @@ They are listed in the following documentation:
 https://tno.github.io/ETS_CookBook/
 '''
 
+import base64
+import collections
 import collections.abc
+import concurrent.futures
+import contextlib
+import dataclasses
 import datetime
 import functools
+import hashlib
+import html
+import importlib.util
+import inspect
+import io
+import itertools
+import keyword
 import math
 import os
+import random
+import re
 import sqlite3
 import time
+import threading
 import tomllib
+import tracemalloc
+import types
 import typing as ty
+import weakref
 import zipfile
 
 import box
@@ -26,8 +44,14 @@ import docx.table
 import geopandas as gpd
 import matplotlib
 import matplotlib.axes
+import matplotlib.backends.backend_agg
+import matplotlib.cm
+import matplotlib.collections
 import matplotlib.colors
 import matplotlib.figure
+import matplotlib.gridspec
+import matplotlib.image
+import matplotlib.path
 import matplotlib.projections
 import matplotlib.pyplot as plt
 import numpy as np
@@ -36,9 +60,13 @@ import openpyxl.worksheet
 import openpyxl.worksheet.cell_range
 import openpyxl.worksheet.table
 import pandas as pd
+import PIL.Image
 import plotly
 import plotly.graph_objects as go
+import plotly.offline
 import requests
+import rich.table
+import shapely
 import xarray as xr
 from docx.table import Table as docx_Table
 from rich import print
@@ -57,15 +85,178 @@ def check_if_folder_exists(folder_to_check: str) -> None:
         os.makedirs(folder_to_check)
 
 
-def parameters_from_TOML(parameters_file_name: str) -> box.Box:
+# The parsed TOML files, with their path and modification time as key
+_TOML_files: dict[tuple[str, int], dict[str, ty.Any]] = {}
+
+
+def _read_TOML_file(TOML_file_name: str) -> dict[str, ty.Any]:
+    '''
+    Reads (and parses) a TOML file, unless it has been read already
+    and has not changed since.
+    '''
+    TOML_file_path: str = os.path.abspath(TOML_file_name)
+    TOML_file_key: tuple[str, int] = (
+        TOML_file_path,
+        os.stat(TOML_file_path).st_mtime_ns,
+    )
+    if TOML_file_key not in _TOML_files:
+        # We forget the older versions of the file
+        for old_file_key in [
+            file_key
+            for file_key in _TOML_files
+            if file_key[0] == TOML_file_path
+        ]:
+            del _TOML_files[old_file_key]
+        with open(TOML_file_path, mode='rb') as parameters_file:
+            _TOML_files[TOML_file_key] = tomllib.load(parameters_file)
+
+    return _TOML_files[TOML_file_key]
+
+
+def _merged_parameters(
+    base_parameters: dict[str, ty.Any], overlay_parameters: dict[str, ty.Any]
+) -> dict[str, ty.Any]:
+    '''
+    Returns the base parameters with the overlay parameters put on top
+    (tables/dictionaries are merged, other values are replaced).
+    Neither of the two is modified.
+    '''
+    merged_parameters: dict[str, ty.Any] = dict(base_parameters)
+    for key, overlay_value in overlay_parameters.items():
+        base_value: ty.Any = merged_parameters.get(key)
+        if isinstance(base_value, dict) and isinstance(overlay_value, dict):
+            merged_parameters[key] = _merged_parameters(
+                base_value, overlay_value
+            )
+        else:
+            merged_parameters[key] = overlay_value
+
+    return merged_parameters
+
+
+def _TOML_parameters_with_includes(
+    TOML_file_name: str,
+    include_key: str | None,
+    including_files: tuple[str, ...] = (),
+) -> dict[str, ty.Any]:
+    '''
+    Gets the parameters of a TOML file, put on top of the parameters of
+    the files it includes (paths relative to the TOML file).
+    The including files are the files whose includes led to this one
+    (to stop files that include each other).
+    '''
+    TOML_file_path: str = os.path.abspath(TOML_file_name)
+    if TOML_file_path in including_files:
+        cycle_start: int = including_files.index(TOML_file_path)
+        include_cycle: str = ' -> '.join(
+            [*including_files[cycle_start:], TOML_file_path]
+        )
+        raise ValueError(f'TOML files include each other: {include_cycle}')
+    TOML_parameters: dict[str, ty.Any] = _read_TOML_file(TOML_file_path)
+    if include_key is None:
+        return TOML_parameters
+    included_files: ty.Any = TOML_parameters.get(include_key, [])
+    if not included_files:
+        return TOML_parameters
+    if isinstance(included_files, str):
+        included_files = [included_files]
+    if not isinstance(included_files, list) or not all(
+        isinstance(included_file, str) for included_file in included_files
+    ):
+        raise ValueError(
+            f'The {include_key} key of {TOML_file_path} must be a file name '
+            f'or a list of file names'
+        )
+
+    TOML_folder: str = os.path.dirname(TOML_file_path)
+    parameters: dict[str, ty.Any] = {}
+    for included_file in included_files:
+        parameters = _merged_parameters(
+            parameters,
+            _TOML_parameters_with_includes(
+                os.path.join(TOML_folder, included_file),
+                include_key,
+                (*including_files, TOML_file_path),
+            ),
+        )
+    own_parameters: dict[str, ty.Any] = {
+        key: value
+        for key, value in TOML_parameters.items()
+        if key != include_key
+    }
+
+    return _merged_parameters(parameters, own_parameters)
+
+
+def parameters_from_TOML(
+    parameters_file_name: str,
+    overlay_file_names: list[str] | None = None,
+    include_key: str | None = None,
+) -> box.Box:
     '''
     Reads a TOML parameters file name and returns a parameters Box.
+    If you give an include key (such as 'include'), the file can include
+    other TOML files (for example a base configuration) with that key
+    (with a file name or a list of file names, relative to the file).
+    The parameters of the file are then put on top of those of the included
+    files. Files that include each other raise a ValueError.
+    Without an include key (the default), no key has a special meaning.
+    You can also give overlay files (for example for a scenario), whose
+    parameters are put on top of those of the parameters file (in order).
+    Tables are merged, other values are replaced.
+    The parsed files are cached, and only read again if they change.
+    '''
+    if overlay_file_names is None:
+        overlay_file_names = []
+    parameters: dict[str, ty.Any] = _TOML_parameters_with_includes(
+        parameters_file_name, include_key
+    )
+    for overlay_file_name in overlay_file_names:
+        parameters = _merged_parameters(
+            parameters,
+            _TOML_parameters_with_includes(overlay_file_name, include_key),
+        )
+
+    # The Box conversion copies the (cached) parameters
+    return box.Box(parameters)
+
+
+def parameters_view(parameters: dict, view_name: str = 'Parameters') -> ty.Any:
+    '''
+    Returns a read-only view of parameters (a Box or dictionary) for
+    fast attribute access (for example in loops), with frozen, slotted
+    dataclasses instead of Boxes/dictionaries, and tuples instead
+    of lists. Tables whose keys are not valid attribute names stay
+    (read-only) dictionaries.
     '''
 
-    with open(parameters_file_name, mode='rb') as parameters_file:
-        parameters: box.Box = box.Box(tomllib.load(parameters_file))
+    def view_value(value: ty.Any, value_name: str) -> ty.Any:
+        if isinstance(value, dict):
+            return parameters_view(value, value_name)
+        if isinstance(value, list):
+            return tuple(
+                view_value(list_value, value_name) for list_value in value
+            )
+        return value
+
+    view_values: dict[str, ty.Any] = {
+        key: view_value(value, str(key)) for key, value in parameters.items()
+    }
+    if not all(
+        isinstance(key, str)
+        and key.isidentifier()
+        and not keyword.iskeyword(key)
+        for key in view_values
+    ):
+        return types.MappingProxyType(view_values)
+    view_class: type = dataclasses.make_dataclass(
+        view_name if view_name.isidentifier() else 'Parameters',
+        list(view_values),
+        frozen=True,
+        slots=True,
+    )
 
-    return parameters
+    return view_class(**view_values)
 
 
 def reference_scale(
@@ -111,6 +302,338 @@ def reference_scale(
     return [lower_scale, upper_scale]
 
 
+def reference_scales(
+    number_table: np.ndarray | pd.DataFrame,
+    digit_shift: int = 0,
+    axis: int = 0,
+) -> tuple[np.ndarray, np.ndarray] | pd.DataFrame:
+    '''
+    This function does the same as reference_scale, but for many
+    series of numbers at once: the columns (or the rows if axis is 1) of a
+    2-D array or of a DataFrame.
+    For an array, it returns an array of lower boundaries and an array
+    of upper boundaries. For a DataFrame, it returns a DataFrame with
+    a Lower scale and an Upper scale column (with the column or row names
+    as index).
+    NaN values are ignored, and series with only NaN values get NaN
+    boundaries.
+    To get the scales per group, you can use it on the minimum and maximum
+    of each group (with axis=1), for example:
+    reference_scales(dataframe.groupby('Group')['Value'].agg(['min', 'max']),
+    axis=1)
+    '''
+    table_values: np.ndarray = np.asarray(number_table, dtype=float)
+    # fmin/fmax ignore NaN values (and do not warn for all-NaN series)
+    number_table_boundaries: np.ndarray = np.stack(
+        [
+            np.fmin.reduce(table_values, axis=axis),
+            np.fmax.reduce(table_values, axis=axis),
+        ]
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # We truncate the powers of ten the same way as int() does
+        # in reference_scale
+        boundary_powers_of_ten: np.ndarray = np.where(
+            number_table_boundaries != 0,
+            np.trunc(np.log10(np.abs(number_table_boundaries))) - digit_shift,
+            0,
+        )
+    dividers: np.ndarray = 10.0**boundary_powers_of_ten
+
+    lower_scales: np.ndarray = (
+        np.floor(number_table_boundaries[0] / dividers[0]) * dividers[0]
+    )
+    upper_scales: np.ndarray = (
+        np.ceil(number_table_boundaries[1] / dividers[1]) * dividers[1]
+    )
+
+    if isinstance(number_table, pd.DataFrame):
+        return pd.DataFrame(
+            {'Lower scale': lower_scales, 'Upper scale': upper_scales},
+            index=number_table.columns if axis == 0 else number_table.index,
+        )
+
+    return lower_scales, upper_scales
+
+
+# The functions that get the events of the I/O helpers
+# (instrumentation is off if there are none)
+_instrumentation_callbacks: list[ty.Callable[[dict[str, ty.Any]], None]] = []
+
+
+def add_instrumentation_callback(
+    instrumentation_callback: ty.Callable[[dict[str, ty.Any]], None],
+) -> None:
+    '''
+    Adds a function that is called with an event (a dictionary) each time
+    an I/O helper of the CookBook runs. The event contains
+    the operation (the helper name), the target (file, folder,
+    or database), the number of rows (of the saved or read DataFrame,
+    None if there is no DataFrame), the bytes (the size of the target
+    file(s) after the operation, None if there are none),
+    the start time (a timestamp), the duration (in seconds), and the error
+    (None if the operation succeeded).
+    The helpers are save_dataframe, put_dataframe_in_sql_in_chunks,
+    read_table_from_database, download_and_save_file, from_grib_to_dataframe,
+    dataframe_from_Excel_table_name, save_figure, and the reading of
+    map files.
+    '''
+    _instrumentation_callbacks.append(instrumentation_callback)
+
+
+def remove_instrumentation_callback(
+    instrumentation_callback: ty.Callable[[dict[str, ty.Any]], None],
+) -> None:
+    '''
+    Removes a function added with add_instrumentation_callback.
+    '''
+    _instrumentation_callbacks.remove(instrumentation_callback)
+
+
+def opentelemetry_instrumentation_callback(
+    tracer_name: str = 'ETS_CookBook',
+) -> ty.Callable[[dict[str, ty.Any]], None]:
+    '''
+    Returns an instrumentation callback that exports each event as an
+    OpenTelemetry span. You need to install opentelemetry-api (and set up
+    an OpenTelemetry SDK/exporter) to use it. Use it with:
+    add_instrumentation_callback(opentelemetry_instrumentation_callback())
+    '''
+    # This is an optional dependency, so we only import it if it is used
+    import opentelemetry.trace
+
+    tracer: ty.Any = opentelemetry.trace.get_tracer(tracer_name)
+
+    def export_event(event: dict[str, ty.Any]) -> None:
+        start_time: int = int(event['start_time'] * 1e9)
+        event_attributes: dict[str, ty.Any] = {
+            f'ets_cookbook.{event_key}': event[event_key]
+            for event_key in ['target', 'rows', 'bytes']
+            if event[event_key] is not None
+        }
+        event_span: ty.Any = tracer.start_span(
+            event['operation'],
+            start_time=start_time,
+            attributes=event_attributes,
+        )
+        if event['error'] is not None:
+            event_span.set_status(
+                opentelemetry.trace.Status(
+                    opentelemetry.trace.StatusCode.ERROR, event['error']
+                )
+            )
+        event_span.end(end_time=start_time + int(event['duration'] * 1e9))
+
+    return export_event
+
+
+def _target_files(
+    target: str, file_names: list[str]
+) -> dict[str, tuple[int, int]]:
+    '''
+    Gets the files with the given names (and any extension) in a target
+    folder, with their modification time (in ns) and size (in bytes).
+    '''
+    if not file_names or not os.path.isdir(target):
+        return {}
+    file_prefixes: tuple[str, ...] = tuple(
+        f'{file_name}.' for file_name in file_names
+    )
+    target_files: dict[str, tuple[int, int]] = {}
+    for target_file in os.scandir(target):
+        if target_file.is_file() and target_file.name.startswith(
+            file_prefixes
+        ):
+            target_file_status: os.stat_result = target_file.stat()
+            target_files[target_file.name] = (
+                target_file_status.st_mtime_ns,
+                target_file_status.st_size,
+            )
+
+    return target_files
+
+
+def _target_size(
+    target: str,
+    file_names: list[str],
+    files_before: dict[str, tuple[int, int]],
+) -> int | None:
+    '''
+    Gets the size (in bytes) of a target file or of the files
+    with the given names (and any extension) in a target folder that
+    were written since files_before (see _target_files) was taken.
+    '''
+    if not file_names:
+        if os.path.isfile(target):
+            return os.path.getsize(target)
+        return None
+    if not os.path.isdir(target):
+        return None
+    return sum(
+        file_size
+        for file_name, (modification_time, file_size) in _target_files(
+            target, file_names
+        ).items()
+        if files_before.get(file_name) != (modification_time, file_size)
+    )
+
+
+def _send_io_event(
+    operation: str,
+    target: str | ty.Callable[[dict[str, ty.Any]], str],
+    rows_argument: str | None,
+    file_name_arguments: tuple[str, ...],
+    event_arguments: dict[str, ty.Any],
+    function_result: ty.Any,
+    files_before: dict[str, tuple[int, int]],
+    start_time: float,
+    duration: float,
+    function_error: str | None,
+) -> None:
+    '''
+    Makes the event of an I/O helper call and sends it to the
+    instrumentation callbacks. Errors in making the event or in the
+    callbacks are printed (they never stop the I/O helper).
+    '''
+    try:
+        if isinstance(target, str):
+            event_target: str = str(event_arguments[target])
+        else:
+            event_target = target(event_arguments)
+        event_rows: int | None = None
+        if rows_argument is not None:
+            event_rows = len(event_arguments[rows_argument])
+        elif isinstance(function_result, pd.DataFrame):
+            event_rows = len(function_result)
+        io_event: dict[str, ty.Any] = {
+            'operation': operation,
+            'target': event_target,
+            'rows': event_rows,
+            'bytes': _target_size(
+                event_target,
+                [
+                    str(event_arguments[file_name_argument])
+                    for file_name_argument in file_name_arguments
+                ],
+                files_before,
+            ),
+            'start_time': start_time,
+            'duration': duration,
+            'error': function_error,
+        }
+    except Exception as event_error:
+        print(f'No instrumentation event for {operation}: {event_error!r}')
+        return
+    for instrumentation_callback in list(_instrumentation_callbacks):
+        try:
+            instrumentation_callback(io_event)
+        except Exception as callback_error:
+            print(
+                f'Instrumentation callback {instrumentation_callback!r} '
+                f'failed for {operation}: {callback_error!r}'
+            )
+
+
+def _instrumented(
+    operation: str,
+    target: str | ty.Callable[[dict[str, ty.Any]], str],
+    rows_argument: str | None = None,
+    file_name_arguments: tuple[str, ...] = (),
+) -> ty.Callable:
+    '''
+    Decorator that sends an event to the instrumentation callbacks
+    each time an I/O helper runs. The target is the name of the argument
+    with the target file or folder (or a function that gets it from
+    the arguments). The rows come from the DataFrame argument given by
+    rows_argument (or from the result if it is a DataFrame). If the target
+    is a folder, the bytes are the size of the files in it that are named
+    after the file_name_arguments and that the call wrote.
+    The event is sent after the I/O helper has returned or raised (its
+    own exceptions are raised unchanged).
+    '''
+
+    def instrumented_decorator(io_function: ty.Callable) -> ty.Callable:
+        io_function_signature: inspect.Signature = inspect.signature(
+            io_function
+        )
+
+        @functools.wraps(io_function)
+        def instrumented_wrapper(
+            *function_arguments: ty.Any, **function_keyword_arguments: ty.Any
+        ) -> ty.Any:
+            # We only do something if there are callbacks
+            if not _instrumentation_callbacks:
+                return io_function(
+                    *function_arguments, **function_keyword_arguments
+                )
+
+            event_arguments: dict[str, ty.Any] = {}
+            files_before: dict[str, tuple[int, int]] = {}
+            try:
+                bound_arguments: inspect.BoundArguments = (
+                    io_function_signature.bind(
+                        *function_arguments, **function_keyword_arguments
+                    )
+                )
+                bound_arguments.apply_defaults()
+                event_arguments = bound_arguments.arguments
+                # We note the files that are already there, so that
+                # we only count the ones this call writes
+                if file_name_arguments and isinstance(target, str):
+                    files_before = _target_files(
+                        str(event_arguments[target]),
+                        [
+                            str(event_arguments[file_name_argument])
+                            for file_name_argument in file_name_arguments
+                        ],
+                    )
+            except Exception:
+                # The I/O helper itself reports wrong arguments
+                return io_function(
+                    *function_arguments, **function_keyword_arguments
+                )
+
+            start_time: float = time.time()
+            timer_start: float = time.perf_counter()
+            try:
+                function_result: ty.Any = io_function(
+                    *function_arguments, **function_keyword_arguments
+                )
+            except Exception as io_error:
+                _send_io_event(
+                    operation,
+                    target,
+                    rows_argument,
+                    file_name_arguments,
+                    event_arguments,
+                    None,
+                    files_before,
+                    start_time,
+                    time.perf_counter() - timer_start,
+                    repr(io_error),
+                )
+                raise
+            _send_io_event(
+                operation,
+                target,
+                rows_argument,
+                file_name_arguments,
+                event_arguments,
+                function_result,
+                files_before,
+                start_time,
+                time.perf_counter() - timer_start,
+                None,
+            )
+
+            return function_result
+
+        return instrumented_wrapper
+
+    return instrumented_decorator
+
+
+@_instrumented('dataframe_from_Excel_table_name', 'Excel_file')
 def dataframe_from_Excel_table_name(
     table_name: str, Excel_file: str, load_data_only: bool = True
 ) -> pd.DataFrame:
@@ -370,27 +893,670 @@ def get_season(time_stamp: datetime.datetime) -> str:
     return result_season
 
 
+def get_seasons(
+    time_stamps: pd.DatetimeIndex | pd.Series | np.ndarray | list,
+    season_starts: dict[str, tuple[int, int]] | None = None,
+    hemisphere: str = 'north',
+) -> pd.Categorical | pd.Series:
+    '''
+    This function tells us in which season each of a series of
+    timestamps (a DatetimeIndex, a Series, an array or a list) is.
+    It does the same as get_season, but for all timestamps at once.
+    The seasons are given by the (month, day) they start on (in the
+    northern hemisphere); the default is the same as get_season. In the
+    southern hemisphere, winter and summer (and spring and fall) are swapped.
+    It returns a Categorical (or a categorical Series with the same index
+    if the timestamps are in a Series).
+    '''
+    if season_starts is None:
+        season_starts = {
+            'spring': (3, 21),
+            'summer': (6, 21),
+            'fall': (9, 23),
+            'winter': (12, 21),
+        }
+    if hemisphere == 'south':
+        opposite_seasons: dict[str, str] = {
+            'winter': 'summer',
+            'spring': 'fall',
+            'summer': 'winter',
+            'fall': 'spring',
+        }
+        season_starts = {
+            opposite_seasons.get(season, season): season_start
+            for season, season_start in season_starts.items()
+        }
+    elif hemisphere != 'north':
+        raise ValueError("The hemisphere must be 'north' or 'south'")
+
+    # We code the dates and season starts as month * 100 + day,
+    # which is the same in leap years and other years
+    ordered_starts: list[tuple[int, str]] = sorted(
+        (month * 100 + day, season)
+        for season, (month, day) in season_starts.items()
+    )
+    start_codes: np.ndarray = np.array(
+        [start_code for start_code, season in ordered_starts]
+    )
+    # The dates before the first start are in the last season of the year
+    season_labels: list[str] = [ordered_starts[-1][1]] + [
+        season for start_code, season in ordered_starts
+    ]
+    season_categories: list[str] = list(dict.fromkeys(season_labels))
+    label_category_codes: np.ndarray = np.array(
+        [season_categories.index(season) for season in season_labels]
+    )
+
+    time_stamp_index: pd.DatetimeIndex = pd.DatetimeIndex(time_stamps)
+    date_codes: np.ndarray = (
+        time_stamp_index.month.to_numpy(dtype=float) * 100
+        + time_stamp_index.day.to_numpy(dtype=float)
+    )
+    category_codes: np.ndarray = label_category_codes[
+        np.searchsorted(start_codes, date_codes, side='right')
+    ]
+    # Missing timestamps get no season
+    category_codes[np.isnan(date_codes)] = -1
+
+    seasons: pd.Categorical = pd.Categorical.from_codes(
+        category_codes, categories=season_categories
+    )
+    if isinstance(time_stamps, pd.Series):
+        return pd.Series(
+            seasons, index=time_stamps.index, name=time_stamps.name
+        )
+
+    return seasons
+
+
+# The run time percentiles are computed from a (uniform) random sample of
+# at most this many calls of each function
+TIMING_SAMPLE_SIZE: int = 1024
+
+
+@dataclasses.dataclass
+class _FunctionTimings:
+    '''
+    The aggregated timings of the calls of a timed function: their number,
+    the total, minimal and maximal run times, the total exclusive
+    run time (without the timed functions it calls) and CPU time,
+    the maximal memory peak (in bytes), and a sample of run times.
+    '''
+
+    calls: int = 0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = 0.0
+    exclusive_total: float = 0.0
+    cpu_total: float = 0.0
+    memory_peak: float = math.nan
+    run_time_sample: list[float] = dataclasses.field(default_factory=list)
+
+    def add_call(
+        self,
+        run_time: float,
+        exclusive_time: float,
+        cpu_time: float,
+        memory_used: float,
+    ) -> None:
+        self.calls += 1
+        self.total += run_time
+        self.minimum = min(self.minimum, run_time)
+        self.maximum = max(self.maximum, run_time)
+        self.exclusive_total += exclusive_time
+        self.cpu_total += cpu_time
+        if math.isnan(self.memory_peak) or memory_used > self.memory_peak:
+            self.memory_peak = memory_used
+        # We keep a reservoir sample, so that each call has the same
+        # chance of being in it
+        if len(self.run_time_sample) < TIMING_SAMPLE_SIZE:
+            self.run_time_sample.append(run_time)
+        else:
+            sample_index: int = random.randrange(self.calls)
+            if sample_index < TIMING_SAMPLE_SIZE:
+                self.run_time_sample[sample_index] = run_time
+
+
+# The timing registry keeps the aggregated timings of each timed function
+_function_timings: dict[str, _FunctionTimings] = collections.defaultdict(
+    _FunctionTimings
+)
+_function_timings_lock: threading.Lock = threading.Lock()
+# Each thread has its own stack of running timed calls
+_timer_frames: threading.local = threading.local()
+function_timer_settings: dict[str, bool] = {
+    'print_times': True,
+    'cpu_time': False,
+    'memory_peak': False,
+}
+# Whether the timer started tracemalloc (so that it stops it when
+# memory_peak is switched off again)
+_timer_tracemalloc: dict[str, bool] = {'started': False}
+
+
+def _timed_call(
+    timing_name: str,
+    timed_function: ty.Callable,
+    function_arguments: tuple,
+    function_keyword_arguments: dict[str, ty.Any],
+) -> tuple[ty.Any, float]:
+    '''
+    Calls a function and records its run time (and its CPU time and
+    memory peak if these are switched on in the function_timer_settings)
+    in the timing registry. Returns the function result and its run time.
+    '''
+    frames: list[list[float]] | None = getattr(_timer_frames, 'frames', None)
+    if frames is None:
+        frames = []
+        _timer_frames.frames = frames
+    measure_cpu_time: bool = function_timer_settings['cpu_time']
+    measure_memory_peak: bool = function_timer_settings['memory_peak']
+    memory_start: int = 0
+    if _timer_tracemalloc['started'] and not measure_memory_peak:
+        # Tracing slows everything down, so we stop it if we started it
+        _timer_tracemalloc['started'] = False
+        tracemalloc.stop()
+    if measure_memory_peak:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _timer_tracemalloc['started'] = True
+        memory_start, memory_peak = tracemalloc.get_traced_memory()
+        # We reset the peak to measure ours, so we keep the peak
+        # the calling function reached so far
+        if frames:
+            frames[-1][1] = max(frames[-1][1], memory_peak)
+        tracemalloc.reset_peak()
+    # Each frame keeps the time spent in timed sub-calls and
+    # their memory peak
+    frames.append([0.0, 0.0])
+    cpu_start: float = time.thread_time()
+    timer_start: float = time.perf_counter()
+    try:
+        function_result: ty.Any = timed_function(
+            *function_arguments, **function_keyword_arguments
+        )
+    finally:
+        run_time: float = time.perf_counter() - timer_start
+        cpu_time: float = (
+            time.thread_time() - cpu_start if measure_cpu_time else math.nan
+        )
+        sub_calls_time, sub_calls_memory_peak = frames.pop()
+        memory_used: float = math.nan
+        if measure_memory_peak and tracemalloc.is_tracing():
+            memory_peak = max(
+                tracemalloc.get_traced_memory()[1], sub_calls_memory_peak
+            )
+            memory_used = memory_peak - memory_start
+        if frames:
+            frames[-1][0] += run_time
+            if measure_memory_peak:
+                frames[-1][1] = max(frames[-1][1], memory_peak)
+        with _function_timings_lock:
+            _function_timings[timing_name].add_call(
+                run_time, run_time - sub_calls_time, cpu_time, memory_used
+            )
+
+    return function_result, run_time
+
+
+def _io_timer(timing_name: str) -> ty.Callable:
+    '''
+    Decorator for I/O helpers. The time spent in them is recorded in the
+    timing registry (without printing) when they are called
+    from within a function that uses function_timer.
+    '''
+
+    def io_timer_decorator(io_function: ty.Callable) -> ty.Callable:
+        @functools.wraps(io_function)
+        def io_timer_wrapper(
+            *function_arguments: ty.Any, **function_keyword_arguments: ty.Any
+        ) -> ty.Any:
+            if not getattr(_timer_frames, 'frames', None):
+                return io_function(
+                    *function_arguments, **function_keyword_arguments
+                )
+            return _timed_call(
+                timing_name,
+                io_function,
+                function_arguments,
+                function_keyword_arguments,
+            )[0]
+
+        return io_timer_wrapper
+
+    return io_timer_decorator
+
+
+@_instrumented('read_map_file', 'map_file')
+@_io_timer('geopandas.read_file')
+def _read_geographic_file(
+    map_file: str, **read_keyword_arguments: ty.Any
+) -> gpd.GeoDataFrame:
+    return gpd.read_file(map_file, **read_keyword_arguments)
+
+
+@_io_timer('pandas.read_sql')
+def _read_sql(
+    *read_arguments: ty.Any, **read_keyword_arguments: ty.Any
+) -> pd.DataFrame:
+    return pd.read_sql(*read_arguments, **read_keyword_arguments)
+
+
+@_instrumented('save_figure', 'output_folder', None, ('figure_name',))
 def save_figure(
     figure: matplotlib.figure.Figure,
     figure_name: str,
     output_folder: str,
     dpi_to_use: int,
     file_formats: box.Box,
-) -> None:
+    return_bytes: bool = False,
+) -> dict[str, bytes] | None:
     '''
     This function saves a Matplolib figure to a number of
     file formats and an output folder.
+
+    The figure is drawn only once for all the raster formats (png, jpg,
+    tif, webp), which are then encoded from that single pixel buffer.
+    Other (vector) formats are drawn one after the other, since
+    Matplotlib figures cannot be drawn from several threads at once.
+    The encoding and the file writes happen in a thread pool.
+    If return_bytes is True, nothing is written and the function
+    returns a dictionary with the encoded bytes of each file format.
     '''
 
-    check_if_folder_exists(output_folder)
+    formats_to_save: list[str] = [
+        file_format
+        for file_format in file_formats
+        if file_formats[file_format]
+    ]
+    raster_formats: list[str] = []
+    if _can_render_figure_once():
+        raster_formats = [
+            file_format
+            for file_format in formats_to_save
+            if file_format.lower() in _RASTER_FIGURE_FORMATS
+        ]
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        figure_bytes_futures: dict[str, concurrent.futures.Future] = {}
+        if raster_formats:
+            figure_pixels: np.ndarray = _rendered_figure_pixels(
+                figure, dpi_to_use
+            )
+            for file_format in raster_formats:
+                figure_bytes_futures[file_format] = executor.submit(
+                    _encoded_figure_pixels,
+                    figure_pixels,
+                    file_format,
+                    dpi_to_use,
+                )
+        for file_format in formats_to_save:
+            if file_format not in figure_bytes_futures:
+                # We draw these in this thread, as figures are not
+                # thread-safe.
+                figure_bytes_futures[file_format] = _finished_future(
+                    _saved_figure_bytes, figure, file_format, dpi_to_use
+                )
 
-    for file_format in file_formats:
-        if file_formats[file_format]:
-            figure.savefig(
-                f'{output_folder}/{figure_name}.{file_format}', dpi=dpi_to_use
+        if return_bytes:
+            return {
+                file_format: figure_bytes_futures[file_format].result()
+                for file_format in formats_to_save
+            }
+
+        check_if_folder_exists(output_folder)
+        write_futures: list[concurrent.futures.Future] = [
+            executor.submit(
+                _write_figure_bytes,
+                figure_bytes_future,
+                f'{output_folder}/{figure_name}.{file_format}',
+            )
+            for file_format, figure_bytes_future in (
+                figure_bytes_futures.items()
             )
+        ]
+        for write_future in write_futures:
+            write_future.result()
+
+    return None
+
+
+_RASTER_FIGURE_FORMATS: dict[str, str] = {
+    'png': 'png',
+    'jpg': 'jpeg',
+    'jpeg': 'jpeg',
+    'tif': 'tiff',
+    'tiff': 'tiff',
+    'webp': 'webp',
+}
+
+
+def _can_render_figure_once() -> bool:
+    '''
+    Tells if the savefig settings allow a single Agg render to be
+    reused for all raster formats (tight bounding boxes and
+    face/edge colour overrides change what savefig draws).
+    '''
+
+    return (
+        matplotlib.rcParams['savefig.bbox'] != 'tight'
+        and not matplotlib.rcParams['savefig.transparent']
+        and matplotlib.rcParams['savefig.facecolor'] == 'auto'
+        and matplotlib.rcParams['savefig.edgecolor'] == 'auto'
+    )
+
+
+def _rendered_figure_pixels(
+    figure: matplotlib.figure.Figure, dpi_to_use: int
+) -> np.ndarray:
+    '''
+    Draws the figure once with Agg at the given dpi and returns a copy
+    of its RGBA buffer. The figure's own canvas and dpi are restored.
+    '''
+
+    original_canvas = figure.canvas
+    original_dpi: float = figure.dpi
+    try:
+        figure.set_dpi(dpi_to_use)
+        agg_canvas = matplotlib.backends.backend_agg.FigureCanvasAgg(figure)
+        agg_canvas.draw()
+        figure_pixels: np.ndarray = np.array(agg_canvas.buffer_rgba())
+    finally:
+        figure.set_dpi(original_dpi)
+        figure.set_canvas(original_canvas)
+
+    return figure_pixels
+
+
+def _encoded_figure_pixels(
+    figure_pixels: np.ndarray, file_format: str, dpi_to_use: int
+) -> bytes:
+    '''
+    Encodes an RGBA figure buffer the same way savefig does for
+    the given raster format.
+    '''
+
+    image_format: str = _RASTER_FIGURE_FORMATS[file_format.lower()]
+    figure_buffer: io.BytesIO = io.BytesIO()
+    if image_format == 'jpeg':
+        # We put the image on a white background, as savefig does
+        # (JPEG has no transparency).
+        figure_image = PIL.Image.fromarray(figure_pixels, 'RGBA')
+        jpeg_image = PIL.Image.new('RGB', figure_image.size, (255, 255, 255))
+        jpeg_image.paste(figure_image, figure_image)
+        jpeg_image.save(
+            figure_buffer, format='jpeg', dpi=(dpi_to_use, dpi_to_use)
+        )
+    else:
+        matplotlib.image.imsave(
+            figure_buffer,
+            figure_pixels,
+            format=image_format,
+            origin='upper',
+            dpi=dpi_to_use,
+        )
+
+    return figure_buffer.getvalue()
+
+
+def _saved_figure_bytes(
+    figure: matplotlib.figure.Figure, file_format: str, dpi_to_use: int
+) -> bytes:
+    '''
+    Saves a figure to a given format in memory and returns the bytes.
+    '''
+
+    figure_buffer: io.BytesIO = io.BytesIO()
+    figure.savefig(figure_buffer, format=file_format, dpi=dpi_to_use)
+
+    return figure_buffer.getvalue()
+
+
+def _write_figure_bytes(
+    figure_bytes_future: concurrent.futures.Future, file_path: str
+) -> None:
+    '''
+    Writes encoded figure bytes (once they are ready) to a file.
+    '''
+
+    with open(file_path, 'wb') as figure_file:
+        figure_file.write(figure_bytes_future.result())
 
 
+def _export_rendered_figure(
+    figure_pixels: np.ndarray | None,
+    figure_bytes: dict[str, bytes],
+    raster_formats: list[str],
+    output_folder: str,
+    figure_name: str,
+    dpi_to_use: int,
+) -> None:
+    '''
+    Encodes the raster formats of a rendered figure and writes them,
+    as well as the already saved formats, to the output folder.
+    Runs in the workers of a FigureExportQueue.
+    '''
+
+    for file_format in raster_formats:
+        figure_bytes[file_format] = _encoded_figure_pixels(
+            figure_pixels, file_format, dpi_to_use
+        )
+    for file_format, file_bytes in figure_bytes.items():
+        with open(
+            f'{output_folder}/{figure_name}.{file_format}', 'wb'
+        ) as figure_file:
+            figure_file.write(file_bytes)
+
+
+class FigureExportQueue:
+    '''
+    Exports figures in the background, so that batch plotting jobs
+    do not wait for encoding and disk writes.
+
+    Each submitted figure is drawn (once for all raster formats) in the
+    calling thread, since Matplotlib figures are not thread-safe,
+    and then closed. The encoding and writing happen in a pool of
+    worker threads (or processes if use_processes is True).
+    At most max_pending figures can wait for their export; submit blocks
+    when that limit is reached, which keeps memory bounded.
+    flush waits for all submitted exports and raises the first error
+    (if any). Used as a context manager, the queue is flushed and its
+    workers shut down at the end of the with block.
+
+    Example:
+    with cook.FigureExportQueue(output_folder, 300, file_formats) as queue:
+        for figure_name in figure_names:
+            figure, axes = plt.subplots()
+            ...
+            queue.submit(figure, figure_name)
+    '''
+
+    def __init__(
+        self,
+        output_folder: str,
+        dpi_to_use: int,
+        file_formats: box.Box,
+        workers: int | None = None,
+        max_pending: int | None = None,
+        use_processes: bool = False,
+        close_figures: bool = True,
+    ) -> None:
+        check_if_folder_exists(output_folder)
+        self.output_folder: str = output_folder
+        self.dpi_to_use: int = dpi_to_use
+        self.file_formats: list[str] = [
+            file_format
+            for file_format in file_formats
+            if file_formats[file_format]
+        ]
+        self.close_figures: bool = close_figures
+        if workers is None:
+            workers = min(os.cpu_count() or 1, 8)
+        if max_pending is None:
+            max_pending = 2 * workers
+        if use_processes:
+            self._executor: concurrent.futures.Executor = (
+                concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+            )
+        else:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers
+            )
+        self._pending_slots: threading.BoundedSemaphore = (
+            threading.BoundedSemaphore(max_pending)
+        )
+        self._futures: dict[concurrent.futures.Future, str] = {}
+        self._futures_lock: threading.Lock = threading.Lock()
+
+    def submit(
+        self,
+        figure: matplotlib.figure.Figure | np.ndarray,
+        figure_name: str,
+    ) -> None:
+        '''
+        Queues a figure for export. The figure can also be an already
+        rendered RGBA buffer (in which case only raster formats can be
+        exported).
+        '''
+
+        raster_formats: list[str] = []
+        figure_bytes: dict[str, bytes] = {}
+        if isinstance(figure, np.ndarray):
+            figure_pixels: np.ndarray | None = figure
+            raster_formats = self.file_formats
+            non_raster_formats: list[str] = [
+                file_format
+                for file_format in self.file_formats
+                if file_format.lower() not in _RASTER_FIGURE_FORMATS
+            ]
+            if non_raster_formats:
+                raise ValueError(
+                    f'Cannot export {non_raster_formats} '
+                    'from a rendered buffer'
+                )
+        else:
+            figure_pixels = None
+            if _can_render_figure_once():
+                raster_formats = [
+                    file_format
+                    for file_format in self.file_formats
+                    if file_format.lower() in _RASTER_FIGURE_FORMATS
+                ]
+            # The figure is closed even if it cannot be rendered
+            try:
+                if raster_formats:
+                    figure_pixels = _rendered_figure_pixels(
+                        figure, self.dpi_to_use
+                    )
+                for file_format in self.file_formats:
+                    if file_format not in raster_formats:
+                        figure_bytes[file_format] = _saved_figure_bytes(
+                            figure, file_format, self.dpi_to_use
+                        )
+            finally:
+                if self.close_figures:
+                    plt.close(figure)
+
+        # We wait for a free slot only once the figure is rendered
+        # (and closed), so that blocked callers do not hold figures.
+        self._pending_slots.acquire()
+        try:
+            export_future: concurrent.futures.Future = self._executor.submit(
+                _export_rendered_figure,
+                figure_pixels,
+                figure_bytes,
+                raster_formats,
+                self.output_folder,
+                figure_name,
+                self.dpi_to_use,
+            )
+        except Exception:
+            self._pending_slots.release()
+            raise
+        with self._futures_lock:
+            self._futures[export_future] = figure_name
+        export_future.add_done_callback(self._release_slot)
+
+    def _release_slot(self, export_future: concurrent.futures.Future) -> None:
+        self._pending_slots.release()
+
+    def flush(self) -> None:
+        '''
+        Waits for all submitted exports to finish and raises the first
+        error (mentioning how many figures failed).
+        '''
+
+        with self._futures_lock:
+            futures_to_wait: dict[concurrent.futures.Future, str] = (
+                self._futures
+            )
+            self._futures = {}
+        concurrent.futures.wait(futures_to_wait)
+        failed_figures: list[tuple[str, BaseException]] = [
+            (figure_name, export_future.exception())
+            for export_future, figure_name in futures_to_wait.items()
+            if export_future.exception() is not None
+        ]
+        if failed_figures:
+            first_figure_name, first_error = failed_figures[0]
+            raise RuntimeError(
+                f'{len(failed_figures)} figure export(s) failed, '
+                f'starting with {first_figure_name}: {first_error!r}'
+            ) from first_error
+
+    def close(self) -> None:
+        '''
+        Flushes the queue and shuts down its workers.
+        '''
+
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown()
+
+    def __enter__(self) -> 'FigureExportQueue':
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        *exception_information: ty.Any,
+    ) -> None:
+        if exception_type is None:
+            self.close()
+        else:
+            # We do not replace the exception with export errors: the
+            # exports that have not started are dropped, and the errors
+            # of the others are not raised
+            self._executor.shutdown(cancel_futures=True)
+
+
+# The file types of save_dataframe (in the order of its format tables)
+_DATAFRAME_FILE_TYPES: list[str] = [
+    'csv',
+    'json',
+    'html',
+    'latex',
+    'xml',
+    'clipboard',
+    'excel',
+    'hdf',
+    'feather',
+    'parquet',
+    'stata',
+    'pickle',
+    'sql',
+    'parquet_dataset',
+]
+
+
+@_instrumented(
+    'save_dataframe',
+    'output_folder',
+    'dataframe',
+    ('dataframe_name', 'groupfile_name'),
+)
+@_io_timer('save_dataframe')
 def save_dataframe(
     dataframe: pd.DataFrame,
     dataframe_name: str,
@@ -428,21 +1594,7 @@ def save_dataframe(
 
     check_if_folder_exists(output_folder)
 
-    file_types: list[str] = [
-        'csv',
-        'json',
-        'html',
-        'latex',
-        'xml',
-        'clipboard',
-        'excel',
-        'hdf',
-        'feather',
-        'parquet',
-        'stata',
-        'pickle',
-        'sql',
-    ]
+    file_types: list[str] = _DATAFRAME_FILE_TYPES
     # Note that pandas has a few more export formats that we skipped
     # orc is not supported in arrows (ar least on Windows)
     # https://stackoverflow.com/questions/58822095/no-module-named-pyarrow-orc
@@ -465,6 +1617,7 @@ def save_dataframe(
         'dta',
         'pkl',
         'sqlite3',
+        '',
     ]
 
     # This determines if the dataframe is saved into its own file
@@ -483,6 +1636,7 @@ def save_dataframe(
         False,
         False,
         True,
+        False,
     ]
 
     file_functions: list[ty.Callable] = []
@@ -550,11 +1704,18 @@ def save_dataframe(
             # which also contains additional functionality.
             # function_name = f'Styler.to_{file_type}'
             file_functions.append(dataframe_to_use.style.to_latex)
+        elif file_type == 'parquet_dataset':
+            # This is not a pandas export format
+            file_functions.append(
+                functools.partial(save_parquet_dataset, dataframe_to_use)
+            )
         else:
             file_functions.append(getattr(dataframe_to_use, function_name))
 
+    # We use get, as older parameter files do not have the newer formats
+    # (such as parquet_dataset)
     using_file_types: list[bool] = [
-        dataframe_formats[file_type] for file_type in file_types
+        dataframe_formats.get(file_type, False) for file_type in file_types
     ]
 
     for (
@@ -577,7 +1738,13 @@ def save_dataframe(
                 )
 
                 if file_type == 'hdf':
-                    file_function(file_to_use, key=dataframe_name)
+                    file_function(
+                        file_to_use,
+                        key=dataframe_name,
+                        **_hdf_options(
+                            _format_settings(dataframe_formats, file_type)
+                        ),
+                    )
                 elif file_type == 'excel':
                     # If we want to append a sheet to an Excel file
                     # instead of replacing the existing file, we need
@@ -616,11 +1783,416 @@ def save_dataframe(
                 file_to_use = (
                     f'{output_folder}/{dataframe_name}.{file_extension}'
                 )
-                file_function(file_to_use)
+                if file_type == 'parquet_dataset':
+                    # Datasets are folders, named after the dataframe
+                    file_function(
+                        f'{output_folder}/{dataframe_name}',
+                        _format_settings(dataframe_formats, file_type),
+                    )
+                elif file_type in _COMPRESSED_TEXT_FORMATS:
+                    compression_options, compression_suffix = (
+                        _text_compression(
+                            file_type,
+                            _format_settings(dataframe_formats, file_type),
+                        )
+                    )
+                    file_function(
+                        f'{file_to_use}{compression_suffix}',
+                        compression=compression_options,
+                    )
+                else:
+                    file_function(file_to_use)
 
 
-def put_dataframe_in_sql_in_chunks(
-    source_dataframe: pd.DataFrame,
+def _format_settings(
+    dataframe_formats: box.Box, file_type: str
+) -> box.Box | dict[str, ty.Any]:
+    '''
+    Gets the (optional) settings sub-table of a file format in the
+    dataframe formats of save_dataframe (for example hdf_settings for hdf).
+    '''
+    return dataframe_formats.get(f'{file_type}_settings', box.Box())
+
+
+_COMPRESSED_TEXT_FORMATS: list[str] = ['csv', 'json', 'xml']
+# The file suffix, the name of the compression level option, and the
+# lowest and highest levels of each codec
+_TEXT_COMPRESSION_CODECS: dict[str, tuple[str, str, int, int]] = {
+    'gzip': ('.gz', 'compresslevel', 0, 9),
+    'bz2': ('.bz2', 'compresslevel', 1, 9),
+    'xz': ('.xz', 'preset', 0, 9),
+    'zstd': ('.zst', 'level', 1, 22),
+}
+
+
+def _text_compression(
+    file_type: str, format_settings: box.Box | dict[str, ty.Any]
+) -> tuple[dict[str, ty.Any] | None, str]:
+    '''
+    Gives the pandas compression options and the file suffix of a text
+    format (csv, json, xml), from the (optional) compression,
+    compression_level, and compression_threads of its settings
+    sub-table in save_dataframe. The level must be an integer in the range
+    of the codec. zstd uses all processors unless compression_threads is set
+    (0 means single-threaded).
+    '''
+    codec: str = format_settings.get('compression', '') or ''
+    if not codec:
+        return None, ''
+    if codec not in _TEXT_COMPRESSION_CODECS:
+        raise ValueError(
+            f'Unsupported compression for {file_type}: {codec} '
+            f'(use one of {list(_TEXT_COMPRESSION_CODECS)})'
+        )
+    compression_suffix, level_option, lowest_level, highest_level = (
+        _TEXT_COMPRESSION_CODECS[codec]
+    )
+    compression_options: dict[str, ty.Any] = {'method': codec}
+    compression_level: int | None = format_settings.get('compression_level')
+    if compression_level is not None:
+        if (
+            not isinstance(compression_level, (int, np.integer))
+            or isinstance(compression_level, bool)
+            or not lowest_level <= compression_level <= highest_level
+        ):
+            raise ValueError(
+                f'The {codec} compression level of {file_type} must be '
+                f'between {lowest_level} and {highest_level} '
+                f'(not {compression_level})'
+            )
+        compression_options[level_option] = compression_level
+    if codec == 'zstd':
+        _require_optional_package(
+            'zstandard', f'zstd compression of {file_type}'
+        )
+        compression_options['threads'] = format_settings.get(
+            'compression_threads', -1
+        )
+
+    return compression_options, compression_suffix
+
+
+# The optional packages (which are also their module names) that some
+# functions need, with the ETS_CookBook extra that installs them
+_OPTIONAL_PACKAGE_EXTRAS: dict[str, str] = {
+    'pyarrow': 'arrow',
+    'tables': 'hdf',
+    'zstandard': 'zstd',
+}
+
+
+def _require_optional_package(package_name: str, needed_for: str) -> None:
+    '''
+    Raises an ImportError (which says how to install it) if an optional
+    package is not installed.
+    '''
+    if importlib.util.find_spec(package_name) is None:
+        package_extra: str = _OPTIONAL_PACKAGE_EXTRAS[package_name]
+        raise ImportError(
+            f'{needed_for} needs the optional {package_name} package, '
+            f'which is not installed (use pip install {package_name} or '
+            f'pip install ETS_CookBook[{package_extra}])'
+        )
+
+
+def _hdf_options(hdf_settings: box.Box | dict[str, ty.Any]) -> dict:
+    '''
+    Turns the (optional) hdf_settings of save_dataframe into
+    to_hdf options. Appending needs the table format, so it is the
+    default format when append is True.
+    '''
+    _require_optional_package('tables', 'Saving hdf files')
+    append: bool = hdf_settings.get('append', False)
+    hdf_options: dict[str, ty.Any] = {
+        'format': hdf_settings.get('format', 'table' if append else 'fixed')
+    }
+    if append:
+        hdf_options['append'] = True
+    if hdf_settings.get('data_columns') is not None:
+        hdf_options['data_columns'] = hdf_settings.get('data_columns')
+    if hdf_settings.get('complib') is not None:
+        hdf_options['complib'] = hdf_settings.get('complib')
+        hdf_options['complevel'] = hdf_settings.get('complevel', 5)
+    min_itemsize: int | dict[str, int] | None = hdf_settings.get(
+        'min_itemsize'
+    )
+    if isinstance(min_itemsize, dict):
+        hdf_options['min_itemsize'] = dict(min_itemsize)
+    elif min_itemsize is not None:
+        hdf_options['min_itemsize'] = min_itemsize
+
+    return hdf_options
+
+
+def save_parquet_dataset(
+    dataframe: pd.DataFrame,
+    dataset_folder: str,
+    dataset_settings: box.Box | dict[str, ty.Any] | None = None,
+) -> None:
+    '''
+    Saves a dataframe to a (Hive-)partitioned Parquet dataset folder
+    (this is the parquet_dataset format of save_dataframe).
+    The settings can contain:
+    - partition_columns: The columns to partition with (one sub-folder per
+    value, such as Year=2030/Scenario=High). Default: no partitions.
+    - row_group_size: The (maximal) number of rows of each row group.
+    Default: the pyarrow default.
+    - compression: The Parquet compression codec (for example
+    snappy, zstd, gzip, or none). Default: snappy.
+    - compression_level: The level of that codec. Default: codec default.
+    Partitions that are written again replace the existing ones.
+    The dataset can be read with read_parquet_dataset.
+    This requires pyarrow.
+    '''
+    _require_optional_package('pyarrow', 'save_parquet_dataset')
+    import pyarrow as pa
+    import pyarrow.dataset as pa_dataset
+
+    if dataset_settings is None:
+        dataset_settings = {}
+    partition_columns: list[str] = list(
+        dataset_settings.get('partition_columns', [])
+    )
+    row_group_size: int | None = dataset_settings.get('row_group_size')
+    parquet_format = pa_dataset.ParquetFileFormat()
+    write_options = parquet_format.make_write_options(
+        compression=dataset_settings.get('compression', 'snappy'),
+        compression_level=dataset_settings.get('compression_level'),
+    )
+    row_group_options: dict[str, int] = {}
+    if row_group_size:
+        # We also set the minimum so that small batches get
+        # grouped into full row groups
+        row_group_options = {
+            'min_rows_per_group': row_group_size,
+            'max_rows_per_group': row_group_size,
+        }
+
+    pa_dataset.write_dataset(
+        pa.Table.from_pandas(dataframe),
+        dataset_folder,
+        format=parquet_format,
+        file_options=write_options,
+        partitioning=partition_columns or None,
+        partitioning_flavor='hive' if partition_columns else None,
+        existing_data_behavior='delete_matching',
+        **row_group_options,
+    )
+
+
+_CHUNKED_DATAFRAME_FORMATS: dict[str, str] = {
+    'csv': 'csv',
+    'hdf': 'h5',
+    'feather': 'feather',
+    'parquet': 'parquet',
+    'sql': 'sqlite3',
+}
+
+
+@_instrumented('save_dataframe_chunks', 'output_folder')
+def save_dataframe_chunks(
+    dataframe_chunks: collections.abc.Iterable[pd.DataFrame],
+    dataframe_name: str,
+    groupfile_name: str,
+    output_folder: str,
+    dataframe_formats: box.Box,
+) -> int:
+    '''
+    This function saves DataFrame chunks (from a list, generator or other
+    iterator) to a number of file formats, one chunk at a time, so that
+    only one chunk needs to be in memory. It works like save_dataframe
+    (with the same names, extensions and group files) for these formats:
+    - csv (the header is only written for the first chunk)
+    - parquet (each chunk becomes a row group, and the index is stored as
+    a column)
+    - sql (chunks are appended to the table of the SQLite group file)
+    - hdf (chunks are appended to a table-format key of the group file,
+    using the hdf_settings, if any)
+    - feather (chunks are written as record batches of an Arrow IPC file)
+    The first chunk replaces existing files/tables and sets the columns
+    and types (later chunks are converted to these types for parquet
+    and feather). So a column that is empty (all missing) in the first
+    chunk, or (for hdf) a string column with longer strings in later chunks,
+    makes the later chunks fail. You can avoid this with:
+    - column_types in the parquet_settings and feather_settings sub-tables
+    (column names and Arrow types, such as 'string' or 'float64', which
+    replace the types of the first chunk)
+    - min_itemsize in the hdf_settings sub-table (the maximal string length,
+    for all string columns or per column)
+    Other formats raise a ValueError, and so do empty chunk iterators (which
+    would give no files, as the columns come from the first chunk).
+    Returns the number of rows that were written.
+    '''
+
+    # We use get, as older parameter files do not have the newer formats
+    formats_to_save: list[str] = [
+        file_type
+        for file_type in _DATAFRAME_FILE_TYPES
+        if dataframe_formats.get(file_type, False)
+    ]
+    unsupported_formats: list[str] = [
+        file_type
+        for file_type in formats_to_save
+        if file_type not in _CHUNKED_DATAFRAME_FORMATS
+    ]
+    if unsupported_formats:
+        raise ValueError(
+            f'Formats {unsupported_formats} cannot be saved in chunks'
+        )
+
+    # The files get their columns from the first chunk, so there must be one
+    chunks_iterator: collections.abc.Iterator[pd.DataFrame] = iter(
+        dataframe_chunks
+    )
+    first_chunk: pd.DataFrame | None = next(chunks_iterator, None)
+    if first_chunk is None:
+        raise ValueError(
+            f'There are no chunks to save for {dataframe_name} '
+            f'(at least one, possibly empty, DataFrame is needed)'
+        )
+
+    check_if_folder_exists(output_folder)
+    chunk_writers: dict[str, ty.Any] = {}
+    rows_written: int = 0
+    with contextlib.ExitStack() as open_files:
+        for chunk_index, dataframe_chunk in enumerate(
+            itertools.chain([first_chunk], chunks_iterator)
+        ):
+            is_first_chunk: bool = chunk_index == 0
+            for file_type in formats_to_save:
+                file_extension: str = _CHUNKED_DATAFRAME_FORMATS[file_type]
+                file_to_use: str = (
+                    f'{output_folder}/{dataframe_name}.{file_extension}'
+                )
+                if file_type in ['hdf', 'sql']:
+                    file_to_use = (
+                        f'{output_folder}/{groupfile_name}.{file_extension}'
+                    )
+
+                if file_type == 'csv':
+                    if is_first_chunk:
+                        chunk_writers[file_type] = open_files.enter_context(
+                            open(file_to_use, 'w', newline='')
+                        )
+                    dataframe_chunk.to_csv(
+                        chunk_writers[file_type], header=is_first_chunk
+                    )
+                elif file_type == 'sql':
+                    if is_first_chunk:
+                        sql_connection: sqlite3.Connection = (
+                            sqlite3.connect(file_to_use)
+                        )
+                        open_files.callback(sql_connection.close)
+                        chunk_writers[file_type] = sql_connection
+                    table_action: ty.Literal['replace', 'append'] = (
+                        'replace' if is_first_chunk else 'append'
+                    )
+                    with chunk_writers[file_type]:
+                        dataframe_chunk.to_sql(
+                            dataframe_name,
+                            con=chunk_writers[file_type],
+                            if_exists=table_action,
+                        )
+                elif file_type == 'hdf':
+                    hdf_options: dict[str, ty.Any] = _hdf_options(
+                        _format_settings(dataframe_formats, file_type)
+                    )
+                    hdf_options['format'] = 'table'
+                    hdf_options['append'] = not is_first_chunk
+                    dataframe_chunk.to_hdf(
+                        file_to_use, key=dataframe_name, **hdf_options
+                    )
+                else:
+                    chunk_writers[file_type] = _write_arrow_chunk(
+                        file_type,
+                        dataframe_chunk,
+                        file_to_use,
+                        chunk_writers.get(file_type),
+                        open_files,
+                        _format_settings(dataframe_formats, file_type).get(
+                            'column_types', {}
+                        ),
+                    )
+            rows_written += len(dataframe_chunk)
+
+    return rows_written
+
+
+def _write_arrow_chunk(
+    file_type: str,
+    dataframe_chunk: pd.DataFrame,
+    file_to_use: str,
+    chunk_writer: tuple[ty.Any, ty.Any] | None,
+    open_files: contextlib.ExitStack,
+    column_types: dict[str, ty.Any],
+) -> tuple[ty.Any, ty.Any]:
+    '''
+    Writes a chunk to a Parquet or Feather (Arrow IPC) file writer,
+    which is created (with the schema of the chunk, with the given
+    column types, as Arrow types or their names) for the first chunk.
+    Returns the writer and its schema.
+    '''
+    _require_optional_package('pyarrow', f'Saving {file_type} chunks')
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    if file_type == 'feather':
+        # As in save_dataframe, the index becomes a column
+        dataframe_chunk = dataframe_chunk.reset_index()
+        preserve_index: bool = False
+    else:
+        # The index of each chunk is different, so we store it
+        # as a column (instead of as a range in the metadata)
+        preserve_index = True
+
+    if chunk_writer is None:
+        chunk_schema = pa.Table.from_pandas(
+            dataframe_chunk, preserve_index=preserve_index
+        ).schema
+        for column, column_type in column_types.items():
+            column_index: int = chunk_schema.get_field_index(column)
+            if column_index < 0:
+                raise ValueError(
+                    f'{column} (in the {file_type} column_types) '
+                    'is not a column'
+                )
+            if isinstance(column_type, str):
+                column_type = pa.type_for_alias(column_type)
+            chunk_schema = chunk_schema.set(
+                column_index, pa.field(column, column_type)
+            )
+        chunk_table = pa.Table.from_pandas(
+            dataframe_chunk, schema=chunk_schema, preserve_index=preserve_index
+        )
+        if file_type == 'feather':
+            file_writer = pyarrow.ipc.new_file(
+                file_to_use,
+                chunk_table.schema,
+                options=pyarrow.ipc.IpcWriteOptions(compression='lz4'),
+            )
+        else:
+            file_writer = pyarrow.parquet.ParquetWriter(
+                file_to_use, chunk_table.schema
+            )
+        open_files.enter_context(file_writer)
+        chunk_writer = (file_writer, chunk_table.schema)
+    else:
+        chunk_table = pa.Table.from_pandas(
+            dataframe_chunk,
+            schema=chunk_writer[1],
+            preserve_index=preserve_index,
+        )
+    chunk_writer[0].write_table(chunk_table)
+
+    return chunk_writer
+
+
+@_instrumented(
+    'put_dataframe_in_sql_in_chunks', 'sql_file', 'source_dataframe'
+)
+def put_dataframe_in_sql_in_chunks(
+    source_dataframe: pd.DataFrame,
     sql_file: str,
     table_name: str,
     chunk_size: int,
@@ -686,12 +2258,13 @@ def dataframes_from_query_list(
     This returns a list of dataframes, each obtained from a query in the list
     '''
     dataframe_list: list[pd.DataFrame] = [
-        pd.read_sql(sql_query, sql_connection) for sql_query in query_list
+        _read_sql(sql_query, sql_connection) for sql_query in query_list
     ]
 
     return dataframe_list
 
 
+@_instrumented('from_grib_to_dataframe', 'grib_file')
 def from_grib_to_dataframe(grib_file: str) -> pd.DataFrame:
     '''
     This function takes a grib file and converts it to a DataFrame.
@@ -803,6 +2376,13 @@ def database_tables_columns(database: str) -> dict:
     return tables_columns
 
 
+@_instrumented(
+    'download_and_save_file',
+    lambda download_arguments: (
+        f"{download_arguments['output_folder']}/"
+        f"{download_arguments['download_url'].split('/')[-1]}"
+    ),
+)
 def download_and_save_file(download_url: str, output_folder: str) -> None:
     '''
     Downloads a file from an URL and saves it. If the file is a zip file,
@@ -834,6 +2414,144 @@ def string_to_float(my_string: str) -> float:
     return my_output
 
 
+# The strings that float() may accept but pandas does not: NaN and infinity
+# (pandas gives NaN for 'nan', which we count as not converted), and
+# numbers with underscores (or with non-ASCII digits)
+_PYTHON_FLOAT_PATTERN: str = (
+    r'\s*[+-]?(?:nan|inf(?:inity)?|[\d_.]*\d[\d_.]*(?:e[+-]?[\d_]+)?)\s*'
+)
+
+
+def _float_or_none(my_value: ty.Any) -> float | None:
+    '''
+    Converts a value to a float like string_to_float does, but returns None
+    if it is not a float.
+    '''
+    try:
+        return float(my_value)
+    except (TypeError, ValueError):
+        return None
+
+
+def strings_to_floats(
+    strings: pd.Series | pd.DataFrame | np.ndarray | list,
+    columns: list[str] | None = None,
+    decimal_separator: str = '.',
+    thousands_separator: str = '',
+    units: list[str] | None = None,
+    fill_value: float = 0.0,
+) -> tuple[pd.Series | pd.DataFrame, int]:
+    '''
+    Converts many strings to floats at once (and to the fill value,
+    zero by default, like string_to_float, if they are not a number).
+    Strings are converted like in string_to_float (so 'nan' becomes NaN,
+    and 'inf' infinity). Missing values (None or NaN) are not numbers
+    and get the fill value.
+    You can give decimal and thousands separators (for example ','
+    and '.' for 1.234,5), and units (or other text, such as '%' or 'MWh')
+    to remove from the end of the strings before the conversion.
+    The strings can be in a Series (or array or list), in which case
+    the function returns a Series of floats. They can also be in the columns
+    (all of them, or the ones in the columns list) of a DataFrame. These
+    columns get converted in the DataFrame, which the function returns.
+    The function also returns how many values could not be converted
+    (and were replaced by the fill value).
+    '''
+    if units is None:
+        units = []
+    if isinstance(strings, pd.DataFrame):
+        if columns is None:
+            columns = list(strings.columns)
+        total_coerced: int = 0
+        for column in columns:
+            strings[column], column_coerced = strings_to_floats(
+                strings[column],
+                decimal_separator=decimal_separator,
+                thousands_separator=thousands_separator,
+                units=units,
+                fill_value=fill_value,
+            )
+            total_coerced += column_coerced
+        return strings, total_coerced
+
+    if not isinstance(strings, pd.Series):
+        strings = pd.Series(strings)
+
+    if pd.api.types.is_numeric_dtype(strings.dtype):
+        converted_values: pd.Series = strings.astype(float)
+        not_converted: np.ndarray = converted_values.isna().to_numpy()
+    else:
+        # Scraped strings have many repeated values, so we only convert
+        # each unique value once (missing values get the code -1)
+        string_codes, unique_strings = pd.factorize(strings)
+        unique_strings = pd.Series(unique_strings)
+        cleaned_strings: pd.Series = unique_strings
+        if decimal_separator != '.' or thousands_separator or units:
+            # Non-string values (such as numbers) become NaN here
+            cleaned_strings = unique_strings.str.strip()
+            if units:
+                # We remove the longest units first (MWh before Wh)
+                unit_pattern: str = '|'.join(
+                    re.escape(unit)
+                    for unit in sorted(units, key=len, reverse=True)
+                )
+                cleaned_strings = cleaned_strings.str.replace(
+                    f'(?:{unit_pattern})$', '', regex=True
+                ).str.strip()
+            if thousands_separator:
+                cleaned_strings = cleaned_strings.str.replace(
+                    thousands_separator, '', regex=False
+                )
+            if decimal_separator != '.':
+                cleaned_strings = cleaned_strings.str.replace(
+                    decimal_separator, '.', regex=False
+                )
+            # So we keep them as they are
+            cleaned_strings = cleaned_strings.where(
+                cleaned_strings.notna(), unique_strings
+            )
+        unique_values: np.ndarray = (
+            pd.to_numeric(cleaned_strings, errors='coerce')
+            .astype(float)
+            .to_numpy(copy=True)
+        )
+        # Some strings that Python converts (such as 'nan' or '1_000')
+        # are not numbers for pandas, so we convert these one by one.
+        # We only try the ones that look like such numbers (the others
+        # stay not converted)
+        unique_not_converted: np.ndarray = np.isnan(unique_values)
+        cleaned_values: np.ndarray = cleaned_strings.to_numpy()
+        python_float_candidates: np.ndarray = np.flatnonzero(
+            unique_not_converted
+        )
+        python_float_candidates = python_float_candidates[
+            cleaned_strings.iloc[python_float_candidates]
+            .astype(str)
+            .str.fullmatch(_PYTHON_FLOAT_PATTERN, case=False)
+            .to_numpy(dtype=bool)
+        ]
+        for unique_index in python_float_candidates:
+            unique_value: float | None = _float_or_none(
+                cleaned_values[unique_index]
+            )
+            if unique_value is not None:
+                unique_values[unique_index] = unique_value
+                unique_not_converted[unique_index] = False
+        converted_values = pd.Series(
+            np.append(unique_values, np.nan).take(string_codes),
+            index=strings.index,
+            name=strings.name,
+        )
+        not_converted = np.append(unique_not_converted, True).take(
+            string_codes
+        )
+
+    converted_values = converted_values.astype(float)
+    converted_values[not_converted] = fill_value
+
+    return converted_values, int(not_converted.sum())
+
+
 def get_map_area_data(map_parameters: box.Box) -> gpd.GeoDataFrame:
     '''
     This function gets and processes the area data and sets it
@@ -847,7 +2565,7 @@ def get_map_area_data(map_parameters: box.Box) -> gpd.GeoDataFrame:
     # territories).
     area_data_file_name: str = map_parameters.area_data_file_name
 
-    area_data: gpd.GeoDataFrame = gpd.read_file(
+    area_data: gpd.GeoDataFrame = _read_geographic_file(
         f'{map_data_folder}/{area_data_file_name}'
     )
 
@@ -880,7 +2598,7 @@ def get_map_borders(
         f'{border_data_file_prefix}{NUTS_level}{border_data_file_suffix}'
     )
 
-    border_data: gpd.GeoDataFrame = gpd.read_file(
+    border_data: gpd.GeoDataFrame = _read_geographic_file(
         f'{map_data_folder}/{border_data_file}'
     )
 
@@ -902,7 +2620,7 @@ def get_map_points(
         f'{points_data_file_prefix}{NUTS_level}{points_data_file_suffix}'
     )
 
-    points_data: gpd.GeoDataFrame = gpd.read_file(
+    points_data: gpd.GeoDataFrame = _read_geographic_file(
         f'{map_data_folder}/{points_data_file}'
     )
 
@@ -1122,6 +2840,199 @@ def make_query_filter(
     return query_filter
 
 
+def _arrow_filter_value(filter_value: ty.Any) -> ty.Any:
+    '''
+    Turns a value in make_query_filter syntax (where strings are quoted)
+    into a Python value for an Arrow filter.
+    '''
+    if not isinstance(filter_value, str):
+        return filter_value
+    if (
+        len(filter_value) > 1
+        and filter_value[0] == filter_value[-1]
+        and filter_value[0] in ['"', "'"]
+    ):
+        return filter_value[1:-1]
+    for number_type in [int, float]:
+        try:
+            return number_type(filter_value)
+        except ValueError:
+            pass
+    return filter_value
+
+
+def _arrow_filter_field(filter_quantity: str) -> ty.Any:
+    '''
+    Gives the Arrow dataset field of a (possibly double-quoted) quantity.
+    '''
+    import pyarrow.dataset as pa_dataset
+
+    return pa_dataset.field(filter_quantity.strip('"'))
+
+
+def make_arrow_filter(
+    query_filter_quantities: list[str],
+    query_filter_types: list[str],
+    query_filter_values: list[ty.Any],
+) -> ty.Any:
+    '''
+    Returns a pyarrow dataset filter expression from the same inputs as
+    make_query_filter (see there for the supported filter types
+    and values). The expression is None if there are no filters.
+    This requires pyarrow.
+    '''
+    _require_optional_package('pyarrow', 'make_arrow_filter')
+    import pyarrow.compute as pa_compute
+
+    comparisons: dict[str, ty.Callable] = {
+        '=': lambda field, value: field == value,
+        '<': lambda field, value: field < value,
+        '>': lambda field, value: field > value,
+        '!=': lambda field, value: field != value,
+        '<>': lambda field, value: field != value,
+        '<=': lambda field, value: field <= value,
+        '>=': lambda field, value: field >= value,
+    }
+    arrow_filter: ty.Any = None
+    for filter_quantity, filter_type, filter_value in zip(
+        query_filter_quantities, query_filter_types, query_filter_values
+    ):
+        filter_type = filter_type.lower()
+        if filter_type == 'between':
+            filter_field = _arrow_filter_field(filter_quantity)
+            filter_expression = (
+                filter_field >= _arrow_filter_value(filter_value[0])
+            ) & (filter_field <= _arrow_filter_value(filter_value[1]))
+        elif filter_type == 'in' and type(filter_quantity) is tuple:
+            # Each value is a tuple matching the tuple of quantities
+            filter_expression = None
+            for value_tuple in filter_value:
+                tuple_expression = functools.reduce(
+                    lambda expression, other_expression: (
+                        expression & other_expression
+                    ),
+                    [
+                        _arrow_filter_field(tuple_quantity)
+                        == _arrow_filter_value(tuple_value)
+                        for tuple_quantity, tuple_value in zip(
+                            filter_quantity, value_tuple
+                        )
+                    ],
+                )
+                if filter_expression is None:
+                    filter_expression = tuple_expression
+                else:
+                    filter_expression = filter_expression | tuple_expression
+        elif filter_type == 'in':
+            filter_expression = _arrow_filter_field(filter_quantity).isin(
+                [_arrow_filter_value(value) for value in filter_value]
+            )
+        elif filter_type == 'like':
+            filter_expression = pa_compute.match_like(
+                _arrow_filter_field(filter_quantity),
+                _arrow_filter_value(filter_value),
+            )
+        elif filter_type in comparisons:
+            filter_expression = comparisons[filter_type](
+                _arrow_filter_field(filter_quantity),
+                _arrow_filter_value(filter_value),
+            )
+        else:
+            raise ValueError(f'Unsupported filter type: {filter_type}')
+
+        if arrow_filter is None:
+            arrow_filter = filter_expression
+        else:
+            arrow_filter = arrow_filter & filter_expression
+
+    return arrow_filter
+
+
+@_instrumented('read_parquet_dataset', 'dataset_folder')
+def read_parquet_dataset(
+    dataset_folder: str,
+    query_filter_quantities: list[str] | None = None,
+    query_filter_types: list[str] | None = None,
+    query_filter_values: list[ty.Any] | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    '''
+    Reads a (Hive-)partitioned Parquet dataset (such as the ones
+    from the parquet_dataset format of save_dataframe) into a dataframe.
+    The filters use the same inputs as make_query_filter and are
+    pushed down to the dataset, so only the matching partitions and
+    row groups are read. Columns can be used to only read some columns.
+    Note that the partition columns come after the other columns.
+    This requires pyarrow.
+    '''
+    _require_optional_package('pyarrow', 'read_parquet_dataset')
+    import pyarrow.dataset as pa_dataset
+
+    parquet_dataset = pa_dataset.dataset(
+        dataset_folder, format='parquet', partitioning='hive'
+    )
+    dataset_table = parquet_dataset.to_table(
+        columns=columns,
+        filter=make_arrow_filter(
+            query_filter_quantities or [],
+            query_filter_types or [],
+            query_filter_values or [],
+        ),
+    )
+
+    return dataset_table.to_pandas()
+
+
+@_instrumented('read_dataframe_file', 'dataframe_file')
+def read_dataframe_file(dataframe_file: str) -> pd.DataFrame:
+    '''
+    Reads a csv, json or xml file saved by save_dataframe back into
+    a dataframe (with its index). The files can be compressed (with
+    gzip, bz2, xz, or zstd, as in the compression settings of
+    save_dataframe), which is detected from their suffix.
+    '''
+    file_type: str = dataframe_file
+    for compression_suffix, *_ in _TEXT_COMPRESSION_CODECS.values():
+        file_type = file_type.removesuffix(compression_suffix)
+    file_type = file_type.rsplit('.', 1)[-1].lower()
+
+    if file_type == 'csv':
+        return pd.read_csv(dataframe_file, index_col=0)
+    elif file_type == 'json':
+        return pd.read_json(dataframe_file)
+    elif file_type == 'xml':
+        # The index is the first element of each row (named index
+        # if the index has no name)
+        xml_dataframe: pd.DataFrame = pd.read_xml(dataframe_file)
+        xml_dataframe = xml_dataframe.set_index(xml_dataframe.columns[0])
+        if xml_dataframe.index.name == 'index':
+            xml_dataframe.index.name = None
+        return xml_dataframe
+    else:
+        raise ValueError(f'Unsupported file type: {file_type}')
+
+
+@_instrumented('read_hdf_table', 'hdf_file')
+def read_hdf_table(
+    hdf_file: str,
+    table_name: str,
+    where: str | list[str] | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    '''
+    Reads a table from an HDF5 file (such as the hdf group file of
+    save_dataframe). For tables saved with the table format, you can
+    select rows with a where condition (in PyTables syntax,
+    such as 'Year > 2030 & Scenario == "High"', which can use the index
+    and the data columns) and only read some columns.
+    This requires PyTables.
+    '''
+    _require_optional_package('tables', 'read_hdf_table')
+
+    return pd.read_hdf(hdf_file, key=table_name, where=where, columns=columns)
+
+
+@_instrumented('read_table_from_database', 'database_file')
 def read_table_from_database(
     table_name: str, database_file: str
 ) -> pd.DataFrame:
@@ -1134,7 +3045,7 @@ def read_table_from_database(
         '*', f'"{table_name}"', [], [], []
     )
 
-    table_to_read: pd.DataFrame = pd.read_sql(table_query, sql_connection)
+    table_to_read: pd.DataFrame = _read_sql(table_query, sql_connection)
     sql_connection.close()
 
     return table_to_read
@@ -1411,63 +3322,228 @@ def get_rgba_255_code_string(
     return rgba_code_string
 
 
+# The Matplotlib paths of the areas of the maps we have plotted, keyed by
+# the map areas (GeoDataFrame) they come from, so that each map is only
+# converted once, even if it is used in several plots (or in several calls,
+# such as the cached maps of map_grid). The least recently used maps are
+# dropped when there are more than MAXIMUM_CACHED_MAPS, and a map is dropped
+# when its GeoDataFrame is deleted.
+_map_area_paths: collections.OrderedDict[
+    int, tuple[ty.Any, list[matplotlib.path.Path]]
+] = collections.OrderedDict()
+MAXIMUM_CACHED_MAPS: int = 16
+
+
+def _geometry_path(geometry: shapely.Geometry) -> matplotlib.path.Path:
+    '''
+    Converts a (multi)polygon into one compound Matplotlib path (with the
+    exterior and interior rings of all its parts).
+    '''
+    rings: list[matplotlib.path.Path] = []
+    for polygon in shapely.get_parts(geometry):
+        if polygon.is_empty or polygon.geom_type != 'Polygon':
+            continue
+        rings.append(
+            matplotlib.path.Path(np.asarray(polygon.exterior.coords)[:, :2])
+        )
+        rings.extend(
+            matplotlib.path.Path(np.asarray(interior.coords)[:, :2])
+            for interior in polygon.interiors
+        )
+    if not rings:
+        return matplotlib.path.Path(np.empty((0, 2)))
+
+    return matplotlib.path.Path.make_compound_path(*rings)
+
+
+def _geometry_paths(geometries: np.ndarray) -> list[matplotlib.path.Path]:
+    '''
+    Returns the Matplotlib paths of a series of map geometries.
+    '''
+    return [_geometry_path(geometry) for geometry in geometries]
+
+
+def _map_paths(map_areas: pd.DataFrame) -> list[matplotlib.path.Path]:
+    '''
+    Returns the (cached) Matplotlib paths of the areas of a map.
+    '''
+    map_key: int = id(map_areas)
+    cached_map: tuple[ty.Any, list[matplotlib.path.Path]] | None = (
+        _map_area_paths.get(map_key)
+    )
+    # We check that the cached paths are from this map (and not from
+    # a deleted one that had the same id) and that it has the same areas
+    if (
+        cached_map is not None
+        and cached_map[0]() is map_areas
+        and len(cached_map[1]) == len(map_areas)
+    ):
+        _map_area_paths.move_to_end(map_key)
+        return cached_map[1]
+
+    area_paths: list[matplotlib.path.Path] = _geometry_paths(
+        np.asarray(map_areas.geometry)
+    )
+    _map_area_paths[map_key] = (weakref.ref(map_areas), area_paths)
+    weakref.finalize(map_areas, _map_area_paths.pop, map_key, None)
+    while len(_map_area_paths) > MAXIMUM_CACHED_MAPS:
+        _map_area_paths.popitem(last=False)
+
+    return area_paths
+
+
 def make_quantity_map(
     quantity_display_name: str,
-    plot_data: pd.DataFrame,
+    plot_data: pd.DataFrame | None,
     map_areas: pd.DataFrame,
     quantity_plot: matplotlib.axes.Axes,
     quantity_color: str,
     map_grid_plot_parameters: box.Box,
     color_definitions: box.Box,
+    area_values: np.ndarray | None = None,
 ) -> None:
     '''
     Makes one of the quantity maps in a map grid.
+    The shapes of the map areas are converted to Matplotlib paths only once
+    per map areas GeoDataFrame (and reused across plots and calls, as long
+    as that GeoDataFrame exists and its geometries are not modified),
+    and the colors of the areas with data are computed in one go
+    from their values.
+    Instead of plot_data (the map areas merged with the data), you can
+    give area_values, which is an array with one value per row of map_areas
+    (NaN for the areas without data). If no area has data, all the areas
+    get the no-data color (and the color bar goes from 0 to 1).
     '''
     # We get some display parameters
     no_data_color: list[float] = get_rgb_from_name(
         map_grid_plot_parameters.no_data_color, color_definitions
     )
-    heat_bar_map: str = quantity_color
+    heat_bar_map: matplotlib.colors.Colormap = matplotlib.colormaps[
+        quantity_color
+    ]
     values_column = map_grid_plot_parameters.values_column
-    plot_title_font_size: int = map_grid_plot_parameters.plot_title_font_size
 
-    map_x_range: list[float] = map_grid_plot_parameters.map_x_range
-    map_y_range: list[float] = map_grid_plot_parameters.map_y_range
-
-    # We create a range for the values to display (for the
-    # scale of the legend bar).
-    values_to_plot: np.ndarray = plot_data[values_column].values
-
-    lowest_value_to_plot: float = values_to_plot.min()
-    highest_value_to_plot: float = values_to_plot.max()
-
-    display_reference_scale: list[float] = reference_scale(
-        [lowest_value_to_plot, highest_value_to_plot], 1
-    )
-    lowest_value_to_display: float = display_reference_scale[0]
-    highest_value_to_display: float = display_reference_scale[1]
-    color_bar_scale: matplotlib.colors.Normalize = matplotlib.colors.Normalize(
-        vmin=lowest_value_to_display, vmax=highest_value_to_display
+    area_paths: list[matplotlib.path.Path] = _map_paths(map_areas)
+    if area_values is None:
+        values_to_plot: np.ndarray = plot_data[values_column].values
+        data_geometries: np.ndarray = np.asarray(plot_data.geometry)
+    else:
+        values_to_plot = area_values
+        data_geometries = np.asarray(map_areas.geometry)
+    has_value: np.ndarray = ~pd.isna(values_to_plot)
+    values_to_plot = values_to_plot[has_value].astype(float)
+    data_geometries = data_geometries[has_value]
+
+    color_bar_scale, map_aspect = _quantity_map_scale_and_aspect(
+        values_to_plot, data_geometries, map_areas
     )
 
     # We plot the areas of the geographical entities (that is, the map
     # without the data) in the no-data color
-    map_areas.plot(
-        ax=quantity_plot,
-        facecolor=no_data_color,
-        edgecolor='face',
+    quantity_plot.add_collection(
+        matplotlib.collections.PathCollection(
+            area_paths,
+            facecolors=[no_data_color],
+            edgecolors='face',
+        )
+    )
+
+    # We plot the data on top of the map (areas without a value are
+    # left out). If the values are given per area, the shapes are
+    # taken directly from the map areas
+    if area_values is None:
+        data_paths: list[matplotlib.path.Path] = _geometry_paths(
+            data_geometries
+        )
+    else:
+        data_paths = [
+            area_paths[area_position]
+            for area_position in np.flatnonzero(has_value)
+        ]
+    quantity_plot.add_collection(
+        matplotlib.collections.PathCollection(
+            data_paths,
+            facecolors=heat_bar_map(color_bar_scale(values_to_plot)),
+            edgecolors='face',
+            antialiased=True,
+        )
+    )
+    _lay_out_quantity_map(
+        quantity_display_name,
+        quantity_plot,
+        heat_bar_map,
+        color_bar_scale,
+        map_aspect,
+        map_grid_plot_parameters,
     )
 
-    # We plot tha data on top of the map
-    plot_data.plot(
+
+def _quantity_map_scale_and_aspect(
+    values_to_plot: np.ndarray,
+    data_geometries: np.ndarray,
+    map_areas: pd.DataFrame,
+) -> tuple[matplotlib.colors.Normalize, float | str]:
+    '''
+    Computes the color bar scale and the aspect of a quantity map from
+    the values to plot and the shapes of the areas that have them.
+    If no area has a value, the color bar goes from 0 to 1, and the aspect
+    is that of the whole map.
+    '''
+    if len(values_to_plot) == 0:
+        color_bar_scale: matplotlib.colors.Normalize = (
+            matplotlib.colors.Normalize(vmin=0, vmax=1)
+        )
+        data_geometries = np.asarray(map_areas.geometry)
+    else:
+        # We create a range for the values to display (for the
+        # scale of the legend bar).
+        lowest_value_to_plot: float = values_to_plot.min()
+        highest_value_to_plot: float = values_to_plot.max()
+
+        display_reference_scale: list[float] = reference_scale(
+            [lowest_value_to_plot, highest_value_to_plot], 1
+        )
+        lowest_value_to_display: float = display_reference_scale[0]
+        highest_value_to_display: float = display_reference_scale[1]
+        color_bar_scale = matplotlib.colors.Normalize(
+            vmin=lowest_value_to_display, vmax=highest_value_to_display
+        )
+
+    # Geographic coordinates are stretched (in the same way as in GeoPandas),
+    # so that the map is not distorted at the latitudes it shows
+    if map_areas.crs is not None and map_areas.crs.is_geographic:
+        data_bounds: np.ndarray = shapely.total_bounds(data_geometries)
+        map_aspect: float | str = 1 / np.cos(
+            np.deg2rad(np.mean([data_bounds[1], data_bounds[3]]))
+        )
+    else:
+        map_aspect = 'equal'
+
+    return color_bar_scale, map_aspect
+
+
+def _lay_out_quantity_map(
+    quantity_display_name: str,
+    quantity_plot: matplotlib.axes.Axes,
+    heat_bar_map: matplotlib.colors.Colormap,
+    color_bar_scale: matplotlib.colors.Normalize,
+    map_aspect: float | str,
+    map_grid_plot_parameters: box.Box,
+) -> None:
+    '''
+    Puts everything but the map areas on a quantity map: its color bar,
+    aspect, display area and title. This is all the layout of a map grid
+    depends on, as the map areas are clipped to their plot.
+    '''
+    plot_title_font_size: int = map_grid_plot_parameters.plot_title_font_size
+    map_x_range: list[float] = map_grid_plot_parameters.map_x_range
+    map_y_range: list[float] = map_grid_plot_parameters.map_y_range
+
+    quantity_plot.get_figure().colorbar(
+        matplotlib.cm.ScalarMappable(norm=color_bar_scale, cmap=heat_bar_map),
         ax=quantity_plot,
-        column=values_column,
-        legend=True,
-        norm=color_bar_scale,
-        cmap=heat_bar_map,
-        antialiased=True,
-        edgecolor='face',
     )
+    quantity_plot.set_aspect(map_aspect)
 
     # We set the display area, remove the axes and set the title
     quantity_plot.set_ylim(map_y_range[0], map_y_range[1])
@@ -1478,41 +3554,261 @@ def make_quantity_map(
     )
 
 
-def map_grid(
-    quantities_data: list[pd.DataFrame],
-    quantity_display_names: list[str],
-    quantity_colors: list[str],
-    output_folder: str,
-    map_grid_plot_parameters: box.Box,
-    color_bar_definitions: box.Box,
-    color_definitions: box.Box,
-    dpi_to_use: int,
-    file_formats: box.Box,
-) -> None:
-    '''
-    This function creates a grid of maps. You need to give it the data you want
-    to plot, the names of the quantities, and their colors, as well as
-    some plot parameters (in your general parameters file, under
-    a [map_grid_plot]  header). You also need to have a map areas data file
-    such as this one:
-    https://www.naturalearthdata.com/http//www.naturalearthdata.com/download/110m/cultural/ne_110m_admin_0_countries.zip
-    You also need to provide a csv file that translates the names of the
-    countries you are using into ISOA3 codes, which can be found here
-    https://en.wikipedia.org/wiki/ISO_3166-1_alpha-3
+# The ISO A3 dictionaries and map areas used by map_grid, per file
+# (and modification time), so that they are only read (and the
+# join between the codes and the map areas is only built) once
+_isoA3_dictionaries: dict[tuple[str, float], dict[str, str]] = {}
+_map_grid_areas: dict[
+    tuple[str, float, str], tuple[gpd.GeoDataFrame, pd.Index, np.ndarray]
+] = {}
 
-    '''
+
+def _get_isoA3_dictionary(isoA3_file: str) -> dict[str, str]:
+    '''
+    Returns the (cached) dictionary that translates country names into
+    ISO A3 codes.
+    '''
+    cache_key: tuple[str, float] = (isoA3_file, os.path.getmtime(isoA3_file))
+    if cache_key not in _isoA3_dictionaries:
+        isoA3_codes: pd.DataFrame = pd.read_csv(f'{isoA3_file}')
+        _isoA3_dictionaries[cache_key] = dict(
+            zip(isoA3_codes.Country, isoA3_codes.IsoA3)
+        )
+
+    return _isoA3_dictionaries[cache_key]
+
+
+def _get_map_grid_areas(
+    map_data_file: str, iso_A3_header_in_map_data: str
+) -> tuple[gpd.GeoDataFrame, pd.Index, np.ndarray]:
+    '''
+    Returns the (cached) map areas of a map file, with their join index:
+    the ISO A3 codes of the map (without duplicates), and the position of
+    the code of each map area in these codes (-1 if the area has no code).
+    '''
+    cache_key: tuple[str, float, str] = (
+        map_data_file,
+        os.path.getmtime(map_data_file),
+        iso_A3_header_in_map_data,
+    )
+    if cache_key not in _map_grid_areas:
+        map_areas: gpd.GeoDataFrame = _read_geographic_file(map_data_file)
+        area_code_positions, map_codes = pd.factorize(
+            map_areas[iso_A3_header_in_map_data]
+        )
+        _map_grid_areas[cache_key] = (
+            map_areas,
+            pd.Index(map_codes),
+            area_code_positions,
+        )
+
+    return _map_grid_areas[cache_key]
+
+
+def _quantity_area_values(
+    quantity_data: pd.DataFrame,
+    isoA3_dict: dict[str, str],
+    map_codes: pd.Index,
+    area_code_positions: np.ndarray,
+    values_column: str,
+) -> np.ndarray:
+    '''
+    Puts the values of a quantity (per country) into an array with one
+    value per map area (NaN for areas without data), using the join index
+    of the map areas.
+    '''
+    data_code_positions: np.ndarray = map_codes.get_indexer(
+        quantity_data['Country'].map(isoA3_dict)
+    )
+    is_on_map: np.ndarray = data_code_positions >= 0
+
+    # The last element stays NaN, and is where areas without a code go
+    code_values: np.ndarray = np.full(len(map_codes) + 1, np.nan)
+    code_values[data_code_positions[is_on_map]] = (
+        quantity_data[values_column].to_numpy(dtype=float)[is_on_map]
+    )
+
+    return code_values.take(area_code_positions)
+
+
+# The pool of map tile rendering worker processes. It is kept between
+# calls, so that the workers (and the map areas they have read, or got
+# from the main process when they were forked) are reused
+_map_tile_executor: concurrent.futures.ProcessPoolExecutor | None = None
+_map_tile_executor_workers: int = 0
+
+
+def _get_map_tile_executor(
+    rendering_workers: int,
+) -> concurrent.futures.ProcessPoolExecutor:
+    '''
+    Returns the pool of map tile rendering workers (creating it if there
+    is none yet, or if it has a different number of workers).
+    '''
+    global _map_tile_executor, _map_tile_executor_workers
+    if _map_tile_executor_workers != rendering_workers:
+        _reset_map_tile_executor()
+        _map_tile_executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=rendering_workers
+        )
+        _map_tile_executor_workers = rendering_workers
+
+    return _map_tile_executor
+
+
+def _reset_map_tile_executor() -> None:
+    '''
+    Shuts down the pool of map tile rendering workers (a new one is
+    started at the next tiled map grid).
+    '''
+    global _map_tile_executor, _map_tile_executor_workers
+    if _map_tile_executor is not None:
+        _map_tile_executor.shutdown(wait=False, cancel_futures=True)
+    _map_tile_executor = None
+    _map_tile_executor_workers = 0
+
+
+def _map_grid_figure(
+    figure_layout: dict[str, ty.Any], plot_indices: ty.Iterable[int]
+) -> tuple[matplotlib.figure.Figure, list[matplotlib.axes.Axes]]:
+    '''
+    Makes an (Agg) figure with some of the plots of a map grid (given by
+    their index in the grid), at the places they have in the grid.
+    '''
+    grid_figure: matplotlib.figure.Figure = matplotlib.figure.Figure(
+        figsize=figure_layout['size'], dpi=figure_layout['dpi']
+    )
+    matplotlib.backends.backend_agg.FigureCanvasAgg(grid_figure)
+    grid_specification: matplotlib.gridspec.GridSpec = (
+        grid_figure.add_gridspec(
+            figure_layout['rows'], figure_layout['columns']
+        )
+    )
+    quantity_plots: list[matplotlib.axes.Axes] = [
+        grid_figure.add_subplot(
+            grid_specification[
+                divmod(plot_index, figure_layout['columns'])
+            ]
+        )
+        for plot_index in plot_indices
+    ]
+
+    return grid_figure, quantity_plots
+
+
+def _render_map_tile(
+    map_data_file: str,
+    iso_A3_header_in_map_data: str,
+    quantity_index: int,
+    area_values: np.ndarray,
+    quantity_display_name: str,
+    quantity_color_bar: matplotlib.colors.Colormap,
+    map_grid_plot_parameters: box.Box,
+    color_definitions: box.Box,
+    figure_layout: dict[str, ty.Any],
+    dpi_to_use: int,
+) -> tuple[int, int, np.ndarray]:
+    '''
+    Renders one quantity map of a map grid (with the Agg backend) in a
+    figure laid out like the whole grid, so that it has exactly the
+    pixels it would have in the grid figure. Returns the top and left
+    pixel positions of the map and the RGBA pixels of the map (which
+    includes its title and color bar).
+    '''
+    quantity_color: str = quantity_color_bar.name
+    if (
+        quantity_color not in matplotlib.colormaps
+        or matplotlib.colormaps[quantity_color] != quantity_color_bar
+    ):
+        matplotlib.colormaps.register(quantity_color_bar, force=True)
+    map_areas: gpd.GeoDataFrame = _get_map_grid_areas(
+        map_data_file, iso_A3_header_in_map_data
+    )[0]
+
+    tile_figure, (quantity_plot,) = _map_grid_figure(
+        figure_layout, [quantity_index]
+    )
+    make_quantity_map(
+        quantity_display_name,
+        None,
+        map_areas,
+        quantity_plot,
+        quantity_color,
+        map_grid_plot_parameters,
+        color_definitions,
+        area_values=area_values,
+    )
+    tile_figure.subplots_adjust(**figure_layout['subplot_parameters'])
+    tile_pixels: np.ndarray = _rendered_figure_pixels(tile_figure, dpi_to_use)
+
+    # We only send back the part of the figure where the map is drawn
+    is_drawn: np.ndarray = (tile_pixels != figure_layout['background']).any(
+        axis=2
+    )
+    drawn_rows: np.ndarray = np.flatnonzero(is_drawn.any(axis=1))
+    drawn_columns: np.ndarray = np.flatnonzero(is_drawn.any(axis=0))
+    if len(drawn_rows) == 0:
+        return 0, 0, tile_pixels[:0, :0]
+    tile_top: int = drawn_rows[0]
+    tile_left: int = drawn_columns[0]
+
+    return (
+        tile_top,
+        tile_left,
+        tile_pixels[
+            tile_top:drawn_rows[-1] + 1, tile_left:drawn_columns[-1] + 1
+        ],
+    )
+
+
+def map_grid(
+    quantities_data: list[pd.DataFrame],
+    quantity_display_names: list[str],
+    quantity_colors: list[str],
+    output_folder: str,
+    map_grid_plot_parameters: box.Box,
+    color_bar_definitions: box.Box,
+    color_definitions: box.Box,
+    dpi_to_use: int,
+    file_formats: box.Box,
+    rendering_workers: int = 1,
+) -> None:
+    '''
+    This function creates a grid of maps. You need to give it the data you want
+    to plot, the names of the quantities, and their colors, as well as
+    some plot parameters (in your general parameters file, under
+    a [map_grid_plot]  header). You also need to have a map areas data file
+    such as this one:
+    https://www.naturalearthdata.com/http//www.naturalearthdata.com/download/110m/cultural/ne_110m_admin_0_countries.zip
+    You also need to provide a csv file that translates the names of the
+    countries you are using into ISOA3 codes, which can be found here
+    https://en.wikipedia.org/wiki/ISO_3166-1_alpha-3
+    The map areas and the ISO A3 codes are read only once per file (and
+    kept for later calls, unless the files change).
+
+    If rendering_workers is larger than 1, the grid is laid out once
+    (without drawing the map areas) and each quantity map is rendered
+    (with the Agg backend, at dpi_to_use) at its place in a pool of worker
+    processes (kept between calls), which gives the same pixels as the
+    serial version. The main process still lays out and draws the rest of
+    the figure (about a third of the serial time in
+    benchmarks/benchmark_map_grid.py), so this is only worth using with
+    at least as many free processors as workers and several maps with
+    many (or detailed) areas. With one processor, it is slower than the
+    serial version. This is only used when all the file formats are raster
+    formats (such as png or jpg), as vector formats (such as svg or pdf)
+    are drawn in one go.
+
+    '''
 
     # We read some parameters
 
     isoA3_file: str = map_grid_plot_parameters.isoA3_file
-    isoA3_codes: pd.DataFrame = pd.read_csv(f'{isoA3_file}')
-    isoA3_dict: dict[str, str] = dict(
-        zip(isoA3_codes.Country, isoA3_codes.IsoA3)
-    )
-    iso_A3_header: str = map_grid_plot_parameters.iso_A3_header
+    isoA3_dict: dict[str, str] = _get_isoA3_dictionary(isoA3_file)
     iso_A3_header_in_map_data: str = (
         map_grid_plot_parameters.iso_A3_header_in_map_data
     )
+    values_column: str = map_grid_plot_parameters.values_column
 
     figure_title: str = map_grid_plot_parameters.figure_title
 
@@ -1528,9 +3824,46 @@ def map_grid(
         color_bar_definitions[quantity_color] = [zero_color, quantity_color]
     register_color_bars(color_bar_definitions, color_definitions)
 
-    # We read the map data from a file
-    map_areas: gpd.GeoDataFrame = gpd.read_file(
-        f'{map_data_folder}/{map_data_file}'
+    formats_to_save: list[str] = [
+        file_format
+        for file_format in file_formats
+        if file_formats[file_format]
+    ]
+    if (
+        rendering_workers > 1
+        and _can_render_figure_once()
+        and all(
+            file_format.lower() in _RASTER_FIGURE_FORMATS
+            for file_format in formats_to_save
+        )
+    ):
+        grid_pixels: np.ndarray = _map_grid_from_tiles(
+            quantities_data,
+            quantity_display_names,
+            quantity_colors,
+            isoA3_dict,
+            f'{map_data_folder}/{map_data_file}',
+            map_grid_plot_parameters,
+            color_definitions,
+            dpi_to_use,
+            rendering_workers,
+        )
+        check_if_folder_exists(output_folder)
+        for file_format in formats_to_save:
+            with open(
+                f'{output_folder}/{figure_title}.{file_format}', 'wb'
+            ) as grid_file:
+                grid_file.write(
+                    _encoded_figure_pixels(
+                        grid_pixels, file_format, dpi_to_use
+                    )
+                )
+        return
+
+    # We get the map data (and the join index between the ISO A3 codes
+    # and the map areas)
+    map_areas, map_codes, area_code_positions = _get_map_grid_areas(
+        f'{map_data_folder}/{map_data_file}', iso_A3_header_in_map_data
     )
 
     # We create a figure with one plot (grid element) for each quantity
@@ -1558,24 +3891,23 @@ def map_grid(
             quantity_column
         ]
 
-        # We remap the country name in the data to its ISO A3 code
-        quantity_data[iso_A3_header] = quantity_data['Country'].map(isoA3_dict)
-        # We create the plot data
-        plot_data: pd.DataFrame = pd.merge(
-            map_areas,
-            quantity_data,
-            left_on=iso_A3_header_in_map_data,
-            right_on=iso_A3_header,
-        )
-        # We make the plot
+        # We make the plot, with the quantity values put in place
+        # of the map areas they belong to
         make_quantity_map(
             quantity_display_name,
-            plot_data,
+            None,
             map_areas,
             quantity_plot,
             quantity_color,
             map_grid_plot_parameters,
             color_definitions,
+            area_values=_quantity_area_values(
+                quantity_data,
+                isoA3_dict,
+                map_codes,
+                area_code_positions,
+                values_column,
+            ),
         )
     # We put a suptitle and save the figure
     grid_figure.suptitle(f'{figure_title}')
@@ -1586,19 +3918,174 @@ def map_grid(
     )
 
 
-def put_plots_on_map(
-    map_figure: matplotlib.figure.Figure,
+def _map_grid_from_tiles(
+    quantities_data: list[pd.DataFrame],
+    quantity_display_names: list[str],
+    quantity_colors: list[str],
+    isoA3_dict: dict[str, str],
+    map_data_file: str,
+    map_grid_plot_parameters: box.Box,
+    color_definitions: box.Box,
+    dpi_to_use: int,
+    rendering_workers: int,
+) -> np.ndarray:
+    '''
+    Renders a map grid as an RGBA pixel array. The whole figure is laid
+    out once (as in the serial version of map_grid), and each
+    quantity map is then rendered at its place in that layout in a pool
+    of worker processes. The maps are put on top of the rest of the
+    figure (the title and any unused plots).
+    '''
+    figure_title: str = map_grid_plot_parameters.figure_title
+    number_of_rows: int = map_grid_plot_parameters.rows
+    number_of_columns: int = map_grid_plot_parameters.columns
+    iso_A3_header_in_map_data: str = (
+        map_grid_plot_parameters.iso_A3_header_in_map_data
+    )
+
+    # We read the map first, so that (forked) workers get it with
+    # the cache
+    map_areas, map_codes, area_code_positions = _get_map_grid_areas(
+        map_data_file, iso_A3_header_in_map_data
+    )
+    quantities_area_values: list[np.ndarray] = [
+        _quantity_area_values(
+            quantity_data,
+            isoA3_dict,
+            map_codes,
+            area_code_positions,
+            map_grid_plot_parameters.values_column,
+        )
+        for quantity_data in quantities_data
+    ]
+
+    # We lay out the whole grid as the serial version does, but without
+    # the map areas (which are clipped to their plots, so that they do
+    # not change the layout, but would take about as long to draw here
+    # as in the serial version)
+    figure_layout: dict[str, ty.Any] = {
+        'rows': number_of_rows,
+        'columns': number_of_columns,
+        'size': tuple(matplotlib.rcParams['figure.figsize']),
+        'dpi': matplotlib.rcParams['figure.dpi'],
+    }
+    layout_figure, layout_plots = _map_grid_figure(
+        figure_layout, range(number_of_rows * number_of_columns)
+    )
+    for quantity_plot, quantity_display_name, quantity_color, area_values in (
+        zip(
+            layout_plots,
+            quantity_display_names,
+            quantity_colors,
+            quantities_area_values,
+        )
+    ):
+        has_value: np.ndarray = ~np.isnan(area_values)
+        color_bar_scale, map_aspect = _quantity_map_scale_and_aspect(
+            area_values[has_value],
+            np.asarray(map_areas.geometry)[has_value],
+            map_areas,
+        )
+        _lay_out_quantity_map(
+            quantity_display_name,
+            quantity_plot,
+            matplotlib.colormaps[quantity_color],
+            color_bar_scale,
+            map_aspect,
+            map_grid_plot_parameters,
+        )
+    layout_figure.suptitle(f'{figure_title}')
+    layout_figure.tight_layout()
+    figure_layout['subplot_parameters'] = {
+        subplot_parameter: getattr(
+            layout_figure.subplotpars, subplot_parameter
+        )
+        for subplot_parameter in [
+            'left',
+            'right',
+            'bottom',
+            'top',
+            'wspace',
+            'hspace',
+        ]
+    }
+    figure_layout['background'] = np.round(
+        255
+        * np.array(matplotlib.colors.to_rgba(layout_figure.get_facecolor()))
+    ).astype(np.uint8)
+
+    tile_executor: concurrent.futures.ProcessPoolExecutor = (
+        _get_map_tile_executor(rendering_workers)
+    )
+    tile_futures: list[concurrent.futures.Future] = [
+        tile_executor.submit(
+            _render_map_tile,
+            map_data_file,
+            iso_A3_header_in_map_data,
+            quantity_index,
+            area_values,
+            quantity_display_name,
+            matplotlib.colormaps[quantity_color],
+            map_grid_plot_parameters,
+            color_definitions,
+            figure_layout,
+            dpi_to_use,
+        )
+        for quantity_index, (
+            quantity_display_name,
+            quantity_color,
+            area_values,
+        ) in enumerate(
+            zip(
+                quantity_display_names,
+                quantity_colors,
+                quantities_area_values,
+            )
+        )
+    ]
+
+    # While the workers render the maps, we render the rest of the figure
+    # (the title and the unused plots)
+    frame_figure: matplotlib.figure.Figure = _map_grid_figure(
+        figure_layout,
+        range(len(tile_futures), number_of_rows * number_of_columns),
+    )[0]
+    frame_figure.suptitle(f'{figure_title}')
+    frame_figure.subplots_adjust(**figure_layout['subplot_parameters'])
+    grid_pixels: np.ndarray = _rendered_figure_pixels(
+        frame_figure, dpi_to_use
+    )
+
+    try:
+        for tile_future in tile_futures:
+            tile_top, tile_left, tile_pixels = tile_future.result()
+            grid_area: np.ndarray = grid_pixels[
+                tile_top:tile_top + tile_pixels.shape[0],
+                tile_left:tile_left + tile_pixels.shape[1],
+            ]
+            is_drawn: np.ndarray = (
+                tile_pixels != figure_layout['background']
+            ).any(axis=2)
+            grid_area[is_drawn] = tile_pixels[is_drawn]
+    except concurrent.futures.process.BrokenProcessPool:
+        _reset_map_tile_executor()
+        raise
+
+    return grid_pixels
+
+
+def _map_plot_rectangles(
     map_data: pd.DataFrame,
     map_parameters: dict,
-    plot_y_total_values: pd.DataFrame,
-    projection_type: ty.Optional[str] = None,
-) -> dict[str, matplotlib.axes.Axes]:
+    plot_y_total_values: pd.DataFrame | pd.Series,
+) -> tuple[pd.Index, np.ndarray]:
     '''
-    Puts plots/axes on a map figure. You can then draw in these.
-    The plot_y_total_values are the sizes of the plots per country (for example
-    the size of the stacked bar for a stacked bar plot).
+    Computes (in one go) the rectangles (in figure coordinates: x, y, width,
+    height) of the plots to put on a map. It returns the locations that
+    have values to plot (in the order of the map data) and an array with
+    one rectangle per location. The y total values are a Series
+    (or a DataFrame with one column).
     '''
-
     location_code_header: str = map_parameters['location_code_header']
     map_data = map_data.set_index(location_code_header)
 
@@ -1609,8 +4096,6 @@ def put_plots_on_map(
     location_latitudes_header: str = map_parameters[
         'location_latitudes_header'
     ]
-    map_data['latitude'] = map_data[location_latitudes_header].values
-    map_data['longitude'] = map_data[location_longitudes_header].values
 
     scaling_parameters: dict = map_parameters['scaling_parameters']
     # These parameters determine the size and location parameters to place
@@ -1638,35 +4123,140 @@ def put_plots_on_map(
     maximum_longitude: float = scaling_parameters['maximum_longitude']
     maximum_latitude: float = scaling_parameters['maximum_latitude']
 
-    # We create a dictionary that contains a plot/axis on top for each
-    # location
-    plots_on_top: dict[str, matplotlib.axes.Axes] = {}
-
-    # We iterate through the locations
-    for location in map_data.index:
-
-        # We check that there are values to plot for the location
-        if location in plot_y_total_values.index:
-            latitude: float = map_data.loc[location]['latitude']
-            longitude: float = map_data.loc[location]['longitude']
-            y_size = (
-                plot_y_total_values.loc[location] * y_size_scale / y_size_max
-            )
-            # We create the plot/Axes with the right size and scaling factors
-            plot_rectangle: tuple[float, float, float, float] = (
-                x_start
-                * (1 + longitude_scaling * longitude / maximum_longitude),
-                y_start * (1 + latitude_scaling * latitude / maximum_latitude),
-                x_size,
-                y_size,
-            )
-            plots_on_top[location] = map_figure.add_axes(
-                plot_rectangle,
-                projection=projection_type,
+    # We only keep the locations that have values to plot
+    if isinstance(plot_y_total_values, pd.DataFrame):
+        if len(plot_y_total_values.columns) != 1:
+            raise ValueError(
+                'The plot y total values need to be a Series or a DataFrame '
+                f'with one column (not {len(plot_y_total_values.columns)})'
             )
+        plot_y_total_values = plot_y_total_values.iloc[:, 0]
+    y_total_values: pd.Series = plot_y_total_values
+    has_values: np.ndarray = map_data.index.isin(y_total_values.index)
+    locations: pd.Index = map_data.index[has_values]
+    latitudes: np.ndarray = map_data[location_latitudes_header].to_numpy(
+        dtype=float
+    )[has_values]
+    longitudes: np.ndarray = map_data[location_longitudes_header].to_numpy(
+        dtype=float
+    )[has_values]
+    y_totals: np.ndarray = y_total_values.reindex(locations).to_numpy(
+        dtype=float
+    )
+
+    plot_rectangles: np.ndarray = np.column_stack(
+        (
+            x_start * (1 + longitude_scaling * longitudes / maximum_longitude),
+            y_start * (1 + latitude_scaling * latitudes / maximum_latitude),
+            np.full(len(locations), x_size),
+            y_totals * y_size_scale / y_size_max,
+        )
+    )
+
+    return locations, plot_rectangles
+
+
+def put_plots_on_map(
+    map_figure: matplotlib.figure.Figure,
+    map_data: pd.DataFrame,
+    map_parameters: dict,
+    plot_y_total_values: pd.Series | pd.DataFrame,
+    projection_type: ty.Optional[str] = None,
+) -> dict[str, matplotlib.axes.Axes]:
+    '''
+    Puts plots/axes on a map figure. You can then draw in these.
+    The plot_y_total_values are the sizes of the plots per country (for example
+    the size of the stacked bar for a stacked bar plot), as a Series
+    (or a DataFrame with a single column).
+    If you have many locations, put_stacked_bars_on_map (which draws
+    all the bars into the map Axes) is much faster.
+    '''
+
+    locations, plot_rectangles = _map_plot_rectangles(
+        map_data, map_parameters, plot_y_total_values
+    )
+
+    # We create a dictionary that contains a plot/axis on top for each
+    # location (with the right size and scaling factors)
+    plots_on_top: dict[str, matplotlib.axes.Axes] = {
+        location: map_figure.add_axes(
+            tuple(plot_rectangle), projection=projection_type
+        )
+        for location, plot_rectangle in zip(locations, plot_rectangles)
+    }
     return plots_on_top
 
 
+def put_stacked_bars_on_map(
+    map_figure: matplotlib.figure.Figure,
+    map_data: pd.DataFrame,
+    map_parameters: dict,
+    plot_values: pd.DataFrame,
+    bar_colors: list[str],
+    map_plot: matplotlib.axes.Axes | None = None,
+) -> list[matplotlib.collections.PolyCollection]:
+    '''
+    Draws a stacked bar on a map figure for each location. The bars are
+    placed and sized as the plots of put_plots_on_map, but are all drawn
+    into the map Axes (map_plot, by default the first Axes of the figure),
+    in figure coordinates, with one collection per stacked element, which
+    is much faster to lay out and save when there are many locations.
+    The plot_values have the locations as index and one column per
+    stacked element (from bottom to top), which get the bar_colors.
+    The function returns the collections (one per stacked element).
+    '''
+    if map_plot is None:
+        if not map_figure.axes:
+            raise ValueError('The map figure has no map Axes to draw in')
+        map_plot = map_figure.axes[0]
+    scaling_parameters: dict = map_parameters['scaling_parameters']
+    height_scaling: float = (
+        scaling_parameters['y_size_scale'] / scaling_parameters['y_size_max']
+    )
+    locations, plot_rectangles = _map_plot_rectangles(
+        map_data, map_parameters, plot_values.sum(axis=1)
+    )
+    element_heights: np.ndarray = (
+        plot_values.reindex(locations).to_numpy(dtype=float) * height_scaling
+    )
+    element_tops: np.ndarray = plot_rectangles[:, [1]] + np.cumsum(
+        element_heights, axis=1
+    )
+    element_bottoms: np.ndarray = element_tops - element_heights
+    bar_lefts: np.ndarray = plot_rectangles[:, 0]
+    bar_rights: np.ndarray = bar_lefts + plot_rectangles[:, 2]
+
+    bar_collections: list[matplotlib.collections.PolyCollection] = []
+    for element_index, bar_color in enumerate(bar_colors):
+        bottoms: np.ndarray = element_bottoms[:, element_index]
+        tops: np.ndarray = element_tops[:, element_index]
+        # Each bar element is a rectangle with four corners (x, y)
+        element_rectangles: np.ndarray = np.stack(
+            (
+                np.column_stack((bar_lefts, bottoms)),
+                np.column_stack((bar_rights, bottoms)),
+                np.column_stack((bar_rights, tops)),
+                np.column_stack((bar_lefts, tops)),
+            ),
+            axis=1,
+        )
+        # The bars are in figure coordinates, so they do not change the
+        # limits of the map and are not clipped to it
+        bar_collection: matplotlib.collections.PolyCollection = (
+            matplotlib.collections.PolyCollection(
+                element_rectangles,
+                facecolors=bar_color,
+                edgecolors='face',
+                transform=map_figure.transFigure,
+                clip_on=False,
+            )
+        )
+        map_plot.add_collection(bar_collection, autolim=False)
+        bar_collections.append(bar_collection)
+
+    return bar_collections
+
+
 def rgba_code_color(color_rgb: tuple[int, ...], color_opacity: float) -> str:
     '''
     Gets an RGBA string from a color RGB tuple.
@@ -1683,17 +4273,44 @@ def rgba_code_color(color_rgb: tuple[int, ...], color_opacity: float) -> str:
     return rgba_string
 
 
-def make_sankey(
+def _rgba_code_colors(
+    color_names: pd.Series,
+    color_opacities: pd.Series | float,
+    color_definitions: box.Box,
+) -> list[str]:
+    '''
+    Gets the RGBA strings (as in rgba_code_color) of a series of color names
+    (defined in color_definitions, in RGB, from 0 to 255) and their opacities,
+    computing the RGB part only once per color.
+    '''
+    color_codes: dict[str, str] = {
+        color_name: 'rgba('
+        + ','.join(map(str, color_definitions[color_name]))
+        + ','
+        for color_name in pd.unique(color_names)
+    }
+    rgb_parts: np.ndarray = color_names.map(color_codes).to_numpy(dtype=object)
+    opacity_parts: np.ndarray = (
+        pd.Series(color_opacities, index=color_names.index)
+        .astype(str)
+        .to_numpy(dtype=object)
+    )
+
+    return list(rgb_parts + opacity_parts + ')')
+
+
+def make_sankey_figure(
     nodes: pd.DataFrame,
     links: pd.DataFrame,
     sankey_title: str,
-    output_folder: str,
     Sankey_parameters: box.Box,
     color_definitions: box.Box,
-) -> None:
+) -> go.Figure:
     '''
-    Makes a Sankey plot in plotly (comes out as an html file).
-    The nodes and links are in a DataFrame
+    Makes a Sankey figure in plotly.
+    The nodes and links are in a DataFrame. The link sources and targets
+    are matched to the node labels all at once, and the colors
+    are converted to RGBA strings in bulk.
     '''
 
     node_parameters: box.Box = Sankey_parameters.nodes
@@ -1701,18 +4318,18 @@ def make_sankey(
     label_padding: int = node_parameters.label_padding
     label_alignement: str = node_parameters.label_alignement
 
-    node_labels_names_only: list[str] = pd.Series(nodes.Label).to_list()
+    node_labels_names_only: pd.Series = pd.Series(nodes.Label)
     display_values: bool = node_parameters.display_values
     if display_values:
-        values_to_add: pd.Series[float] = nodes.Value
         unit: str = node_parameters.unit
-        node_labels: list[str] = []
-        for node_label, value_to_add in zip(
-            node_labels_names_only, values_to_add
-        ):
-            node_labels.append(f'{node_label}<br> {value_to_add}<br> {unit}')
+        node_labels: list[str] = list(
+            node_labels_names_only.astype(str).to_numpy(dtype=object)
+            + '<br> '
+            + nodes.Value.astype(str).to_numpy(dtype=object)
+            + f'<br> {unit}'
+        )
     else:
-        node_labels = node_labels_names_only
+        node_labels = node_labels_names_only.to_list()
 
     node_x_positions: pd.Series[float] = nodes['X position']
     node_y_positions: pd.Series[float] = nodes['Y position']
@@ -1721,52 +4338,50 @@ def make_sankey(
         zip(node_labels_names_only, node_colors)
     )
 
-    node_colors_rgba_codes: list[str] = []
-    for node_color in node_colors:
-        color_opacity: float = 1
-        color_rgb: tuple[int, ...] = tuple(color_definitions[node_color])
-        node_colors_rgba_codes.append(
-            rgba_code_color(color_rgb, color_opacity)
-        )
+    node_colors_rgba_codes: list[str] = _rgba_code_colors(
+        node_colors, 1, color_definitions
+    )
 
     link_parameters: box.Box = Sankey_parameters.links
 
-    link_sources: pd.Series = links.Source
-    link_source_indices: list[int] = [
-        node_labels_names_only[node_labels_names_only == source].index[0]
-        for source in link_sources
-    ]
+    # We look up the node index of the link sources and targets
+    # (the first node with that label)
+    node_indices: pd.Series = pd.Series(
+        np.arange(len(node_labels_names_only)),
+        index=node_labels_names_only.to_numpy(),
+    )
+    node_indices = node_indices[~node_indices.index.duplicated()]
 
+    link_sources: pd.Series = links.Source
     link_targets: pd.Series = links.Target
-    link_target_indices: list[int] = [
-        node_labels_names_only[node_labels_names_only == target].index[0]
-        for target in link_targets
-    ]
+    link_source_indices: pd.Series = node_indices.reindex(link_sources)
+    link_target_indices: pd.Series = node_indices.reindex(link_targets)
+    unknown_nodes: np.ndarray = pd.unique(
+        np.concatenate(
+            (
+                link_sources[link_source_indices.isna().to_numpy()],
+                link_targets[link_target_indices.isna().to_numpy()],
+            )
+        )
+    )
+    if len(unknown_nodes) > 0:
+        raise ValueError(
+            f'The links use nodes that are not in the nodes: {unknown_nodes}'
+        )
+
     value_scaling_factor: float = link_parameters.value_scaling_factor
-    link_values_unscaled: pd.Series = links.Value
-    link_values: list[float] = [
-        link_value / value_scaling_factor
-        for link_value in link_values_unscaled
-    ]
-    link_colors: pd.Series[str] = links.Color
+    link_values: np.ndarray = (
+        links.Value.to_numpy(dtype=float) / value_scaling_factor
+    )
+    # Link colors can be the color of their source or target node
+    link_colors: pd.Series[str] = links.Color.mask(
+        links.Color == 'source', link_sources.map(node_color_dict)
+    ).mask(links.Color == 'target', link_targets.map(node_color_dict))
     link_opacities: pd.Series[float] = links.Opacity
     link_labels: pd.Series[str] = links.Label
-    link_colors_rgba_codes: list[str] = []
-    for link_color, link_opacity, source, target, link_label in zip(
-        link_colors,
-        link_opacities,
-        link_sources,
-        link_targets,
-        link_labels,
-    ):
-
-        if link_color == 'source':
-            link_color = node_color_dict[source]
-        elif link_color == 'target':
-            link_color = node_color_dict[target]
-
-        color_rgb = tuple(color_definitions[link_color])
-        link_colors_rgba_codes.append(rgba_code_color(color_rgb, link_opacity))
+    link_colors_rgba_codes: list[str] = _rgba_code_colors(
+        link_colors, link_opacities, color_definitions
+    )
 
     sankey_figure: go.Figure = go.Figure(
         go.Sankey(
@@ -1780,8 +4395,8 @@ def make_sankey(
                 align=label_alignement,
             ),
             link=dict(
-                source=link_source_indices,
-                target=link_target_indices,
+                source=link_source_indices.to_numpy(dtype=int),
+                target=link_target_indices.to_numpy(dtype=int),
                 value=link_values,
                 color=link_colors_rgba_codes,
                 label=link_labels,
@@ -1797,68 +4412,915 @@ def make_sankey(
             yref='container',
         )
     )
-    sankey_figure.write_html(f'{output_folder}/{sankey_title}.html')
+
+    return sankey_figure
+
+
+def make_sankey(
+    nodes: pd.DataFrame,
+    links: pd.DataFrame,
+    sankey_title: str,
+    output_folder: str,
+    Sankey_parameters: box.Box,
+    color_definitions: box.Box,
+    include_plotlyjs: bool | str = True,
+    output_format: str = 'html',
+) -> None:
+    '''
+    Makes a Sankey plot in plotly (comes out as an html file).
+    The nodes and links are in a DataFrame (see make_sankey_figure).
+    By default, the html file contains the whole plotly.js library (about
+    3.5 MB). If you make many Sankeys, you can instead set include_plotlyjs
+    to:
+    - 'cdn' to load plotly.js from the web
+    - 'directory' to use a plotly.min.js file in the output folder
+    (written once, and shared by all files in that folder)
+    - a path (ending in .js) to a plotly.js file you provide
+    You can also set output_format to 'json' to only write the (compact)
+    figure JSON (without the plotly template, so the default plotly.js
+    styling is used), for example to display it in your own viewer.
+    Other output formats raise a ValueError.
+    '''
+    if output_format not in ['html', 'json']:
+        raise ValueError(
+            f'Unsupported Sankey output format: {output_format} '
+            '(use html or json)'
+        )
+    sankey_figure: go.Figure = make_sankey_figure(
+        nodes, links, sankey_title, Sankey_parameters, color_definitions
+    )
+    if output_format == 'json':
+        sankey_figure.update_layout(template=None)
+        with open(
+            f'{output_folder}/{sankey_title}.json', mode='w', encoding='utf-8'
+        ) as json_file:
+            json_file.write(sankey_figure.to_json())
+    else:
+        sankey_figure.write_html(
+            f'{output_folder}/{sankey_title}.html',
+            include_plotlyjs=include_plotlyjs,
+        )
+
+
+def make_sankeys_page(
+    sankey_figures: list[go.Figure],
+    page_title: str,
+    output_folder: str,
+    include_plotlyjs: bool | str = 'directory',
+) -> None:
+    '''
+    Puts several Sankey figures (from make_sankey_figure) into one html page,
+    which loads plotly.js only once. The options for include_plotlyjs are
+    the same as for make_sankey (by default, a plotly.min.js file
+    in the output folder is used).
+    '''
+    if include_plotlyjs == 'directory':
+        plotly_js_file: str = f'{output_folder}/plotly.min.js'
+        if not os.path.exists(plotly_js_file):
+            with open(plotly_js_file, mode='w', encoding='utf-8') as js_file:
+                js_file.write(plotly.offline.get_plotlyjs())
+        include_plotlyjs = 'plotly.min.js'
+
+    figure_divs: list[str] = [
+        sankey_figure.to_html(
+            full_html=False,
+            # Only the first figure loads plotly.js
+            include_plotlyjs=include_plotlyjs if figure_index == 0 else False,
+        )
+        for figure_index, sankey_figure in enumerate(sankey_figures)
+    ]
+    page_body: str = '\n'.join(figure_divs)
+    with open(
+        f'{output_folder}/{page_title}.html', mode='w', encoding='utf-8'
+    ) as page_file:
+        page_file.write(
+            f'<html>\n<head><meta charset="utf-8" />'
+            f'<title>{html.escape(page_title)}</title></head>\n'
+            f'<body>\n{page_body}\n</body>\n</html>\n'
+        )
+
+
+@functools.lru_cache(maxsize=4096)
+def _parsed_key_path(dotted_key_path: str) -> tuple[str, ...]:
+    '''
+    Splits a dotted key path into its keys (cached, as the same key paths
+    are used over and over).
+    '''
+    return tuple(dotted_key_path.split('.'))
+
+
+def key_path(keys: str | collections.abc.Iterable[str]) -> tuple[str, ...]:
+    '''
+    Turns a dotted key path (such as 'variables.mid_year_electric') or
+    a list of keys into a tuple of keys, which the nested value functions
+    use directly (and which can be used as a dictionary key).
+    Dotted key paths are only parsed once. Use a list of keys if some
+    keys contain dots.
+    '''
+    if isinstance(keys, str):
+        return _parsed_key_path(keys)
+    if isinstance(keys, tuple):
+        return keys
+    return tuple(keys)
 
 
-def get_nested_value(dictionary: dict, key_list: list[str]) -> ty.Any:
+def get_nested_value(
+    dictionary: dict, key_list: str | collections.abc.Iterable[str]
+) -> ty.Any:
     '''
     If you give a dictionary (for example a TOML configuration file)
-    and a list of nested keys, this returns the desired value.
+    and a list of nested keys (or a key path), this returns
+    the desired value. The dictionary is not modified.
     '''
 
-    for key in key_list[:-1]:
-        dictionary = dictionary.setdefault(key, {})
-    nested_value = dictionary[key_list[-1]]
+    nested_value: ty.Any = dictionary
+    for key in key_path(key_list):
+        nested_value = nested_value[key]
 
     return nested_value
 
 
 def set_nested_value(
-    dictionary: dict, key_list: list[str], value_to_set: ty.Any
+    dictionary: dict,
+    key_list: str | collections.abc.Iterable[str],
+    value_to_set: ty.Any,
 ) -> None:
     '''
     This sets the value of a nested element of a dictionary (for example
-    coming from a TOML configuration file)
+    coming from a TOML configuration file), given by a list of nested keys
+    (or a key path)
     '''
-    for key in key_list[:-1]:
+    nested_keys: tuple[str, ...] = key_path(key_list)
+    for key in nested_keys[:-1]:
         dictionary = dictionary.setdefault(key, {})
-    dictionary[key_list[-1]] = value_to_set
+    dictionary[nested_keys[-1]] = value_to_set
+
+
+def _override_items(
+    overrides: collections.abc.Mapping | pd.DataFrame,
+) -> dict[tuple[str, ...], ty.Any]:
+    '''
+    Gets the overrides (from a dictionary or a DataFrame with
+    a Key path and a Value column) with key paths as tuples.
+    '''
+    if isinstance(overrides, pd.DataFrame):
+        override_items: collections.abc.Iterable = zip(
+            overrides['Key path'], overrides['Value']
+        )
+    else:
+        override_items = overrides.items()
+
+    return {
+        key_path(override_path): override_value
+        for override_path, override_value in override_items
+    }
+
+
+def apply_overrides(
+    dictionary: dict, overrides: collections.abc.Mapping | pd.DataFrame
+) -> None:
+    '''
+    Sets many nested values of a dictionary (for example coming from a TOML
+    configuration file) at once. The overrides are a dictionary of
+    key paths (dotted strings, or lists/tuples of keys) and values, or
+    a DataFrame with a Key path and a Value column.
+    Each nested dictionary is only looked up once.
+    '''
+    parent_dictionaries: dict[tuple[str, ...], dict] = {(): dictionary}
+    for override_path, override_value in _override_items(overrides).items():
+        parent_path: tuple[str, ...] = override_path[:-1]
+        parent_dictionary: dict | None = parent_dictionaries.get(parent_path)
+        if parent_dictionary is None:
+            parent_dictionary = dictionary
+            for key in parent_path:
+                parent_dictionary = parent_dictionary.setdefault(key, {})
+            parent_dictionaries[parent_path] = parent_dictionary
+        parent_dictionary[override_path[-1]] = override_value
+        if isinstance(override_value, dict):
+            # The dictionaries we looked up in the replaced one are gone
+            for looked_up_path in list(parent_dictionaries):
+                if looked_up_path[: len(override_path)] == override_path:
+                    del parent_dictionaries[looked_up_path]
+
+
+class _ParametersOverlay(box.Box):
+    '''
+    A frozen Box that holds (without copying them) values shared with
+    other parameters. Shared dictionaries and lists are only turned into
+    read-only versions (overlays and tuples) when they are read, so they
+    cannot be changed through the overlay.
+    '''
+
+    def __getitem__(self, item: ty.Any, _ignore_default: bool = False):
+        stored_value: ty.Any = super().__getitem__(item, _ignore_default)
+        frozen_value: ty.Any = _read_only_parameter(stored_value)
+        # We keep the overlays of dictionaries (lists stay lists, so that
+        # the overlay stays equal to the parameters it holds)
+        if isinstance(stored_value, dict) and frozen_value is not stored_value:
+            dict.__setitem__(self, item, frozen_value)
+        return frozen_value
+
+    def values(self) -> list:
+        return [self[key] for key in self]
+
+    def items(self) -> list[tuple]:
+        return [(key, self[key]) for key in self]
+
+    def to_dict(self) -> dict:
+        return _plain_parameter(self)
+
+
+def _plain_parameter(parameter_value: ty.Any) -> ty.Any:
+    '''
+    Returns a (new) version of a parameter value made of plain
+    dictionaries and lists.
+    '''
+    if isinstance(parameter_value, dict):
+        return {
+            key: _plain_parameter(value)
+            for key, value in dict.items(parameter_value)
+        }
+    if isinstance(parameter_value, (list, tuple)):
+        return list(map(_plain_parameter, parameter_value))
+
+    return parameter_value
+
+
+def _read_only_parameter(parameter_value: ty.Any) -> ty.Any:
+    '''
+    Returns a read-only version of a (shared) parameter value: an overlay
+    for a dictionary (its own values are only shared, not copied), a tuple
+    for a list, and the value itself otherwise.
+    '''
+    if isinstance(parameter_value, _ParametersOverlay):
+        return parameter_value
+    if isinstance(parameter_value, dict):
+        parameters_overlay: box.Box = _ParametersOverlay(frozen_box=True)
+        # We bypass the Box conversions (which would copy everything)
+        for key, value in dict.items(parameter_value):
+            dict.__setitem__(parameters_overlay, key, value)
+        return parameters_overlay
+    if isinstance(parameter_value, list):
+        return tuple(map(_read_only_parameter, parameter_value))
+
+    return parameter_value
+
+
+def copy_with_overrides(
+    parameters: box.Box, overrides: collections.abc.Mapping | pd.DataFrame
+) -> box.Box:
+    '''
+    Returns a frozen (read-only) version of a parameters Box with some
+    nested values replaced (given as in apply_overrides).
+    Only the Boxes on the paths to the replaced values are copied, the rest
+    is shared with the original parameters, which are not modified.
+    The shared parts are read-only too (their dictionaries are frozen
+    and their lists are tuples), so the copy cannot be used to change
+    the original parameters.
+    This is much faster than copying the whole parameters, for example
+    to give each scenario of a sweep its own parameters.
+    '''
+    overridden_parameters: box.Box = _ParametersOverlay(frozen_box=True)
+    # We bypass the Box conversions (which would copy everything)
+    for key, value in dict.items(parameters):
+        dict.__setitem__(overridden_parameters, key, value)
+
+    nested_overrides: dict[str, dict[tuple[str, ...], ty.Any]] = {}
+    for override_path, value in _override_items(overrides).items():
+        if len(override_path) == 1:
+            if isinstance(value, dict):
+                value = box.Box(value, frozen_box=True)
+            dict.__setitem__(overridden_parameters, override_path[0], value)
+        else:
+            nested_overrides.setdefault(override_path[0], {})[
+                override_path[1:]
+            ] = value
+    for key, key_overrides in nested_overrides.items():
+        dict.__setitem__(
+            overridden_parameters,
+            key,
+            copy_with_overrides(parameters.get(key, box.Box()), key_overrides),
+        )
+
+    return overridden_parameters
+
+
+def _sweep_scenario_key(overrides: dict[tuple[str, ...], ty.Any]) -> str:
+    '''
+    Makes the key of a sweep scenario from its overrides.
+    '''
+    return '|'.join(
+        f'{".".join(override_path)}={override_value!r}'
+        for override_path, override_value in sorted(overrides.items())
+    )
+
+
+def _run_sweep_scenario(
+    parameters_file_name: str,
+    overlay_file_names: list[str],
+    overrides: dict[tuple[str, ...], ty.Any],
+    scenario_function: collections.abc.Callable,
+) -> tuple[pd.DataFrame, float]:
+    '''
+    Runs one scenario of a sweep (in a worker process) and returns its
+    results and how long it took.
+    '''
+    scenario_start: float = time.perf_counter()
+    # The parameters files are cached, so each worker process
+    # only reads them once
+    scenario_parameters: box.Box = copy_with_overrides(
+        parameters_from_TOML(parameters_file_name, overlay_file_names),
+        overrides,
+    )
+    scenario_results: pd.DataFrame = scenario_function(scenario_parameters)
+
+    return scenario_results, time.perf_counter() - scenario_start
+
+
+def run_parameter_sweep(
+    parameters_file_name: str,
+    scenario_overrides: (
+        collections.abc.Mapping | collections.abc.Iterable[dict]
+    ),
+    scenario_function: collections.abc.Callable,
+    results_store: str,
+    results_table_name: str = 'Sweep results',
+    workers: int | None = None,
+    overlay_file_names: list[str] | None = None,
+    skip_existing: bool = True,
+) -> pd.DataFrame:
+    '''
+    Runs a function (that takes parameters and returns a DataFrame of
+    results) for many scenarios in a pool of processes, and puts all
+    the results in one store.
+    The parameters of each scenario are the parameters of a TOML file
+    (see parameters_from_TOML) with some values replaced (read-only, see
+    copy_with_overrides). The scenario overrides are either a list of
+    overrides (one dictionary of key paths and values per scenario), or a
+    dictionary of key paths and the list of values to use for each of
+    them (in which case all combinations are run).
+    The results get a Scenario column (with the overrides of the scenario)
+    and are written (as the scenarios finish) to a table of an SQLite
+    database (if results_store ends with .sqlite3, .sqlite or .db) or to a
+    Parquet dataset folder (one file per scenario, which can be read with
+    pd.read_parquet(results_store)). The index of the results is not
+    stored (put what you need from it in columns).
+    Scenarios that are already in the store are skipped (unless
+    skip_existing is False).
+    The scenario function must be defined at the top level of a module (so
+    that the worker processes can use it). If workers is 1, the scenarios
+    run one after the other, in this process.
+    The function prints the throughput (scenarios per second) and returns
+    a summary with the status and duration of each scenario.
+    '''
+    if overlay_file_names is None:
+        overlay_file_names = []
+    if isinstance(scenario_overrides, collections.abc.Mapping):
+        grid_paths: list[tuple[str, ...]] = [
+            key_path(override_path) for override_path in scenario_overrides
+        ]
+        scenario_overrides = [
+            dict(zip(grid_paths, grid_values))
+            for grid_values in itertools.product(
+                *scenario_overrides.values()
+            )
+        ]
+    scenarios: dict[str, dict[tuple[str, ...], ty.Any]] = {}
+    for overrides in scenario_overrides:
+        scenario_override_items: dict[tuple[str, ...], ty.Any] = (
+            _override_items(overrides)
+        )
+        scenarios[_sweep_scenario_key(scenario_override_items)] = (
+            scenario_override_items
+        )
+
+    use_sql: bool = results_store.lower().endswith(
+        ('.sqlite3', '.sqlite', '.db')
+    )
+    existing_scenarios: set[str] = set()
+    if use_sql:
+        sql_connection: sqlite3.Connection = sqlite3.connect(results_store)
+        if skip_existing and results_table_name in set(
+            table_name
+            for (table_name,) in sql_connection.execute(
+                "SELECT name FROM sqlite_master WHERE type='table'"
+            )
+        ):
+            existing_scenarios = set(
+                scenario
+                for (scenario,) in sql_connection.execute(
+                    f'SELECT DISTINCT Scenario FROM "{results_table_name}"'
+                )
+            )
+    else:
+        check_if_folder_exists(results_store)
+
+    def scenario_file(scenario_key: str) -> str:
+        scenario_hash: str = hashlib.sha1(scenario_key.encode()).hexdigest()
+        return f'{results_store}/{scenario_hash}.parquet'
+
+    sweep_summary: pd.DataFrame = pd.DataFrame(
+        {'Status': 'to run', 'Duration (s)': np.nan},
+        index=pd.Index(list(scenarios), name='Scenario'),
+    )
+    scenarios_to_run: list[str] = []
+    for scenario_key in scenarios:
+        if skip_existing and (
+            scenario_key in existing_scenarios
+            if use_sql
+            else os.path.isfile(scenario_file(scenario_key))
+        ):
+            sweep_summary.loc[scenario_key, 'Status'] = 'skipped'
+        else:
+            scenarios_to_run.append(scenario_key)
+
+    def store_results(
+        scenario_key: str, scenario_results: pd.DataFrame
+    ) -> None:
+        scenario_results = scenario_results.copy()
+        scenario_results.insert(0, 'Scenario', scenario_key)
+        if use_sql:
+            scenario_results.to_sql(
+                results_table_name,
+                con=sql_connection,
+                if_exists='append',
+                index=False,
+            )
+            sql_connection.commit()
+        else:
+            scenario_results.to_parquet(
+                scenario_file(scenario_key), index=False
+            )
+
+    sweep_start: float = time.perf_counter()
+    scenario_outcomes: collections.abc.Iterable[
+        tuple[str, concurrent.futures.Future]
+    ]
+    sweep_executor: concurrent.futures.Executor | None = None
+    if workers == 1:
+        scenario_outcomes = (
+            (
+                scenario_key,
+                _finished_future(
+                    _run_sweep_scenario,
+                    parameters_file_name,
+                    overlay_file_names,
+                    scenarios[scenario_key],
+                    scenario_function,
+                ),
+            )
+            for scenario_key in scenarios_to_run
+        )
+    else:
+        sweep_executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers
+        )
+        scenario_futures: dict[concurrent.futures.Future, str] = {
+            sweep_executor.submit(
+                _run_sweep_scenario,
+                parameters_file_name,
+                overlay_file_names,
+                scenarios[scenario_key],
+                scenario_function,
+            ): scenario_key
+            for scenario_key in scenarios_to_run
+        }
+        scenario_outcomes = (
+            (scenario_futures[scenario_future], scenario_future)
+            for scenario_future in concurrent.futures.as_completed(
+                scenario_futures
+            )
+        )
+    try:
+        # We store the results as they come in
+        for scenario_key, scenario_future in scenario_outcomes:
+            try:
+                scenario_results, scenario_duration = scenario_future.result()
+                store_results(scenario_key, scenario_results)
+            except Exception as scenario_error:
+                print(f'Scenario {scenario_key} failed: {scenario_error!r}')
+                sweep_summary.loc[scenario_key, 'Status'] = 'failed'
+            else:
+                sweep_summary.loc[scenario_key, 'Status'] = 'done'
+                sweep_summary.loc[scenario_key, 'Duration (s)'] = (
+                    scenario_duration
+                )
+    finally:
+        if sweep_executor is not None:
+            sweep_executor.shutdown(cancel_futures=True)
+        if use_sql:
+            sql_connection.close()
+    sweep_time: float = time.perf_counter() - sweep_start
+
+    scenario_statuses: pd.Series = sweep_summary['Status'].value_counts()
+    scenarios_done: int = int(scenario_statuses.get('done', 0))
+    sweep_throughput: float = scenarios_done / max(sweep_time, 1e-9)
+    print(
+        f'{scenarios_done} scenarios run in {sweep_time:.2f} seconds '
+        f'({sweep_throughput:.2f} scenarios per second), '
+        f'{int(scenario_statuses.get("skipped", 0))} skipped, '
+        f'{int(scenario_statuses.get("failed", 0))} failed'
+    )
+
+    return sweep_summary
+
+
+def _finished_future(
+    function_to_run: collections.abc.Callable, *function_arguments: ty.Any
+) -> concurrent.futures.Future:
+    '''
+    Runs a function and returns its result (or error) in a (finished)
+    future, like the futures of an executor.
+    '''
+    finished_future: concurrent.futures.Future = concurrent.futures.Future()
+    try:
+        finished_future.set_result(function_to_run(*function_arguments))
+    except Exception as function_error:
+        finished_future.set_exception(function_error)
+
+    return finished_future
 
 
 def function_timer(function_to_time: ty.Callable) -> ty.Callable:
+    '''
+    Decorator that times a function. Each call is recorded in a timing
+    registry (see function_timings_summary) and its run time is printed
+    (unless print_times is False in function_timer_settings).
+    The CPU time and memory peak (with tracemalloc) of the calls are also
+    recorded if cpu_time and memory_peak are True in function_timer_settings.
+    Timed functions called from within a timed function are nested: the
+    exclusive time of a function is its time without these calls.
+    The time spent in save_dataframe and in reading map files and SQL
+    queries from within timed functions is also recorded.
+    '''
+
     @functools.wraps(function_to_time)
     def time_wrapper(
         *function_arguments: ty.Any, **function_keywaord_arguments: ty.Any
     ) -> ty.Any:
-        timer_start: float = time.perf_counter()
-        function_result: ty.Any = function_to_time(
-            *function_arguments, **function_keywaord_arguments
-        )
-        timer_end: float = time.perf_counter()
-        function_run_time: float = timer_end - timer_start
-        print(
-            f'{function_to_time.__name__} took '
-            f'{function_run_time:.2f} seconds'
+        function_result, function_run_time = _timed_call(
+            f'{function_to_time.__module__}.{function_to_time.__qualname__}',
+            function_to_time,
+            function_arguments,
+            function_keywaord_arguments,
         )
+        if function_timer_settings['print_times']:
+            print(
+                f'{function_to_time.__name__} took '
+                f'{function_run_time:.2f} seconds'
+            )
         return function_result
 
     return time_wrapper
 
 
+def function_timings_summary() -> pd.DataFrame:
+    '''
+    Returns a summary of the timing registry, with the number of calls,
+    the total, mean, minimal, median (p50), 95th percentile (p95) and
+    maximal run times, the total exclusive time, the total CPU time,
+    and the maximal memory peak of each timed function (named after
+    its module and qualified name).
+    The percentiles are exact up to TIMING_SAMPLE_SIZE calls, and estimated
+    from a random sample of that many calls for functions called more often.
+    '''
+    summary_columns: list[str] = [
+        'Calls',
+        'Total (s)',
+        'Mean (s)',
+        'Min (s)',
+        'p50 (s)',
+        'p95 (s)',
+        'Max (s)',
+        'Exclusive total (s)',
+        'CPU total (s)',
+        'Memory peak (MB)',
+    ]
+    summary_rows: list[list[float]] = []
+    with _function_timings_lock:
+        function_names: list[str] = list(_function_timings)
+        for function_timings in _function_timings.values():
+            summary_rows.append(
+                [
+                    function_timings.calls,
+                    function_timings.total,
+                    function_timings.total / function_timings.calls,
+                    function_timings.minimum,
+                    np.percentile(function_timings.run_time_sample, 50),
+                    np.percentile(function_timings.run_time_sample, 95),
+                    function_timings.maximum,
+                    function_timings.exclusive_total,
+                    # These are nan if they were not measured
+                    function_timings.cpu_total,
+                    function_timings.memory_peak / 1e6,
+                ]
+            )
+    timings_summary: pd.DataFrame = pd.DataFrame(
+        summary_rows,
+        index=pd.Index(function_names, name='Function'),
+        columns=summary_columns,
+    )
+    timings_summary['Calls'] = timings_summary['Calls'].astype(int)
+
+    return timings_summary.sort_values('Total (s)', ascending=False)
+
+
+def reset_function_timings() -> None:
+    '''
+    Empties the timing registry.
+    '''
+    with _function_timings_lock:
+        _function_timings.clear()
+
+
+def save_function_timings(output_file: str) -> None:
+    '''
+    Saves the timing registry summary to a JSON or CSV file
+    (depending on the extension of the output file).
+    '''
+    timings_summary: pd.DataFrame = function_timings_summary()
+    if output_file.lower().endswith('.json'):
+        timings_summary.to_json(output_file, orient='index', indent=2)
+    elif output_file.lower().endswith('.csv'):
+        timings_summary.to_csv(output_file)
+    else:
+        raise ValueError('Timings can only be saved to JSON or CSV files')
+
+
+def print_function_timings() -> None:
+    '''
+    Prints the timing registry summary as a table.
+    '''
+    timings_summary: pd.DataFrame = function_timings_summary()
+    timings_table: rich.table.Table = rich.table.Table(
+        title='Function timings'
+    )
+    timings_table.add_column('Function')
+    for summary_column in timings_summary.columns:
+        timings_table.add_column(summary_column, justify='right')
+    for function_name, function_summary in timings_summary.iterrows():
+        timings_table.add_row(
+            str(function_name),
+            str(int(function_summary['Calls'])),
+            *[
+                f'{summary_value:.3f}' if not np.isnan(summary_value) else '-'
+                for summary_value in function_summary.iloc[1:]
+            ],
+        )
+    print(timings_table)
+
+
+def _slider_key(slider_values: collections.abc.Iterable[float]) -> tuple:
+    '''
+    Makes a key (for the dashboard caches) from slider values. The values
+    are rounded, so that values computed from the slider steps match the
+    values the sliders send.
+    '''
+    return tuple(round(slider_value, 10) for slider_value in slider_values)
+
+
+def _slider_grid_values(slider_definition: box.Box) -> list[float]:
+    '''
+    Returns all the values a (discrete) dashboard slider can take.
+    '''
+    return np.round(
+        np.arange(
+            slider_definition.minimum,
+            slider_definition.maximum + slider_definition.step / 2,
+            slider_definition.step,
+        ),
+        10,
+    ).tolist()
+
+
+# The dashboard parameters, values computing function, and modified
+# parameters of the precompute worker processes (set once per process)
+_slider_grid_worker_arguments: tuple = ()
+
+
+def _start_slider_grid_worker(
+    dashboard_parameters: box.Box,
+    values_computing_function: collections.abc.Callable,
+    modified_parameters: list[str],
+) -> None:
+    '''
+    Stores the dashboard parameters and values computing function in a
+    precompute worker process, so that they are sent only once per process
+    (and not with every grid point).
+    '''
+    global _slider_grid_worker_arguments
+    _slider_grid_worker_arguments = (
+        dashboard_parameters,
+        values_computing_function,
+        modified_parameters,
+    )
+
+
+def _compute_slider_grid_points(
+    slider_keys: list[tuple],
+) -> list[tuple[tuple, ty.Any]]:
+    '''
+    Computes the plotting values of the dashboard for a batch of
+    combinations of slider values (in a precompute worker process).
+    '''
+    dashboard_parameters, values_computing_function, modified_parameters = (
+        _slider_grid_worker_arguments
+    )
+    return [
+        (
+            slider_key,
+            values_computing_function(
+                copy_with_overrides(
+                    dashboard_parameters,
+                    {
+                        ('variables', key): slider_value
+                        for key, slider_value in zip(
+                            modified_parameters, slider_key
+                        )
+                    },
+                )
+            ),
+        )
+        for slider_key in slider_keys
+    ]
+
+
+def _precompute_slider_grid(
+    dashboard_parameters: box.Box,
+    values_computing_function: collections.abc.Callable,
+    modified_parameters: list[str],
+    slider_grid: collections.abc.Iterable[tuple],
+    precomputed_values: dict[tuple, ty.Any],
+    precompute_workers: int | None,
+    batch_size: int = 64,
+) -> None:
+    '''
+    Computes the plotting values of the dashboard for all the combinations
+    of slider values in a pool of processes, and stores them in
+    precomputed_values (as they come in).
+    The grid is sent to the pool in batches of batch_size combinations,
+    with at most two batches per worker waiting at any time, so that
+    large grids do not fill the memory with pending tasks.
+    '''
+    worker_amount: int = precompute_workers or os.cpu_count() or 1
+    slider_keys: collections.abc.Iterator[tuple] = iter(slider_grid)
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=worker_amount,
+            initializer=_start_slider_grid_worker,
+            initargs=(
+                dashboard_parameters,
+                values_computing_function,
+                modified_parameters,
+            ),
+        ) as precompute_executor:
+            pending_batches: set[concurrent.futures.Future] = set()
+            while True:
+                while len(pending_batches) < 2 * worker_amount:
+                    slider_key_batch: list[tuple] = list(
+                        itertools.islice(slider_keys, batch_size)
+                    )
+                    if not slider_key_batch:
+                        break
+                    pending_batches.add(
+                        precompute_executor.submit(
+                            _compute_slider_grid_points, slider_key_batch
+                        )
+                    )
+                if not pending_batches:
+                    break
+                finished_batches, pending_batches = concurrent.futures.wait(
+                    pending_batches,
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                for finished_batch in finished_batches:
+                    precomputed_values.update(finished_batch.result())
+    except Exception as precompute_error:
+        print(f'Precomputing the slider grid stopped: {precompute_error}')
+
+
+def _plotly_json_equal(first_value: ty.Any, second_value: ty.Any) -> bool:
+    '''
+    Compares two (parts of) plotly figure JSON structures, which can
+    contain NumPy arrays.
+    '''
+    if isinstance(first_value, dict) and isinstance(second_value, dict):
+        return first_value.keys() == second_value.keys() and all(
+            _plotly_json_equal(first_value[key], second_value[key])
+            for key in first_value
+        )
+    if isinstance(first_value, np.ndarray) or isinstance(
+        second_value, np.ndarray
+    ):
+        return bool(np.array_equal(first_value, second_value))
+    if isinstance(first_value, (list, tuple)) and isinstance(
+        second_value, (list, tuple)
+    ):
+        return len(first_value) == len(second_value) and all(
+            _plotly_json_equal(first_element, second_element)
+            for first_element, second_element in zip(first_value, second_value)
+        )
+
+    return bool(first_value == second_value)
+
+
+def _binary_plot_array(plot_array: ty.Any) -> ty.Any:
+    '''
+    Encodes numeric plot data as a (base64) binary plotly.js typed array,
+    which is much smaller and faster to parse than a JSON list.
+    Other data (or data that is already encoded) is returned as it is.
+    '''
+    if isinstance(plot_array, (list, tuple, np.ndarray)):
+        array_values: np.ndarray = np.asarray(plot_array)
+        if array_values.dtype.kind in 'biuf':
+            return {
+                'dtype': 'f8',
+                'bdata': base64.b64encode(
+                    np.ascontiguousarray(array_values, dtype='<f8').tobytes()
+                ).decode('ascii'),
+            }
+        return array_values.tolist()
+
+    return plot_array
+
+
+def _figure_update(
+    previous_figure: plotly.graph_objs._figure.Figure | None,
+    new_figure: plotly.graph_objs._figure.Figure,
+) -> plotly.graph_objs._figure.Figure | dash.Patch:
+    '''
+    Returns what the dashboard needs to send to go from the previous
+    figure to the new one: a patch with only the trace x/y arrays that
+    changed if that is all that changed, or the whole new figure otherwise.
+    '''
+    if previous_figure is None or len(previous_figure.data) != len(
+        new_figure.data
+    ):
+        return new_figure
+    if not _plotly_json_equal(
+        previous_figure.layout.to_plotly_json(),
+        new_figure.layout.to_plotly_json(),
+    ):
+        return new_figure
+
+    figure_patch: dash.Patch = dash.Patch()
+    for trace_index, (previous_trace, new_trace) in enumerate(
+        zip(previous_figure.data, new_figure.data)
+    ):
+        previous_trace_json: dict = previous_trace.to_plotly_json()
+        new_trace_json: dict = new_trace.to_plotly_json()
+        data_axes: list[str] = ['x', 'y']
+        if not _plotly_json_equal(
+            {
+                key: value
+                for key, value in previous_trace_json.items()
+                if key not in data_axes
+            },
+            {
+                key: value
+                for key, value in new_trace_json.items()
+                if key not in data_axes
+            },
+        ):
+            return new_figure
+        for data_axis in data_axes:
+            if not _plotly_json_equal(
+                previous_trace_json.get(data_axis),
+                new_trace_json.get(data_axis),
+            ):
+                figure_patch['data'][trace_index][data_axis] = (
+                    _binary_plot_array(new_trace_json.get(data_axis))
+                )
+
+    return figure_patch
+
+
 def make_plot_sliders_dashboard(
     dashboard_parameters: box.Box,
     values_computing_function: collections.abc.Callable,
     plotting_function: collections.abc.Callable,
-) -> None:
+    cache_size: int = 256,
+    precompute_grid: bool = False,
+    precompute_workers: int | None = None,
+    maximum_precomputed_values: int = 10000,
+    run_server: bool = True,
+    host: str = '127.0.0.1',
+    port: int = 8050,
+    compress_responses: bool = True,
+    asset_cache_seconds: int = 3600,
+) -> dash.Dash:
     '''
     Create a dashboard that shows a plot and sliders that can be used
     to update the plot.
-    This dashboard is seen by entering http://127.0.0.1:8050/
-    in your web browser.
+    This dashboard is seen by entering http://host:port/ in your web
+    browser (http://127.0.0.1:8050/ with the default host and port).
     The parameters are in a toml file.
     The starting values of the elements that are used to compute the functions
     (including the ones in the sliders) are under the [variables]
-    header. These will be update by the sliders.
+    header. These will be update by the sliders: the functions get
+    a read-only copy of the parameters with the slider values (the
+    dashboard_parameters themselves are not changed, so that several
+    requests can be handled at the same time).
     The [display] header contains the size of the plot (its
     height: The width is the golden ratio times the height) and the title
     of the dashboard.
@@ -1875,6 +5337,39 @@ def make_plot_sliders_dashboard(
     ticks = [2025, 2030, 2035, 2040, 2045, 2050]
     key = 'mid_year_electric'
 
+    The plots are kept in a cache (of cache_size plots, with the least
+    recently used ones removed first), so moving a slider back to values
+    it had before does not recompute anything.
+    If precompute_grid is True, the plotting values of all the combinations
+    of slider values are computed in the background, in a pool of
+    precompute_workers processes (by default, one per processor).
+    For this, values_computing_function needs to be picklable (i.e.
+    defined at the top level of a module).
+    Grids with more than maximum_precomputed_values combinations are not
+    precomputed (a message says so), as all the precomputed values are
+    kept in memory.
+    The cache statistics (hits, misses, and how many plots used
+    precomputed values) can be seen at http://host:port/cache-statistics
+    (each server process has its own caches).
+    When the sliders move, only the (binary-encoded) trace data that
+    changed is sent to the browser if the rest of the plot stays the same.
+
+    By default, the function runs the dashboard (with the threaded Flask
+    development server, on the given host and port) until you stop it.
+    For production, set run_server to False: the function then returns the
+    Dash app, which you can serve with a multi-worker WSGI server, for
+    example by putting
+    app = make_plot_sliders_dashboard(..., run_server=False)
+    in my_dashboard.py and running:
+    gunicorn --workers 4 --threads 4 'my_dashboard:app.server'
+    Each worker process has its own plot cache (and precomputes the grid
+    on its own if precompute_grid is True), so it is better to use few
+    workers with several threads each.
+    The dashboard assets are served locally (not from a CDN), with
+    browser caching (for asset_cache_seconds), and responses are compressed
+    if compress_responses is True and flask-compress is installed
+    (pip install dash[compress]).
+
     '''
 
     # We start with getting the plotting values (y-values)
@@ -1887,7 +5382,16 @@ def make_plot_sliders_dashboard(
     )
 
     # We create a dashboard
-    dashboard: dash.Dash = dash.Dash(__name__)
+    compression_available: bool = (
+        importlib.util.find_spec('flask_compress') is not None
+    )
+    if compress_responses and not compression_available:
+        print('flask-compress is not installed, responses are not compressed')
+        compress_responses = False
+    dashboard: dash.Dash = dash.Dash(
+        __name__, compress=compress_responses, serve_locally=True
+    )
+    dashboard.server.config['SEND_FILE_MAX_AGE_DEFAULT'] = asset_cache_seconds
 
     # We create a title
     dashboard_title: dash.html.H1 = dash.html.H1(
@@ -1942,12 +5446,14 @@ def make_plot_sliders_dashboard(
         )
 
     # We put all this in the layout
+    # (with a store of the slider values of the displayed plot)
     dashboard.layout = dash.html.Div(
         children=[
             dashboard_title,
             demand_plot_display,
             *sliders,
             # # Need to unpack to go in children list
+            dash.dcc.Store(id='Plot slider values'),
         ]
     )
 
@@ -1968,9 +5474,11 @@ def make_plot_sliders_dashboard(
     # AND its display name)). If the quantity is not in the slider list,
     # we then can simply use the value eneterd in the parameters file.
 
-    callback_arguments: list[dash.Input | dash.Output] = []
-    # We first add the output (the figure/plot)
+    callback_arguments: list[dash.Input | dash.Output | dash.State] = []
+    # We first add the outputs (the figure/plot and the slider values
+    # it was made with)
     callback_arguments.append(dash.Output('Display plot', 'figure'))
+    callback_arguments.append(dash.Output('Plot slider values', 'data'))
 
     # We then list the parameters that are modified
     modified_parameters: list[str] = []
@@ -1983,30 +5491,145 @@ def make_plot_sliders_dashboard(
         )
         # And we add a key to find the modified parameter
         modified_parameters.append(slider_definitions[slider].key)
+    # The slider values of the displayed plot tell us what changed
+    callback_arguments.append(dash.State('Plot slider values', 'data'))
+
+    # We keep the plots we made (per combination of slider values)
+    # and the precomputed plotting values
+    figure_cache: collections.OrderedDict[
+        tuple, plotly.graph_objs._figure.Figure
+    ] = collections.OrderedDict()
+    precomputed_values: dict[tuple, ty.Any] = {}
+    cache_statistics: dict[str, int] = {
+        'hits': 0,
+        'misses': 0,
+        'precomputed_hits': 0,
+    }
+    cache_lock: threading.Lock = threading.Lock()
+
+    def figure_for_slider_values(
+        slider_key: tuple,
+    ) -> plotly.graph_objs._figure.Figure:
+        '''
+        Returns the plot for a combination of slider values (from the cache
+        if it is there).
+        '''
+        with cache_lock:
+            if slider_key in figure_cache:
+                cache_statistics['hits'] += 1
+                figure_cache.move_to_end(slider_key)
+                return figure_cache[slider_key]
+            cache_statistics['misses'] += 1
+
+        # Each request uses its own (read-only) version of the parameters,
+        # with the slider values, so that requests running at the same time
+        # do not interfere (the dashboard parameters are left unchanged)
+        request_parameters: box.Box = copy_with_overrides(
+            dashboard_parameters,
+            {
+                ('variables', key): updated_value
+                for updated_value, key in zip(slider_key, modified_parameters)
+            },
+        )
+
+        # We remake the plot
+        # We recompute the plotting values (y-values), unless they
+        # have been precomputed
+        plotting_values: list[list[float]] | None = precomputed_values.get(
+            slider_key
+        )
+        if plotting_values is None:
+            plotting_values = values_computing_function(request_parameters)
+        else:
+            with cache_lock:
+                cache_statistics['precomputed_hits'] += 1
+        # We create a plotly plot/figure (Dash needs this type of plot/figure).
+        display_plot: plotly.graph_objs._figure.Figure = plotting_function(
+            plotting_values, request_parameters
+        )
+
+        with cache_lock:
+            figure_cache[slider_key] = display_plot
+            if len(figure_cache) > cache_size:
+                figure_cache.popitem(last=False)
+
+        return display_plot
 
     # We can now perform the update
     @dashboard.callback(*callback_arguments)
-    def update_plot(*callback_arguments) -> plotly.graph_objs._figure.Figure:
+    def update_plot(
+        *callback_arguments,
+    ) -> tuple[plotly.graph_objs._figure.Figure | dash.Patch, list[float]]:
+
+        *slider_values, displayed_slider_values = callback_arguments
+        slider_key: tuple = _slider_key(slider_values)
+        displayed_plot: plotly.graph_objs._figure.Figure | None = None
+        if displayed_slider_values is not None:
+            displayed_key: tuple = _slider_key(displayed_slider_values)
+            if displayed_key == slider_key:
+                return dash.no_update, dash.no_update
+            with cache_lock:
+                displayed_plot = figure_cache.get(displayed_key)
+
+        display_plot: plotly.graph_objs._figure.Figure = (
+            figure_for_slider_values(slider_key)
+        )
 
-        for argument_index, (updated_value, key) in enumerate(
-            zip(callback_arguments, modified_parameters)
-        ):
+        return _figure_update(displayed_plot, display_plot), list(slider_key)
 
-            dashboard_parameters.variables[key] = updated_value
+    @dashboard.server.route('/cache-statistics')
+    def get_cache_statistics() -> dict[str, int]:
+        with cache_lock:
+            return dict(
+                cache_statistics,
+                cached_plots=len(figure_cache),
+                precomputed_slider_values=len(precomputed_values),
+            )
 
-        # We remake the plot
-        # We recomput the plotting values (y-values)
-        plotting_values: list[list[float]] = values_computing_function(
-            dashboard_parameters
+    slider_grid_size: int = math.prod(
+        len(_slider_grid_values(slider_definitions[slider]))
+        for slider in slider_definitions
+    )
+    if precompute_grid and slider_grid_size > maximum_precomputed_values:
+        print(
+            f'The slider grid has {slider_grid_size} combinations, '
+            f'more than maximum_precomputed_values '
+            f'({maximum_precomputed_values}): it is not precomputed'
         )
-        # We create a plotly plot/figure (Dash needs this type of plot/figure).
-        display_plot: plotly.graph_objs._figure.Figure = plotting_function(
-            plotting_values, dashboard_parameters
+    elif precompute_grid:
+        slider_grid: collections.abc.Iterable[tuple] = map(
+            _slider_key,
+            itertools.product(
+                *[
+                    _slider_grid_values(slider_definitions[slider])
+                    for slider in slider_definitions
+                ]
+            ),
+        )
+        threading.Thread(
+            target=_precompute_slider_grid,
+            args=(
+                dashboard_parameters,
+                values_computing_function,
+                modified_parameters,
+                slider_grid,
+                precomputed_values,
+                precompute_workers,
+            ),
+            daemon=True,
+        ).start()
+
+    # We run the server (or give the dashboard to the user, who can
+    # serve it)
+    if run_server:
+        dashboard.run(
+            debug=False,
+            host=host,
+            port=port,
+            threaded=True,
         )
-        return display_plot
 
-    # We run the server
-    dashboard.run(debug=False)
+    return dashboard
 
 
 if __name__ == '__main__':
@@ -0,0 +1,22 @@
+import box
+import pytest
+
+import ETS_CookBook as cook
+
+
+@pytest.fixture
+def dataframe_formats():
+    '''
+    Makes the dataframe formats of save_dataframe (with all its file types),
+    with only the given file types switched on.
+    '''
+
+    def make_dataframe_formats(*file_types_to_save: str) -> box.Box:
+        return box.Box(
+            {
+                file_type: file_type in file_types_to_save
+                for file_type in cook._DATAFRAME_FILE_TYPES
+            }
+        )
+
+    return make_dataframe_formats
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import ETS_CookBook as cook
+
+
+@pytest.mark.parametrize(
+    'codec, suffix',
+    [('gzip', '.gz'), ('bz2', '.bz2'), ('xz', '.xz'), ('zstd', '.zst')],
+)
+def test_compressed_round_trip(tmp_path, dataframe_formats, codec, suffix):
+    if codec == 'zstd':
+        pytest.importorskip('zstandard')
+    results = pd.DataFrame(
+        {'Demand': np.linspace(0, 1, 50), 'Area': ['North', 'South'] * 25}
+    )
+    text_formats = dataframe_formats('csv', 'json', 'xml')
+    for file_type in ['csv', 'json', 'xml']:
+        text_formats[f'{file_type}_settings'] = {
+            'compression': codec,
+            'compression_level': 1,
+        }
+    cook.save_dataframe(
+        results, 'Results', 'Group', str(tmp_path), text_formats
+    )
+    for file_type in ['csv', 'json', 'xml']:
+        reloaded = cook.read_dataframe_file(
+            str(tmp_path / f'Results.{file_type}{suffix}')
+        )
+        pd.testing.assert_frame_equal(reloaded, results)
+
+
+def test_uncompressed_by_default(tmp_path, dataframe_formats):
+    results = pd.DataFrame({'Demand': [1.0, 2.0]})
+    cook.save_dataframe(
+        results, 'Results', 'Group', str(tmp_path), dataframe_formats('csv')
+    )
+    assert [path.name for path in tmp_path.iterdir()] == ['Results.csv']
+
+
+def test_compression_level_per_format(tmp_path, dataframe_formats):
+    pytest.importorskip('zstandard')
+    results = pd.DataFrame({'Demand': np.linspace(0, 1, 50)})
+    text_formats = dataframe_formats('csv', 'json')
+    text_formats.csv_settings = {
+        'compression': 'zstd',
+        'compression_level': 19,
+    }
+    text_formats.json_settings = {
+        'compression': 'gzip',
+        'compression_level': 9,
+    }
+    cook.save_dataframe(
+        results, 'Results', 'Group', str(tmp_path), text_formats
+    )
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'Results.csv.zst',
+        'Results.json.gz',
+    ]
+
+    text_formats.json_settings.compression_level = 19
+    with pytest.raises(ValueError, match='between 0 and 9'):
+        cook.save_dataframe(
+            results, 'Results', 'Group', str(tmp_path), text_formats
+        )
+    for wrong_level in [True, 5.5, '5']:
+        text_formats.json_settings.compression_level = wrong_level
+        with pytest.raises(ValueError, match='between 0 and 9'):
+            cook.save_dataframe(
+                results, 'Results', 'Group', str(tmp_path), text_formats
+            )
@@ -0,0 +1,54 @@
+import box
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import ETS_CookBook as cook
+
+
+def test_exports_and_closes_figures(tmp_path):
+    file_formats = box.Box({'png': True, 'svg': True, 'pdf': False})
+    with cook.FigureExportQueue(
+        str(tmp_path), 50, file_formats, workers=2, max_pending=1
+    ) as export_queue:
+        for figure_index in range(4):
+            figure, axes = plt.subplots()
+            axes.plot([0, figure_index])
+            export_queue.submit(figure, f'figure_{figure_index}')
+            assert not plt.fignum_exists(figure.number)
+    assert len(list(tmp_path.glob('*.png'))) == 4
+    assert len(list(tmp_path.glob('*.svg'))) == 4
+
+
+def test_flush_raises_export_errors(tmp_path):
+    export_queue = cook.FigureExportQueue(
+        str(tmp_path), 50, box.Box({'png': True})
+    )
+    export_queue.submit(np.zeros((10, 10, 4), dtype=np.uint8), 'good')
+    export_queue.submit(np.zeros((10, 10, 4), dtype=np.uint8), 'bad/name')
+    with pytest.raises(RuntimeError, match='bad/name'):
+        export_queue.flush()
+    export_queue.close()
+    assert (tmp_path / 'good.png').exists()
+
+
+def test_exceptions_in_with_block_are_kept(tmp_path):
+    with pytest.raises(KeyError):
+        with cook.FigureExportQueue(
+            str(tmp_path), 50, box.Box({'png': True})
+        ) as export_queue:
+            export_queue.submit(
+                np.zeros((10, 10, 4), dtype=np.uint8), 'bad/name'
+            )
+            raise KeyError('Error in the with block')
+
+
+def test_figures_closed_if_rendering_fails(tmp_path):
+    figure, axes = plt.subplots()
+    export_queue = cook.FigureExportQueue(
+        str(tmp_path), 50, box.Box({'png': True, 'not_a_format': True})
+    )
+    with pytest.raises(ValueError):
+        export_queue.submit(figure, 'figure')
+    export_queue.close()
+    assert not plt.fignum_exists(figure.number)
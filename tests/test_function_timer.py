@@ -0,0 +1,74 @@
+import time
+import tracemalloc
+
+import ETS_CookBook as cook
+
+
+@cook.function_timer
+def inner_step():
+    time.sleep(0.02)
+
+
+@cook.function_timer
+def outer_step():
+    time.sleep(0.01)
+    inner_step()
+    inner_step()
+
+
+def test_nested_timings(tmp_path):
+    cook.reset_function_timings()
+    cook.function_timer_settings['print_times'] = False
+    try:
+        outer_step()
+    finally:
+        cook.function_timer_settings['print_times'] = True
+    timings_summary = cook.function_timings_summary()
+    outer_name = f'{__name__}.outer_step'
+    inner_name = f'{__name__}.inner_step'
+    assert timings_summary.loc[inner_name, 'Calls'] == 2
+    assert timings_summary.loc[outer_name, 'Calls'] == 1
+    outer_total = timings_summary.loc[outer_name, 'Total (s)']
+    outer_exclusive = timings_summary.loc[outer_name, 'Exclusive total (s)']
+    inner_total = timings_summary.loc[inner_name, 'Total (s)']
+    assert abs(outer_total - outer_exclusive - inner_total) < 1e-9
+    assert outer_exclusive < inner_total
+
+    cook.save_function_timings(str(tmp_path / 'timings.csv'))
+    assert (tmp_path / 'timings.csv').exists()
+    cook.reset_function_timings()
+    assert cook.function_timings_summary().empty
+
+
+@cook.function_timer
+def quick_step():
+    return [0] * 1000
+
+
+def test_timings_are_aggregated():
+    cook.reset_function_timings()
+    cook.function_timer_settings['print_times'] = False
+    cook.function_timer_settings['memory_peak'] = True
+    try:
+        for call_index in range(2 * cook.TIMING_SAMPLE_SIZE):
+            quick_step()
+        assert tracemalloc.is_tracing()
+        cook.function_timer_settings['memory_peak'] = False
+        quick_step()
+        assert not tracemalloc.is_tracing()
+    finally:
+        cook.function_timer_settings['print_times'] = True
+        cook.function_timer_settings['memory_peak'] = False
+
+    quick_step_timings = cook._function_timings[f'{__name__}.quick_step']
+    assert len(quick_step_timings.run_time_sample) == cook.TIMING_SAMPLE_SIZE
+    timings_summary = cook.function_timings_summary()
+    quick_step_summary = timings_summary.loc[f'{__name__}.quick_step']
+    assert quick_step_summary['Calls'] == 2 * cook.TIMING_SAMPLE_SIZE + 1
+    assert (
+        quick_step_summary['Min (s)']
+        <= quick_step_summary['p50 (s)']
+        <= quick_step_summary['Max (s)']
+    )
+    assert quick_step_summary['Memory peak (MB)'] > 0
+    cook.reset_function_timings()
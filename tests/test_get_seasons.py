@@ -0,0 +1,21 @@
+import pandas as pd
+
+import ETS_CookBook as cook
+
+
+def test_same_as_get_season():
+    # We check a leap year and the year before it
+    days = pd.date_range('2023-01-01', '2024-12-31 23:00', freq='5h')
+    seasons = cook.get_seasons(days)
+    assert list(seasons) == [cook.get_season(day) for day in days]
+
+
+def test_hemisphere_and_series():
+    time_stamps = pd.Series(
+        pd.to_datetime(['2021-01-15', '2021-07-15', None]),
+        index=['a', 'b', 'c'],
+    )
+    seasons = cook.get_seasons(time_stamps, hemisphere='south')
+    assert list(seasons.index) == ['a', 'b', 'c']
+    assert list(seasons.iloc[:2]) == ['summer', 'winter']
+    assert pd.isna(seasons.iloc[2])
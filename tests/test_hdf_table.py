@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import ETS_CookBook as cook
+
+pytest.importorskip('tables')
+
+
+def test_table_append_and_where(tmp_path, dataframe_formats):
+    hdf_formats = dataframe_formats('hdf')
+    hdf_formats.hdf_settings = {
+        'append': True,
+        'data_columns': ['Year'],
+        'complib': 'blosc:zstd',
+    }
+    for year in [2030, 2040]:
+        results = pd.DataFrame(
+            {'Year': year, 'Demand': np.arange(5.0), 'Supply': 1.0}
+        )
+        cook.save_dataframe(
+            results, 'Results', 'Group', str(tmp_path), hdf_formats
+        )
+    hdf_file = str(tmp_path / 'Group.h5')
+    assert len(cook.read_hdf_table(hdf_file, 'Results')) == 10
+    selection = cook.read_hdf_table(
+        hdf_file, 'Results', where='Year > 2035', columns=['Demand']
+    )
+    assert list(selection.columns) == ['Demand']
+    assert list(selection['Demand']) == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_default_fixed_format(tmp_path, dataframe_formats):
+    results = pd.DataFrame({'Demand': np.arange(3.0)})
+    for _ in range(2):
+        cook.save_dataframe(
+            results,
+            'Results',
+            'Group',
+            str(tmp_path),
+            dataframe_formats('hdf'),
+        )
+    assert len(cook.read_hdf_table(str(tmp_path / 'Group.h5'), 'Results')) == 3
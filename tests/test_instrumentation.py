@@ -0,0 +1,79 @@
+import box
+import matplotlib.pyplot as plt
+import pandas as pd
+import pytest
+
+import ETS_CookBook as cook
+
+
+def test_database_events(tmp_path):
+    database_file = str(tmp_path / 'test.sqlite3')
+    test_dataframe = pd.DataFrame({'Value': range(10)})
+    io_events = []
+    cook.add_instrumentation_callback(io_events.append)
+    try:
+        cook.put_dataframe_in_sql_in_chunks(
+            test_dataframe, database_file, 'test_table', 100
+        )
+        read_dataframe = cook.read_table_from_database(
+            'test_table', database_file
+        )
+    finally:
+        cook.remove_instrumentation_callback(io_events.append)
+    cook.read_table_from_database('test_table', database_file)
+
+    assert [io_event['operation'] for io_event in io_events] == [
+        'put_dataframe_in_sql_in_chunks',
+        'read_table_from_database',
+    ]
+    assert io_events[0]['rows'] == 10
+    assert io_events[1]['rows'] == len(read_dataframe)
+    assert io_events[1]['target'] == database_file
+    assert io_events[1]['bytes'] > 0
+    assert io_events[1]['error'] is None
+
+
+def failing_callback(io_event):
+    raise RuntimeError('Callback failure')
+
+
+def test_callback_errors_do_not_mask_results(tmp_path):
+    database_file = str(tmp_path / 'test.sqlite3')
+    cook.add_instrumentation_callback(failing_callback)
+    try:
+        with pytest.raises(pd.errors.DatabaseError):
+            cook.read_table_from_database('missing_table', database_file)
+        cook.put_dataframe_in_sql_in_chunks(
+            pd.DataFrame({'Value': range(3)}),
+            database_file,
+            'test_table',
+            100,
+        )
+        read_dataframe = cook.read_table_from_database(
+            'test_table', database_file
+        )
+    finally:
+        cook.remove_instrumentation_callback(failing_callback)
+
+    assert list(read_dataframe['Value']) == [0, 1, 2]
+
+
+def test_bytes_of_written_files_only(tmp_path):
+    (tmp_path / 'test_figure.svg').write_text('<svg>Old figure</svg>')
+    io_events = []
+    test_figure = plt.figure()
+    cook.add_instrumentation_callback(io_events.append)
+    try:
+        cook.save_figure(
+            test_figure,
+            'test_figure',
+            str(tmp_path),
+            50,
+            box.Box({'png': True, 'svg': False}),
+        )
+    finally:
+        cook.remove_instrumentation_callback(io_events.append)
+        plt.close(test_figure)
+
+    png_file = tmp_path / 'test_figure.png'
+    assert io_events[0]['bytes'] == png_file.stat().st_size
@@ -0,0 +1,207 @@
+import base64
+
+import box
+import dash
+import numpy as np
+import plotly.graph_objects
+import pytest
+
+import ETS_CookBook as cook
+
+X_VALUES = np.arange(50)
+
+
+@pytest.fixture
+def dashboard_parameters():
+    return box.Box(
+        {
+            'variables': {'slope': 1.0, 'offset': 2},
+            'display': {'title': 'Test dashboard', 'plot_height': 50},
+            'sliders': {
+                'slope': {
+                    'display_name': 'Slope',
+                    'id': 'slope_slider',
+                    'minimum': 0,
+                    'maximum': 1,
+                    'step': 0.5,
+                    'start_value': 0.5,
+                    'ticks': [0, 1],
+                    'key': 'slope',
+                },
+                'offset': {
+                    'display_name': 'Offset',
+                    'id': 'offset_slider',
+                    'minimum': 1,
+                    'maximum': 3,
+                    'step': 1,
+                    'start_value': 2,
+                    'ticks': [1, 2, 3],
+                    'key': 'offset',
+                },
+            },
+        }
+    )
+
+
+def line_values(parameters):
+    return [
+        parameters.variables.slope * X_VALUES + parameters.variables.offset
+    ]
+
+
+def line_plot(plotting_values, parameters):
+    return plotly.graph_objects.Figure(
+        [plotly.graph_objects.Scatter(x=X_VALUES, y=plotting_values[0])],
+        layout={'title': parameters.display.title},
+    )
+
+
+def test_precompute_slider_grid(dashboard_parameters):
+    slider_grid = [
+        (slope, offset) for slope in [0, 0.5, 1] for offset in [1, 2, 3]
+    ]
+    precomputed_values = {}
+
+    cook._precompute_slider_grid(
+        dashboard_parameters,
+        line_values,
+        ['slope', 'offset'],
+        iter(slider_grid),
+        precomputed_values,
+        precompute_workers=2,
+        batch_size=2,
+    )
+
+    assert set(precomputed_values) == set(slider_grid)
+    for (slope, offset), plotting_values in precomputed_values.items():
+        np.testing.assert_array_equal(
+            plotting_values[0], slope * X_VALUES + offset
+        )
+    assert dashboard_parameters.variables.slope == 1.0
+
+
+def test_grid_too_large_not_precomputed(dashboard_parameters, capsys):
+    cook.make_plot_sliders_dashboard(
+        dashboard_parameters,
+        line_values,
+        line_plot,
+        precompute_grid=True,
+        maximum_precomputed_values=8,
+        run_server=False,
+    )
+
+    assert 'not precomputed' in ' '.join(capsys.readouterr().out.split())
+
+
+def test_figure_update_patches_changed_data(dashboard_parameters):
+    previous_figure = line_plot(
+        line_values(dashboard_parameters), dashboard_parameters
+    )
+    dashboard_parameters.variables.offset = 3
+    new_figure = line_plot(
+        line_values(dashboard_parameters), dashboard_parameters
+    )
+
+    figure_update = cook._figure_update(previous_figure, new_figure)
+
+    assert isinstance(figure_update, dash.Patch)
+    patch_operations = figure_update.to_plotly_json()['operations']
+    assert [
+        patch_operation['location'] for patch_operation in patch_operations
+    ] == [['data', 0, 'y']]
+    binary_values = patch_operations[0]['params']['value']
+    assert binary_values['dtype'] == 'f8'
+    np.testing.assert_array_equal(
+        np.frombuffer(base64.b64decode(binary_values['bdata']), dtype='<f8'),
+        X_VALUES + 3,
+    )
+
+
+def test_figure_update_sends_whole_figure(dashboard_parameters):
+    previous_figure = line_plot(
+        line_values(dashboard_parameters), dashboard_parameters
+    )
+    new_figure = line_plot(
+        line_values(dashboard_parameters), dashboard_parameters
+    )
+
+    assert cook._figure_update(None, new_figure) is new_figure
+    new_figure.update_layout(title='Other title')
+    assert cook._figure_update(previous_figure, new_figure) is new_figure
+    new_figure = line_plot(
+        line_values(dashboard_parameters), dashboard_parameters
+    )
+    new_figure.update_traces(mode='markers')
+    assert cook._figure_update(previous_figure, new_figure) is new_figure
+    new_figure.add_scatter(x=X_VALUES, y=X_VALUES)
+    assert cook._figure_update(previous_figure, new_figure) is new_figure
+
+
+def test_request_parameters_do_not_change_dashboard(dashboard_parameters):
+    dashboard_parameters.display.ticks = [0, 1]
+    request_parameters = cook.copy_with_overrides(
+        dashboard_parameters, {('variables', 'slope'): 0.5}
+    )
+
+    with pytest.raises(box.exceptions.BoxError):
+        request_parameters.display.title = 'Changed title'
+    with pytest.raises(box.exceptions.BoxError):
+        request_parameters.sliders.slope.step = 0.1
+    with pytest.raises(AttributeError):
+        request_parameters.display.ticks.append(2)
+
+    assert request_parameters.variables.slope == 0.5
+    assert dashboard_parameters.variables.slope == 1.0
+    assert dashboard_parameters.display.title == 'Test dashboard'
+    assert dashboard_parameters.sliders.slope.step == 0.5
+    assert dashboard_parameters.display.ticks == [0, 1]
+
+
+def slider_update(dashboard_client, slope, offset, displayed_values=None):
+    update_response = dashboard_client.post(
+        '/_dash-update-component',
+        json={
+            'output': '..Display plot.figure...Plot slider values.data..',
+            'outputs': [
+                {'id': 'Display plot', 'property': 'figure'},
+                {'id': 'Plot slider values', 'property': 'data'},
+            ],
+            'inputs': [
+                {'id': 'slope_slider', 'property': 'value', 'value': slope},
+                {'id': 'offset_slider', 'property': 'value', 'value': offset},
+            ],
+            'state': [
+                {
+                    'id': 'Plot slider values',
+                    'property': 'data',
+                    'value': displayed_values,
+                }
+            ],
+            'changedPropIds': ['slope_slider.value'],
+        },
+    )
+    assert update_response.status_code == 200
+    return update_response.json['response']
+
+
+def test_dashboard_app(dashboard_parameters):
+    dashboard = cook.make_plot_sliders_dashboard(
+        dashboard_parameters, line_values, line_plot, run_server=False
+    )
+    dashboard_client = dashboard.server.test_client()
+
+    slider_response = slider_update(dashboard_client, 0.5, 3)
+    assert slider_response['Plot slider values']['data'] == [0.5, 3]
+    assert 'data' in slider_response['Display plot']['figure']
+    slider_update(dashboard_client, 0.5, 3)
+    slider_response = slider_update(dashboard_client, 1, 3, [0.5, 3])
+    assert '__dash_patch_update' in slider_response['Display plot']['figure']
+
+    assert dashboard_client.get('/cache-statistics').json == {
+        'hits': 1,
+        'misses': 2,
+        'precomputed_hits': 0,
+        'cached_plots': 2,
+        'precomputed_slider_values': 0,
+    }
+    assert dashboard_parameters.variables.slope == 1.0
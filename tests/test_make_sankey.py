@@ -0,0 +1,121 @@
+# Type hinting here seems to create issues
+# Either with MyPy complaining about imports mising attributes
+# or MyPy not working
+import json
+
+import box
+import pandas as pd
+import pytest
+
+import ETS_CookBook as cook
+
+Sankey_parameters = box.Box(
+    {
+        'nodes': {
+            'label_padding': 15,
+            'label_alignement': 'center',
+            'display_values': True,
+            'unit': 'PJ',
+        },
+        'links': {'value_scaling_factor': 2},
+        'title_size': 20,
+    }
+)
+color_definitions = box.Box(
+    {'SFC_grenat': [133, 20, 43], 'GSHC_gold': [255, 211, 0]}
+)
+nodes = pd.DataFrame(
+    {
+        'Label': ['Gas', 'Power', 'Heat'],
+        'Value': [10, 6.5, 3],
+        'X position': [0.1, 0.5, 0.9],
+        'Y position': [0.5, 0.3, 0.7],
+        'Color': ['SFC_grenat', 'GSHC_gold', 'SFC_grenat'],
+    }
+)
+links = pd.DataFrame(
+    {
+        'Source': ['Gas', 'Gas', 'Power'],
+        'Target': ['Power', 'Heat', 'Heat'],
+        'Value': [6.5, 3.5, 1],
+        'Color': ['source', 'target', 'GSHC_gold'],
+        'Opacity': [0.5, 0.25, 1],
+        'Label': ['a', 'b', 'c'],
+    }
+)
+
+
+def test_link_indices():
+    sankey_figure = cook.make_sankey_figure(
+        nodes, links, 'Test', Sankey_parameters, color_definitions
+    )
+    sankey_links = sankey_figure.data[0].link
+    assert list(sankey_links.source) == [0, 0, 1]
+    assert list(sankey_links.target) == [1, 2, 2]
+    assert list(sankey_links.value) == [3.25, 1.75, 0.5]
+
+
+def test_colors_and_labels():
+    sankey_figure = cook.make_sankey_figure(
+        nodes, links, 'Test', Sankey_parameters, color_definitions
+    )
+    sankey_nodes = sankey_figure.data[0].node
+    assert list(sankey_figure.data[0].link.color) == [
+        cook.rgba_code_color((133, 20, 43), 0.5),
+        cook.rgba_code_color((133, 20, 43), 0.25),
+        cook.rgba_code_color((255, 211, 0), 1.0),
+    ]
+    assert sankey_nodes.color[1] == cook.rgba_code_color((255, 211, 0), 1)
+    assert sankey_nodes.label[1] == 'Power<br> 6.5<br> PJ'
+
+
+def test_json_output(tmp_path):
+    cook.make_sankey(
+        nodes,
+        links,
+        'Énergie',
+        str(tmp_path),
+        Sankey_parameters,
+        color_definitions,
+        output_format='json',
+    )
+    sankey_json = json.loads(
+        (tmp_path / 'Énergie.json').read_text(encoding='utf-8')
+    )
+    assert sankey_json['data'][0]['type'] == 'sankey'
+    assert not sankey_json['layout'].get('template')
+
+
+def test_html_outputs(tmp_path):
+    with pytest.raises(ValueError):
+        cook.make_sankey(
+            nodes,
+            links,
+            'Test',
+            str(tmp_path),
+            Sankey_parameters,
+            color_definitions,
+            output_format='png',
+        )
+    cook.make_sankey(
+        nodes,
+        links,
+        'Test',
+        str(tmp_path),
+        Sankey_parameters,
+        color_definitions,
+        include_plotlyjs='cdn',
+    )
+    assert 'cdn.plot.ly' in (tmp_path / 'Test.html').read_text()
+
+    sankey_figures = [
+        cook.make_sankey_figure(
+            nodes, links, title, Sankey_parameters, color_definitions
+        )
+        for title in ['First', 'Second']
+    ]
+    cook.make_sankeys_page(sankey_figures, 'A <b> page', str(tmp_path))
+    page = (tmp_path / 'A <b> page.html').read_text(encoding='utf-8')
+    assert '<title>A &lt;b&gt; page</title>' in page
+    assert page.count('src="plotly.min.js"') == 1
+    assert (tmp_path / 'plotly.min.js').exists()
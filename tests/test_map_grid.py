@@ -0,0 +1,147 @@
+import box
+import geopandas as gpd
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+
+import ETS_CookBook as cook
+
+
+@pytest.fixture
+def map_grid_plot_parameters(tmp_path):
+    iso_codes = [f'C{area_index:02d}' for area_index in range(16)]
+    gpd.GeoDataFrame(
+        {'ISO_A3': iso_codes},
+        geometry=[
+            shapely.Point(area_index % 4, area_index // 4).buffer(0.45)
+            for area_index in range(16)
+        ],
+        crs='EPSG:4326',
+    ).to_file(tmp_path / 'map.geojson', driver='GeoJSON')
+    pd.DataFrame(
+        {
+            'Country': [f'Country {iso_code}' for iso_code in iso_codes],
+            'IsoA3': iso_codes,
+        }
+    ).to_csv(tmp_path / 'isoA3.csv', index=False)
+    return box.Box(
+        {
+            'isoA3_file': str(tmp_path / 'isoA3.csv'),
+            'iso_A3_header_in_map_data': 'ISO_A3',
+            'figure_title': 'Grid',
+            'rows': 2,
+            'columns': 2,
+            'map_data_folder': str(tmp_path),
+            'map_data_file': 'map.geojson',
+            'zero_color': 'white',
+            'no_data_color': 'lightgray',
+            'values_column': 'Value',
+            'plot_title_font_size': 8,
+            'map_x_range': [-1, 4],
+            'map_y_range': [-1, 4],
+        }
+    )
+
+
+def test_tiles_same_as_serial(tmp_path, map_grid_plot_parameters):
+    random_generator = np.random.default_rng(3)
+    quantities_data = [
+        pd.DataFrame(
+            {
+                'Country': [f'Country C{area:02d}' for area in range(12)],
+                'Value': 100 * random_generator.random(12),
+            }
+        )
+        for _ in range(3)
+    ]
+    grid_pixels = {}
+    for rendering_workers in [1, 2]:
+        output_folder = tmp_path / f'{rendering_workers}_workers'
+        cook.map_grid(
+            quantities_data,
+            ['First', 'Second', 'Third'],
+            ['blue', 'red', 'green'],
+            str(output_folder),
+            map_grid_plot_parameters,
+            box.Box(),
+            box.Box(),
+            80,
+            box.Box({'png': True}),
+            rendering_workers=rendering_workers,
+        )
+        plt.close('all')
+        grid_pixels[rendering_workers] = plt.imread(output_folder / 'Grid.png')
+    np.testing.assert_array_equal(grid_pixels[1], grid_pixels[2])
+
+
+def test_cached_map_paths_same_output(map_grid_plot_parameters):
+    map_areas = gpd.read_file(
+        f'{map_grid_plot_parameters.map_data_folder}/'
+        f'{map_grid_plot_parameters.map_data_file}'
+    )
+    area_values = np.linspace(1, 16, 16)
+    area_values[3] = np.nan
+    cook.register_color_bars(box.Box({'Cached': ['white', 'blue']}), {})
+
+    def map_pixels(map_areas_to_plot):
+        figure = plt.figure()
+        cook.make_quantity_map(
+            'Quantity',
+            None,
+            map_areas_to_plot,
+            figure.add_subplot(),
+            'Cached',
+            map_grid_plot_parameters,
+            box.Box(),
+            area_values=area_values,
+        )
+        figure.canvas.draw()
+        pixels = np.array(figure.canvas.buffer_rgba())
+        plt.close(figure)
+        return pixels
+
+    first_pixels = map_pixels(map_areas)
+    cached_paths = cook._map_paths(map_areas)
+    cached_pixels = map_pixels(map_areas)
+    assert cook._map_paths(map_areas) is cached_paths
+    uncached_pixels = map_pixels(map_areas.copy())
+    np.testing.assert_array_equal(first_pixels, cached_pixels)
+    np.testing.assert_array_equal(first_pixels, uncached_pixels)
+
+
+@pytest.mark.parametrize('area_values', [np.full(16, np.nan), None])
+def test_map_without_values(map_grid_plot_parameters, area_values):
+    map_areas = gpd.read_file(
+        f'{map_grid_plot_parameters.map_data_folder}/'
+        f'{map_grid_plot_parameters.map_data_file}'
+    )
+    plot_data = None
+    if area_values is None:
+        plot_data = map_areas.iloc[:0].assign(Value=[])
+    cook.register_color_bars(box.Box({'Missing': ['white', 'blue']}), {})
+    figure = plt.figure()
+    quantity_plot = figure.add_subplot()
+    cook.make_quantity_map(
+        'Quantity',
+        plot_data,
+        map_areas,
+        quantity_plot,
+        'Missing',
+        map_grid_plot_parameters,
+        box.Box(),
+        area_values=area_values,
+    )
+    figure.canvas.draw()
+    assert np.isfinite(quantity_plot.get_data_ratio())
+    assert np.isfinite(quantity_plot.get_aspect())
+    area_colors = [
+        collection.get_facecolor() for collection in quantity_plot.collections
+    ]
+    plt.close(figure)
+    np.testing.assert_allclose(
+        area_colors[0], [matplotlib.colors.to_rgba('lightgray')]
+    )
+    assert len(area_colors[1]) == 0
@@ -0,0 +1,67 @@
+import box
+import box.exceptions
+import pandas as pd
+import pytest
+
+import ETS_CookBook as cook
+
+parameters = box.Box(
+    {
+        'variables': {'mid_year_electric': 2030, 'share': 0.5},
+        'display': {'title': 'Test', 'size': {'height': 50}},
+        'years': [2030, 2040],
+    }
+)
+
+
+def test_get_does_not_modify():
+    test_parameters = box.Box(parameters)
+    assert cook.get_nested_value(test_parameters, 'display.size.height') == 50
+    with pytest.raises(KeyError):
+        cook.get_nested_value(test_parameters, ['missing', 'key'])
+    assert test_parameters == parameters
+
+
+def test_apply_and_copy_with_overrides():
+    overrides = pd.DataFrame(
+        {
+            'Key path': ['variables.mid_year_electric', 'display.size.width'],
+            'Value': [2040, 80],
+        }
+    )
+    overridden_parameters = cook.copy_with_overrides(parameters, overrides)
+    assert overridden_parameters.variables.mid_year_electric == 2040
+    assert overridden_parameters.display.size.width == 80
+    assert parameters.variables.mid_year_electric == 2030
+    assert 'width' not in parameters.display.size
+    # The parts without overrides are shared
+    assert overridden_parameters.display.title == 'Test'
+
+    test_parameters = box.Box(parameters)
+    cook.apply_overrides(test_parameters, overrides)
+    assert test_parameters == overridden_parameters
+    assert test_parameters.variables.share == 0.5
+
+
+def test_copy_with_overrides_is_read_only():
+    overridden_parameters = cook.copy_with_overrides(
+        parameters, {'variables.share': 0.8}
+    )
+
+    with pytest.raises(box.exceptions.BoxError):
+        overridden_parameters.display.title = 'Changed'
+    with pytest.raises(box.exceptions.BoxError):
+        overridden_parameters.display.size.height = 80
+    with pytest.raises(box.exceptions.BoxError):
+        overridden_parameters.variables.mid_year_electric = 2050
+    with pytest.raises(AttributeError):
+        overridden_parameters.years.append(2050)
+
+    assert parameters.display.title == 'Test'
+    assert parameters.display.size.height == 50
+    assert parameters.variables.mid_year_electric == 2030
+    assert parameters.years == [2030, 2040]
+    assert overridden_parameters.to_dict() == dict(
+        parameters.to_dict(),
+        variables={'mid_year_electric': 2030, 'share': 0.8},
+    )
@@ -0,0 +1,59 @@
+import dataclasses
+
+import pytest
+
+import ETS_CookBook as cook
+
+
+def test_includes_overlays_and_view(tmp_path):
+    (tmp_path / 'base.toml').write_text(
+        '[display]\ntitle = "Base"\nheight = 50\n[sliders]\nsteps = [1, 2]\n'
+    )
+    (tmp_path / 'main.toml').write_text(
+        'include = "base.toml"\n[display]\nheight = 60\n'
+    )
+    (tmp_path / 'scenario.toml').write_text('[display]\ntitle = "High"\n')
+
+    parameters = cook.parameters_from_TOML(
+        str(tmp_path / 'main.toml'),
+        [str(tmp_path / 'scenario.toml')],
+        include_key='include',
+    )
+    assert parameters.display == {'title': 'High', 'height': 60}
+    assert parameters.sliders.steps == [1, 2]
+    assert 'include' not in parameters
+
+    # Changing the returned parameters does not change the cached ones
+    parameters.sliders.steps.append(3)
+    assert cook.parameters_from_TOML(
+        str(tmp_path / 'main.toml'), include_key='include'
+    ).sliders.steps == [1, 2]
+
+    parameters_view = cook.parameters_view(parameters)
+    assert parameters_view.display.height == 60
+    assert parameters_view.sliders.steps == (1, 2, 3)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        parameters_view.display.height = 70
+
+
+def test_include_is_opt_in(tmp_path):
+    (tmp_path / 'flags.toml').write_text('include = true\n[display]\n')
+
+    parameters = cook.parameters_from_TOML(str(tmp_path / 'flags.toml'))
+    assert parameters.include is True
+    with pytest.raises(ValueError):
+        cook.parameters_from_TOML(
+            str(tmp_path / 'flags.toml'), include_key='include'
+        )
+
+
+def test_include_cycle(tmp_path):
+    (tmp_path / 'first.toml').write_text('include = "second.toml"\n')
+    (tmp_path / 'second.toml').write_text('include = ["first.toml"]\n')
+
+    with pytest.raises(ValueError, match='include each other') as cycle_error:
+        cook.parameters_from_TOML(
+            str(tmp_path / 'first.toml'), include_key='include'
+        )
+    assert str(cycle_error.value).count('first.toml') == 2
+    assert 'second.toml' in str(cycle_error.value)
@@ -0,0 +1,76 @@
+import pathlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ETS_CookBook as cook
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def dataset_folder(tmp_path, dataframe_formats):
+    results = pd.DataFrame(
+        {
+            'Year': np.repeat([2030, 2040, 2050], 4),
+            'Scenario': ['Low', 'High'] * 6,
+            'Hour': np.arange(12),
+            'Demand': np.arange(12) * 1.5,
+        }
+    )
+    dataset_formats = dataframe_formats('parquet_dataset')
+    dataset_formats.parquet_dataset_settings = {
+        'partition_columns': ['Year', 'Scenario'],
+        'row_group_size': 2,
+        'compression': 'zstd',
+    }
+    cook.save_dataframe(
+        results, 'Results', 'Results', str(tmp_path), dataset_formats
+    )
+    return str(tmp_path / 'Results')
+
+
+def test_partitions_and_full_read(dataset_folder):
+    assert sorted(
+        path.name for path in pathlib.Path(dataset_folder).glob('Year=2040/*')
+    ) == ['Scenario=High', 'Scenario=Low']
+    results = cook.read_parquet_dataset(dataset_folder)
+    assert sorted(results['Hour']) == list(range(12))
+
+
+def test_filters(dataset_folder):
+    results = cook.read_parquet_dataset(
+        dataset_folder,
+        ['Year', '"Scenario"', 'Hour'],
+        ['between', '=', 'in'],
+        [[2035, 2050], '"High"', [5, 7, 9, 11]],
+        columns=['Hour', 'Demand'],
+    )
+    assert list(results.columns) == ['Hour', 'Demand']
+    assert sorted(results['Hour']) == [5, 7, 9, 11]
+
+
+def test_tuple_in_and_like(dataset_folder):
+    filtered = cook.read_parquet_dataset(
+        dataset_folder,
+        [('Year', 'Hour'), 'Scenario'],
+        ['in', 'like'],
+        [[(2030, 1), (2050, 10)], '"L%"'],
+    )
+    assert list(filtered['Hour']) == [10]
+
+
+def test_missing_pyarrow_is_named(tmp_path, monkeypatch):
+    find_spec = cook.importlib.util.find_spec
+    monkeypatch.setattr(
+        cook.importlib.util,
+        'find_spec',
+        lambda name, *args: None if name == 'pyarrow' else find_spec(name),
+    )
+    with pytest.raises(ImportError, match=r'ETS_CookBook\[arrow\]'):
+        cook.save_parquet_dataset(
+            pd.DataFrame({'Value': [1.0]}), str(tmp_path / 'dataset')
+        )
+    with pytest.raises(ImportError, match='optional pyarrow package'):
+        cook.make_arrow_filter([], [], [])
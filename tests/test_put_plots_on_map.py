@@ -0,0 +1,78 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+import ETS_CookBook as cook
+
+MAP_PARAMETERS: dict = {
+    'location_code_header': 'Code',
+    'location_longitudes_header': 'Longitude',
+    'location_latitudes_header': 'Latitude',
+    'scaling_parameters': {
+        'x_size': 0.005,
+        'y_size_max': 4,
+        'y_size_scale': 0.05,
+        'x_start': 0.51,
+        'y_start': 0.5,
+        'longitude_scaling': 0.7,
+        'latitude_scaling': 0.47,
+        'maximum_longitude': 180,
+        'maximum_latitude': 90,
+    },
+}
+MAP_DATA: pd.DataFrame = pd.DataFrame(
+    {
+        'Code': ['NLD', 'FRA', 'ESP'],
+        'Longitude': [5.0, 2.0, -4.0],
+        'Latitude': [52.0, 46.0, 40.0],
+    }
+)
+
+
+def test_plot_totals_series_or_single_column():
+    totals = pd.Series([1.0, 2.0], index=['FRA', 'NLD'])
+    figure = plt.figure()
+    series_plots = cook.put_plots_on_map(
+        figure, MAP_DATA, MAP_PARAMETERS, totals
+    )
+    frame_plots = cook.put_plots_on_map(
+        figure, MAP_DATA, MAP_PARAMETERS, totals.to_frame('Total')
+    )
+    assert list(series_plots) == ['NLD', 'FRA']
+    for location in series_plots:
+        assert (
+            series_plots[location].get_position().bounds
+            == frame_plots[location].get_position().bounds
+        )
+    with pytest.raises(ValueError):
+        cook.put_plots_on_map(
+            figure,
+            MAP_DATA,
+            MAP_PARAMETERS,
+            pd.DataFrame({'A': totals, 'B': totals}),
+        )
+    plt.close(figure)
+
+
+def test_stacked_bars_in_map_axes():
+    figure, map_plot = plt.subplots()
+    map_limits = map_plot.get_xlim(), map_plot.get_ylim()
+    plot_values = pd.DataFrame(
+        {'Solar': [1.0, 2.0], 'Wind': [3.0, 0.5]}, index=['NLD', 'ESP']
+    )
+    bar_collections = cook.put_stacked_bars_on_map(
+        figure, MAP_DATA, MAP_PARAMETERS, plot_values, ['gold', 'blue']
+    )
+    assert figure.axes == [map_plot]
+    assert (map_plot.get_xlim(), map_plot.get_ylim()) == map_limits
+    assert len(bar_collections) == 2
+    # The Wind elements of NLD start where its Solar element ends
+    solar_nld, wind_nld = (
+        bar_collection.get_paths()[0].vertices
+        for bar_collection in bar_collections
+    )
+    height_scaling = 0.05 / 4
+    assert np.isclose(solar_nld[2, 1] - solar_nld[0, 1], 1.0 * height_scaling)
+    assert np.isclose(wind_nld[0, 1], solar_nld[2, 1])
+    plt.close(figure)
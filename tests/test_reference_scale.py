@@ -1,6 +1,9 @@
 # Type hinting here seems to create issues
 # Either with MyPy complaining about imports mising attributes
 # or MyPy not working
+import numpy as np
+import pandas as pd
+
 import ETS_CookBook as cook
 
 
@@ -14,3 +17,25 @@ def test_zero():
     test_list = [0, 1, 10.8]
     test_scale = [0, 20]
     assert cook.reference_scale(test_list) == test_scale
+
+
+def test_many_series():
+    test_table = pd.DataFrame(
+        {
+            'basic': [1, 2, 10.8],
+            'zero': [0, 1, 10.8],
+            'negative': [-53.57, 0.05, np.nan],
+            'empty': [np.nan, np.nan, np.nan],
+        }
+    )
+    test_scales = cook.reference_scales(test_table)
+    for column in ['basic', 'zero', 'negative']:
+        assert list(test_scales.loc[column]) == cook.reference_scale(
+            list(test_table[column].dropna())
+        )
+    assert test_scales.loc['empty'].isna().all()
+    lower_scales, upper_scales = cook.reference_scales(
+        test_table.to_numpy().T, axis=1
+    )
+    assert list(lower_scales[:2]) == [1, 0]
+    assert list(upper_scales[:2]) == [20, 20]
@@ -0,0 +1,81 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import ETS_CookBook as cook
+
+
+def scenario_model(parameters):
+    return pd.DataFrame(
+        {
+            'Year': [parameters.variables.year],
+            'Value': [parameters.variables.share * 2],
+        }
+    )
+
+
+def test_sweep_to_sqlite(tmp_path):
+    parameters_file = tmp_path / 'base.toml'
+    parameters_file.write_text('[variables]\nyear = 2030\nshare = 0.5\n')
+    results_store = str(tmp_path / 'results.sqlite3')
+    scenario_grid = {
+        'variables.year': [2030, 2040],
+        'variables.share': [0.1, 0.3],
+    }
+
+    sweep_summary = cook.run_parameter_sweep(
+        str(parameters_file),
+        scenario_grid,
+        scenario_model,
+        results_store,
+        workers=1,
+    )
+    assert list(sweep_summary['Status']) == ['done'] * 4
+
+    sweep_summary = cook.run_parameter_sweep(
+        str(parameters_file),
+        [{'variables.year': 2040, 'variables.share': 0.3}, {}],
+        scenario_model,
+        results_store,
+        workers=1,
+    )
+    assert list(sweep_summary['Status']) == ['skipped', 'done']
+
+    with sqlite3.connect(results_store) as sql_connection:
+        sweep_results = pd.read_sql(
+            'SELECT * FROM "Sweep results"', sql_connection
+        )
+    assert list(sweep_results.columns) == ['Scenario', 'Year', 'Value']
+    assert len(sweep_results) == 5
+    assert set(sweep_results['Value']) == {0.2, 0.6, 1.0}
+
+
+@pytest.mark.parametrize('results_store_name', ['results.db', 'results'])
+def test_sweep_in_worker_processes(tmp_path, results_store_name):
+    parameters_file = tmp_path / 'base.toml'
+    parameters_file.write_text('[variables]\nyear = 2030\nshare = 0.5\n')
+    overlay_file = tmp_path / 'scenario.toml'
+    overlay_file.write_text('[variables]\nshare = 1.5\n')
+    results_store = str(tmp_path / results_store_name)
+
+    sweep_summary = cook.run_parameter_sweep(
+        str(parameters_file),
+        {'variables.year': [2030, 2040, 2050]},
+        scenario_model,
+        results_store,
+        workers=2,
+        overlay_file_names=[str(overlay_file)],
+    )
+    assert list(sweep_summary['Status']) == ['done'] * 3
+
+    if results_store_name.endswith('.db'):
+        with sqlite3.connect(results_store) as sql_connection:
+            sweep_results = pd.read_sql(
+                'SELECT * FROM "Sweep results"', sql_connection
+            )
+    else:
+        sweep_results = pd.read_parquet(results_store)
+    assert list(sweep_results.columns) == ['Scenario', 'Year', 'Value']
+    assert sorted(sweep_results['Year']) == [2030, 2040, 2050]
+    assert set(sweep_results['Value']) == {3.0}
@@ -0,0 +1,134 @@
+import sqlite3
+
+import box
+import numpy as np
+import pandas as pd
+import pytest
+
+import ETS_CookBook as cook
+
+pytest.importorskip('pyarrow')
+pytest.importorskip('tables')
+
+CHUNKED_FORMATS: list[str] = ['csv', 'hdf', 'feather', 'parquet', 'sql']
+
+
+def make_results() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            'Hour': np.arange(25),
+            'Area': [f'Area {hour % 3}' for hour in range(25)],
+            'Demand': np.linspace(0, 10, 25),
+        }
+    )
+
+
+def test_same_as_single_save(tmp_path, dataframe_formats):
+    results = make_results()
+    chunked_formats = box.Box(
+        {file_type: True for file_type in CHUNKED_FORMATS}
+    )
+    rows_written = cook.save_dataframe_chunks(
+        (results.iloc[start:start + 10] for start in range(0, 25, 10)),
+        'Results',
+        'Group',
+        str(tmp_path / 'chunks'),
+        chunked_formats,
+    )
+    assert rows_written == 25
+    single_formats = dataframe_formats(*CHUNKED_FORMATS)
+    cook.save_dataframe(
+        results, 'Results', 'Group', str(tmp_path / 'single'), single_formats
+    )
+
+    assert (tmp_path / 'chunks/Results.csv').read_bytes() == (
+        tmp_path / 'single/Results.csv'
+    ).read_bytes()
+    for read_function in [pd.read_parquet, pd.read_feather]:
+        extension = read_function.__name__.removeprefix('read_')
+        pd.testing.assert_frame_equal(
+            read_function(tmp_path / f'chunks/Results.{extension}'),
+            read_function(tmp_path / f'single/Results.{extension}'),
+            check_index_type=False,
+        )
+    pd.testing.assert_frame_equal(
+        pd.read_hdf(tmp_path / 'chunks/Group.h5', 'Results'), results
+    )
+    for folder in ['chunks', 'single']:
+        with sqlite3.connect(tmp_path / f'{folder}/Group.sqlite3') as sql:
+            table = pd.read_sql('select * from Results', sql)
+        pd.testing.assert_frame_equal(table, results.reset_index())
+
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError, match='excel'):
+        cook.save_dataframe_chunks(
+            [make_results()],
+            'Results',
+            'Group',
+            str(tmp_path),
+            box.Box({'csv': True, 'excel': True}),
+        )
+
+
+def test_types_of_later_chunks(tmp_path):
+    first_chunk = pd.DataFrame({'Area': ['A', 'B'], 'Note': [None, None]})
+    second_chunk = pd.DataFrame(
+        {'Area': ['A much longer area name', 'C'], 'Note': ['Late', None]},
+        index=[2, 3],
+    )
+    chunked_formats = box.Box(
+        {
+            'hdf': 'yes',
+            'parquet': 1,
+            'feather': True,
+            'hdf_settings': {'min_itemsize': {'Area': 30, 'Note': 10}},
+            'parquet_settings': {'column_types': {'Note': 'string'}},
+            'feather_settings': {'column_types': {'Note': 'string'}},
+        }
+    )
+
+    rows_written = cook.save_dataframe_chunks(
+        [first_chunk, second_chunk],
+        'Results',
+        'Group',
+        str(tmp_path),
+        chunked_formats,
+    )
+
+    assert rows_written == 4
+    assert list(
+        pd.read_hdf(tmp_path / 'Group.h5', 'Results')['Area']
+    ) == ['A', 'B', 'A much longer area name', 'C']
+    for read_function in [pd.read_parquet, pd.read_feather]:
+        extension = read_function.__name__.removeprefix('read_')
+        chunked_results = read_function(tmp_path / f'Results.{extension}')
+        assert list(chunked_results['Note'].fillna('-')) == [
+            '-',
+            '-',
+            'Late',
+            '-',
+        ]
+
+
+def test_empty_chunk_iterator(tmp_path):
+    with pytest.raises(ValueError, match='no chunks to save for Results'):
+        cook.save_dataframe_chunks(
+            iter([]),
+            'Results',
+            'Group',
+            str(tmp_path / 'chunks'),
+            box.Box({'csv': True, 'parquet': True}),
+        )
+    assert not (tmp_path / 'chunks').exists()
+    rows_written = cook.save_dataframe_chunks(
+        [make_results().iloc[:0]],
+        'Results',
+        'Group',
+        str(tmp_path / 'chunks'),
+        box.Box({'csv': True, 'parquet': True}),
+    )
+    assert rows_written == 0
+    assert list(
+        pd.read_parquet(tmp_path / 'chunks' / 'Results.parquet').columns
+    ) == ['Hour', 'Area', 'Demand']
@@ -0,0 +1,40 @@
+import io
+
+import box
+import matplotlib.pyplot as plt
+
+import ETS_CookBook as cook
+
+
+def test_same_files_as_savefig(tmp_path):
+    figure, axes = plt.subplots()
+    axes.plot([0, 1, 2], [2, 0, 1])
+    file_formats = box.Box({'png': True, 'jpg': True, 'svg': False})
+    cook.save_figure(figure, 'figure', str(tmp_path), 50, file_formats)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'figure.jpg',
+        'figure.png',
+    ]
+    for file_format in ['png', 'jpg']:
+        savefig_buffer = io.BytesIO()
+        figure.savefig(savefig_buffer, format=file_format, dpi=50)
+        saved_bytes = (tmp_path / f'figure.{file_format}').read_bytes()
+        assert saved_bytes == savefig_buffer.getvalue()
+    plt.close(figure)
+
+
+def test_return_bytes(tmp_path):
+    figure, axes = plt.subplots()
+    axes.plot([0, 1], [0, 1])
+    figure_bytes = cook.save_figure(
+        figure,
+        'figure',
+        str(tmp_path / 'not_created'),
+        50,
+        box.Box({'png': True, 'pdf': True}),
+        return_bytes=True,
+    )
+    assert list(figure_bytes) == ['png', 'pdf']
+    assert figure_bytes['pdf'].startswith(b'%PDF')
+    assert not (tmp_path / 'not_created').exists()
+    plt.close(figure)
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+import ETS_CookBook as cook
+
+
+def test_same_as_string_to_float():
+    test_strings = [
+        '1.5',
+        ' 2 ',
+        'abc',
+        '-3e2',
+        '',
+        'abc',
+        'nan',
+        '-inf',
+        '1_000',
+    ]
+    test_floats, coerced_count = cook.strings_to_floats(test_strings)
+    np.testing.assert_array_equal(
+        test_floats,
+        [cook.string_to_float(test_string) for test_string in test_strings],
+    )
+    assert coerced_count == 3
+
+
+def test_units_only_at_the_end():
+    test_floats, coerced_count = cook.strings_to_floats(
+        ['12 MWh', '3Wh', '4 Wh 5', 'MWh 6'], units=['Wh', 'MWh']
+    )
+    assert list(test_floats) == [12.0, 3.0, 0.0, 0.0]
+    assert coerced_count == 2
+
+
+def test_separators_units_and_columns():
+    test_dataframe = pd.DataFrame(
+        {
+            'Price': ['1.234,5 €', '12 €', 'n/a', None],
+            'Share': ['7%', '12,5%', '3%', '1%'],
+            'Name': ['a', 'b', 'c', 'd'],
+        }
+    )
+    converted_dataframe, coerced_count = cook.strings_to_floats(
+        test_dataframe,
+        columns=['Price', 'Share'],
+        decimal_separator=',',
+        thousands_separator='.',
+        units=['€', '%'],
+        fill_value=-1.0,
+    )
+    assert converted_dataframe is test_dataframe
+    assert list(test_dataframe['Price']) == [1234.5, 12.0, -1.0, -1.0]
+    assert list(test_dataframe['Share']) == [7.0, 12.5, 3.0, 1.0]
+    assert list(test_dataframe['Name']) == ['a', 'b', 'c', 'd']
+    assert coerced_count == 2
+
+
+def test_python_only_for_python_floats(monkeypatch):
+    python_float_calls = []
+
+    def counted_float_or_none(my_value):
+        python_float_calls.append(my_value)
+        return float(my_value)
+
+    monkeypatch.setattr(cook, '_float_or_none', counted_float_or_none)
+    test_floats, coerced_count = cook.strings_to_floats(
+        ['abc', 'n/a', '1_000', ' Infinity ', '-NaN', 'x1', '2', 'abc']
+    )
+    assert list(test_floats[:4]) == [0.0, 0.0, 1000.0, np.inf]
+    assert np.isnan(test_floats[4])
+    assert list(test_floats[5:]) == [0.0, 2.0, 0.0]
+    assert coerced_count == 4
+    assert sorted(python_float_calls) == [' Infinity ', '-NaN', '1_000']